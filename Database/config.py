@@ -1,5 +1,80 @@
+import os
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 DB_CONFIG = {
     "host": "localhost",
     "port": 27017,
-    "database": "wifi_analysis"
-}
\ No newline at end of file
+    "database": "wifi_analysis",
+    # Shared client / connection pool settings
+    "max_pool_size": 50,
+    "min_pool_size": 0,
+    "max_idle_time_ms": 60000,
+    "connect_timeout_ms": 5000,
+    "server_selection_timeout_ms": 5000,
+    "socket_timeout_ms": 20000,
+    "wait_queue_timeout_ms": 5000
+}
+
+DATA_CONFIG = {
+    # Legacy nested {location: [measurements]} document, read-only once migrated
+    "json_path": os.path.join(BASE_DIR, "data", "wifi_data.json"),
+    # Append-only JSON Lines log the collector writes to
+    "log_path": os.path.join(BASE_DIR, "data", "wifi_data.jsonl"),
+    # Parquet snapshot partitioned by date/location, built by compact_snapshots()
+    "snapshot_dir": os.path.join(BASE_DIR, "data", "snapshots"),
+    # Distinct locations/dates/hours of the dataset, kept current from the log
+    "meta_path": os.path.join(BASE_DIR, "data", "wifi_meta.json"),
+    # Registered measurement locations and their coordinates (see Database.locations)
+    "locations_path": os.path.join(BASE_DIR, "data", "locations.json"),
+    # Run numbers come from a MongoDB counter ("mongo") or a locked file ("file")
+    "run_counter": "mongo",
+    "run_counter_path": os.path.join(BASE_DIR, "data", "run_counter"),
+    # fsync after this many appends or this many seconds, whichever comes first
+    "fsync_every": 10,
+    "fsync_interval": 5.0,
+    # Seconds between checks of the log for new samples to push to /events
+    "events_poll_interval": 1.0
+}
+
+COLLECTOR_CONFIG = {
+    # Locations probed at the same time by the system probes (throughput
+    # tests are still serialised, with either backend)
+    "max_parallel_locations": 2,
+    "max_parallel_throughput": 1,
+    # Minimum seconds between the start of consecutive samples in a slot
+    "sample_interval": 5.0,
+    # "system" uses the blocking Windows probes in src.main on the probe
+    # scheduler's threads; "windows", "linux", "auto" and "simulated" measure
+    # every location of a sweep at once on the asyncio probe engine in src.probes
+    "probe_backend": "system",
+    # Job registry shared by web workers: "file" (one host) or "mongo"
+    "job_registry": "file",
+    "job_registry_path": os.path.join(BASE_DIR, "data", "collection_jobs.json"),
+    # A job whose owner has not sent a heartbeat for lease_ttl seconds is
+    # considered orphaned and its lease can be taken over
+    "lease_ttl": 30.0,
+    "heartbeat_interval": 5.0,
+    # Continuous mode: seconds between the starts of consecutive sweeps
+    "sweep_interval": 60.0,
+    # Bounded queue between probes and storage (see src.write_buffer):
+    # when full, "drop_oldest", "drop_newest" or "block" (for at most
+    # write_block_timeout seconds); sweeps are skipped while it is above
+    # write_high_water of its capacity
+    "write_buffer_size": 1000,
+    "write_batch_size": 50,
+    "write_flush_interval": 2.0,
+    "write_overflow_policy": "drop_oldest",
+    "write_block_timeout": 1.0,
+    "write_high_water": 0.8
+}
+
+FIGURE_CACHE_CONFIG = {
+    "max_entries": 256,
+    "max_bytes": 64 * 1024 * 1024,
+    # Seconds a cached figure stays valid
+    "ttl": 600.0,
+    # Set to a directory (e.g. os.path.join(BASE_DIR, "data", "figure_cache"))
+    # to share cached figures between worker processes
+    "disk_dir": None
+}
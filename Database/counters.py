@@ -0,0 +1,88 @@
+import os
+from contextlib import contextmanager
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+COUNTERS_COLLECTION = "counters"
+
+
+# Atomically increments and returns a named counter stored as
+# {_id: name, seq: n}. `seed()` is only consulted the first time the
+# counter is created and should return the highest value already in use.
+def next_sequence(db, name, seed=None):
+    counters = db[COUNTERS_COLLECTION]
+    if seed is not None and counters.find_one({"_id": name}, {"_id": 1}) is None:
+        try:
+            # $max keeps concurrent seeders idempotent
+            counters.update_one({"_id": name}, {"$max": {"seq": seed()}}, upsert=True)
+        except DuplicateKeyError:
+            pass
+    doc = counters.find_one_and_update(
+        {"_id": name},
+        {"$inc": {"seq": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return doc["seq"]
+
+
+def _lock(f, shared=False):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+
+def _unlock(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+# Opens `path` (created if missing) and holds an exclusive OS lock on it for
+# the duration of the block, serialising access across processes. With
+# shared=True readers only exclude writers (Windows has no shared lock and
+# takes the exclusive one).
+@contextmanager
+def locked_file(path, shared=False):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'a+') as f:
+        _lock(f, shared)
+        try:
+            f.seek(0)
+            yield f
+        finally:
+            _unlock(f)
+
+
+# Replaces the content of a file opened with locked_file() and syncs it.
+def rewrite_locked(f, text):
+    f.seek(0)
+    f.truncate()
+    f.write(text)
+    f.flush()
+    os.fsync(f.fileno())
+
+
+# File-backed equivalent for JSON-only deployments: the value lives in a
+# small text file and every increment happens under an exclusive OS lock, so
+# concurrent processes never get the same number.
+def next_file_sequence(path, seed=None):
+    with locked_file(path) as f:
+        text = f.read().strip()
+        if text:
+            current = int(text)
+        else:
+            current = seed() if seed is not None else 0
+        current += 1
+        rewrite_locked(f, str(current))
+        return current
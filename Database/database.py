@@ -1,7 +1,109 @@
-from pymongo import MongoClient
+import atexit
+import os
+import threading
+from pymongo import MongoClient, monitoring
 from Database.config import DB_CONFIG
 
+
+# Counts connection pool events so pool usage can be inspected at runtime.
+class _PoolStatsListener(monitoring.ConnectionPoolListener):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {
+            "created": 0, "closed": 0, "checked_out": 0, "checked_in": 0,
+            "checkout_failed": 0, "cleared": 0
+        }
+
+    def _bump(self, key):
+        with self._lock:
+            self.counts[key] += 1
+
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_cleared(self, event): self._bump("cleared")
+    def pool_closed(self, event): pass
+    def connection_created(self, event): self._bump("created")
+    def connection_ready(self, event): pass
+    def connection_closed(self, event): self._bump("closed")
+    def connection_check_out_started(self, event): pass
+    def connection_check_out_failed(self, event): self._bump("checkout_failed")
+    def connection_checked_out(self, event): self._bump("checked_out")
+    def connection_checked_in(self, event): self._bump("checked_in")
+
+    def snapshot(self):
+        with self._lock:
+            counts = dict(self.counts)
+        counts["open"] = counts["created"] - counts["closed"]
+        counts["in_use"] = counts["checked_out"] - counts["checked_in"]
+        return counts
+
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+_pool_stats = _PoolStatsListener()
+
+
+def _create_client():
+    return MongoClient(
+        DB_CONFIG["host"],
+        DB_CONFIG["port"],
+        maxPoolSize=DB_CONFIG["max_pool_size"],
+        minPoolSize=DB_CONFIG["min_pool_size"],
+        maxIdleTimeMS=DB_CONFIG["max_idle_time_ms"],
+        connectTimeoutMS=DB_CONFIG["connect_timeout_ms"],
+        serverSelectionTimeoutMS=DB_CONFIG["server_selection_timeout_ms"],
+        socketTimeoutMS=DB_CONFIG["socket_timeout_ms"],
+        waitQueueTimeoutMS=DB_CONFIG["wait_queue_timeout_ms"],
+        event_listeners=[_pool_stats],
+        connect=False
+    )
+
+
+# One lazily created client per process. MongoClient is thread-safe and pools
+# its sockets; a forked child (e.g. a gunicorn worker) must not reuse the
+# parent's sockets, so the pid is checked and a fresh client is built there.
+def get_client():
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is not None and _client_pid == pid:
+        return _client
+    with _client_lock:
+        if _client is None or _client_pid != pid:
+            _client = _create_client()
+            _client_pid = pid
+        return _client
+
+
+def _forget_client_after_fork():
+    global _client, _client_pid
+    _client = None
+    _client_pid = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_client_after_fork)
+
+
+def close_client():
+    global _client, _client_pid
+    with _client_lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client = None
+        _client_pid = None
+
+
+atexit.register(close_client)
+
+
+def pool_stats():
+    stats = _pool_stats.snapshot()
+    stats["max_pool_size"] = DB_CONFIG["max_pool_size"]
+    stats["client_initialised"] = _client is not None and _client_pid == os.getpid()
+    return stats
+
+
 def get_db_connection():
-    client = MongoClient(DB_CONFIG["host"], DB_CONFIG["port"])
-    db = client[DB_CONFIG["database"]]
+    db = get_client()[DB_CONFIG["database"]]
     return db
@@ -0,0 +1,212 @@
+import json
+import time
+from pymongo import ReturnDocument, DESCENDING
+from pymongo.errors import DuplicateKeyError
+from Database.counters import locked_file, rewrite_locked
+
+# Persistent registry of collection jobs shared by every web worker.
+#
+# A job is a document {_id, owner, locations, state, started_at,
+# heartbeat_at, finished_at, cancel_requested, error}. At most one job holds
+# the collector lease at a time; the lease expires `lease_ttl` seconds after
+# the owner's last heartbeat, so a crashed worker's job is reported as
+# "orphaned" and the next start can take over. Cancellation is a flag on the
+# job that the owning worker picks up with its next heartbeat.
+#
+# FileJobRegistry keeps everything in one JSON file under an OS lock (one
+# host, several processes); MongoJobRegistry uses atomic updates (several
+# hosts).
+
+JOBS_COLLECTION = "collection_jobs"
+LEASES_COLLECTION = "leases"
+COLLECTOR_LEASE = "collector"
+ACTIVE_STATES = ("running", "cancelling")
+
+
+class FileJobRegistry:
+    def __init__(self, path, lease_ttl=30.0, keep=50):
+        self.path = path
+        self.lease_ttl = lease_ttl
+        self.keep = keep
+
+    @staticmethod
+    def _parse(text):
+        text = text.strip()
+        return json.loads(text) if text else {"lease": None, "jobs": []}
+
+    def _update(self, change):
+        with locked_file(self.path) as f:
+            state = self._parse(f.read())
+            self._expire(state)
+            result = change(state)
+            finished = [job for job in state["jobs"] if job["state"] not in ACTIVE_STATES]
+            if len(finished) > self.keep:
+                drop = {job["_id"] for job in finished[:len(finished) - self.keep]}
+                state["jobs"] = [job for job in state["jobs"] if job["_id"] not in drop]
+            rewrite_locked(f, json.dumps(state))
+            return result
+
+    # Read-only queries (status polling) take the shared lock and never write;
+    # only a stale lease, which has to be expired and persisted, goes through
+    # _update.
+    def _read(self, query):
+        with locked_file(self.path, shared=True) as f:
+            state = self._parse(f.read())
+            if not self._lease_expired(state):
+                return query(state)
+        return self._update(query)
+
+    @staticmethod
+    def _lease_expired(state):
+        lease = state["lease"]
+        return lease is not None and lease["expires_at"] < time.time()
+
+    def _expire(self, state):
+        lease = state["lease"]
+        if self._lease_expired(state):
+            job = self._find(state, lease["job_id"])
+            if job is not None and job["state"] in ACTIVE_STATES:
+                job.update(state="orphaned", finished_at=lease["expires_at"])
+            state["lease"] = None
+
+    @staticmethod
+    def _find(state, job_id):
+        for job in state["jobs"]:
+            if job["_id"] == job_id:
+                return job
+        return None
+
+    def acquire(self, job):
+        def change(state):
+            if state["lease"] is not None:
+                return False
+            state["lease"] = {"job_id": job["_id"], "owner": job["owner"],
+                              "expires_at": time.time() + self.lease_ttl}
+            state["jobs"].append(job)
+            return True
+        return self._update(change)
+
+    # Renews the lease; returns the job (check `cancel_requested`) or None
+    # when the lease is no longer held by this job.
+    def heartbeat(self, job_id):
+        def change(state):
+            lease = state["lease"]
+            if lease is None or lease["job_id"] != job_id:
+                return None
+            now = time.time()
+            lease["expires_at"] = now + self.lease_ttl
+            job = self._find(state, job_id)
+            job["heartbeat_at"] = now
+            return dict(job)
+        return self._update(change)
+
+    # Flags the given job (default: the lease holder) for cancellation.
+    def request_cancel(self, job_id=None):
+        def change(state):
+            target = job_id or (state["lease"] or {}).get("job_id")
+            job = self._find(state, target) if target else None
+            if job is None or job["state"] not in ACTIVE_STATES:
+                return None
+            job.update(state="cancelling", cancel_requested=True)
+            return dict(job)
+        return self._update(change)
+
+    def finish(self, job_id, state_name, error=None):
+        def change(state):
+            job = self._find(state, job_id)
+            if job is not None and job["state"] in ACTIVE_STATES:
+                job.update(state=state_name, finished_at=time.time(), error=error)
+            if state["lease"] is not None and state["lease"]["job_id"] == job_id:
+                state["lease"] = None
+            return None if job is None else dict(job)
+        return self._update(change)
+
+    def current(self):
+        def query(state):
+            lease = state["lease"]
+            return None if lease is None else dict(self._find(state, lease["job_id"]))
+        return self._read(query)
+
+    def get(self, job_id):
+        return self._read(lambda state: self._find(state, job_id))
+
+    def list(self, limit=20):
+        return self._read(lambda state: list(reversed(state["jobs"]))[:limit])
+
+
+class MongoJobRegistry:
+    def __init__(self, db_getter, lease_ttl=30.0):
+        self._db_getter = db_getter
+        self.lease_ttl = lease_ttl
+
+    def _collections(self):
+        db = self._db_getter()
+        return db[JOBS_COLLECTION], db[LEASES_COLLECTION]
+
+    def _expire(self):
+        jobs, leases = self._collections()
+        now = time.time()
+        lease = leases.find_one_and_delete({"_id": COLLECTOR_LEASE, "expires_at": {"$lt": now}})
+        if lease is not None:
+            jobs.update_one({"_id": lease["job_id"], "state": {"$in": list(ACTIVE_STATES)}},
+                            {"$set": {"state": "orphaned", "finished_at": lease["expires_at"]}})
+
+    def acquire(self, job):
+        self._expire()
+        jobs, leases = self._collections()
+        try:
+            # Fails with a duplicate key while another job holds the lease
+            leases.insert_one({"_id": COLLECTOR_LEASE, "job_id": job["_id"], "owner": job["owner"],
+                               "expires_at": time.time() + self.lease_ttl})
+        except DuplicateKeyError:
+            return False
+        jobs.insert_one(job)
+        return True
+
+    def heartbeat(self, job_id):
+        jobs, leases = self._collections()
+        now = time.time()
+        renewed = leases.update_one({"_id": COLLECTOR_LEASE, "job_id": job_id},
+                                    {"$set": {"expires_at": now + self.lease_ttl}})
+        if not renewed.matched_count:
+            return None
+        return jobs.find_one_and_update({"_id": job_id}, {"$set": {"heartbeat_at": now}},
+                                        return_document=ReturnDocument.AFTER)
+
+    def request_cancel(self, job_id=None):
+        self._expire()
+        jobs, leases = self._collections()
+        if job_id is None:
+            lease = leases.find_one({"_id": COLLECTOR_LEASE})
+            if lease is None:
+                return None
+            job_id = lease["job_id"]
+        return jobs.find_one_and_update(
+            {"_id": job_id, "state": {"$in": list(ACTIVE_STATES)}},
+            {"$set": {"state": "cancelling", "cancel_requested": True}},
+            return_document=ReturnDocument.AFTER
+        )
+
+    def finish(self, job_id, state_name, error=None):
+        jobs, leases = self._collections()
+        job = jobs.find_one_and_update(
+            {"_id": job_id, "state": {"$in": list(ACTIVE_STATES)}},
+            {"$set": {"state": state_name, "finished_at": time.time(), "error": error}},
+            return_document=ReturnDocument.AFTER
+        )
+        leases.delete_one({"_id": COLLECTOR_LEASE, "job_id": job_id})
+        return job
+
+    def current(self):
+        self._expire()
+        jobs, leases = self._collections()
+        lease = leases.find_one({"_id": COLLECTOR_LEASE})
+        return None if lease is None else jobs.find_one({"_id": lease["job_id"]})
+
+    def get(self, job_id):
+        jobs, _ = self._collections()
+        return jobs.find_one({"_id": job_id})
+
+    def list(self, limit=20):
+        jobs, _ = self._collections()
+        return list(jobs.find().sort("started_at", DESCENDING).limit(limit))
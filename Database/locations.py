@@ -0,0 +1,158 @@
+import json
+import os
+import threading
+from Database.config import DATA_CONFIG
+from Database.counters import locked_file, rewrite_locked
+
+# Registry of measurement locations (access points) shared by the collector,
+# the loader and the dashboard, persisted next to the data as
+#   {"locations": [{"name": "ECC", "x": 67.12, "y": -43.45, "collect": true}, ...]}
+# x/y are the coordinates the collector records as position[x]/position[y];
+# `collect` selects the locations the collection page probes. Locations are
+# added by editing the file or through add(); every process picks the change
+# up on its next lookup (one stat() when nothing changed). Lookups never
+# write: while the file is missing or empty the defaults are served from
+# memory, and the file is only created by add() or remove().
+#
+# Lookups go through an in-memory index (name -> row) over parallel
+# coordinate lists, so joining a column of location names to coordinates is
+# one dictionary lookup per distinct name plus an array take.
+
+# Used until the registry file has content; matches the sites in the bundled datasets
+DEFAULT_LOCATIONS = [
+    {"name": "ECC", "x": 67.12, "y": -43.45, "collect": True},
+    {"name": "GEC", "x": 70.21, "y": -40.31, "collect": False},
+    {"name": "SDB", "x": 65.78, "y": -42.5, "collect": False},
+    {"name": "FOODCOURT", "x": 68.33, "y": -41.25, "collect": False},
+    {"name": "LOUNGE", "x": 69.0, "y": -39.9, "collect": False},
+]
+
+
+class LocationRegistry:
+    def __init__(self, path, defaults=DEFAULT_LOCATIONS):
+        self.path = path
+        self.defaults = defaults
+        self._lock = threading.Lock()
+        # () before the first read, None while the file is missing
+        self._signature = ()
+        self._locations = []
+        self._index = {}
+        self._xs = []
+        self._ys = []
+
+    def _stat_signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _set(self, locations):
+        self._locations = [dict(location) for location in locations]
+        self._index = {location["name"]: i for i, location in enumerate(self._locations)}
+        self._xs = [location["x"] for location in self._locations]
+        self._ys = [location["y"] for location in self._locations]
+
+    @staticmethod
+    def _parse(text):
+        return json.loads(text)["locations"] if text.strip() else None
+
+    def _refresh(self):
+        signature = self._stat_signature()
+        if signature == self._signature:
+            return
+        locations = None
+        if signature is not None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    locations = self._parse(f.read())
+            except (OSError, ValueError, KeyError) as e:
+                print(f"❌ Error reading location registry {self.path}: {e}")
+                return
+        self._set(self.defaults if locations is None else locations)
+        self._signature = signature
+
+    # Applies change(locations) to the persisted list under the file lock
+    # (a missing or empty file starts from the defaults).
+    def _update(self, change):
+        with locked_file(self.path) as f:
+            locations = self._parse(f.read())
+            if locations is None:
+                locations = [dict(location) for location in self.defaults]
+            result = change(locations)
+            rewrite_locked(f, json.dumps({"locations": locations}, indent=2))
+        self._set(locations)
+        self._signature = self._stat_signature()
+        return result
+
+    def all(self):
+        with self._lock:
+            self._refresh()
+            return [dict(location) for location in self._locations]
+
+    def names(self):
+        with self._lock:
+            self._refresh()
+            return [location["name"] for location in self._locations]
+
+    def get(self, name):
+        with self._lock:
+            self._refresh()
+            row = self._index.get(name)
+            return None if row is None else dict(self._locations[row])
+
+    # [[name, x, y], ...] for the locations flagged for collection, in the
+    # format the collector takes.
+    def collection_targets(self):
+        with self._lock:
+            self._refresh()
+            return [[loc["name"], loc["x"], loc["y"]] for loc in self._locations if loc.get("collect")]
+
+    # Coordinates for a sequence of names as two float arrays, NaN for
+    # names that are not registered.
+    def coordinates(self, names):
+        import numpy as np
+
+        with self._lock:
+            self._refresh()
+            rows = np.array([self._index.get(name, -1) for name in names], dtype=np.int64)
+            xs = np.array(self._xs + [np.nan], dtype=float)
+            ys = np.array(self._ys + [np.nan], dtype=float)
+        return xs[rows], ys[rows]
+
+    # Adds a location or updates an existing one; returns the stored entry.
+    def add(self, name, x, y, collect=False):
+        entry = {"name": str(name), "x": float(x), "y": float(y), "collect": bool(collect)}
+
+        def change(locations):
+            for location in locations:
+                if location["name"] == entry["name"]:
+                    location.update(entry)
+                    return dict(location)
+            locations.append(entry)
+            return dict(entry)
+
+        with self._lock:
+            return self._update(change)
+
+    # Returns True if the location was registered.
+    def remove(self, name):
+        def change(locations):
+            before = len(locations)
+            locations[:] = [location for location in locations if location["name"] != name]
+            return len(locations) < before
+
+        with self._lock:
+            return self._update(change)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_location_registry():
+    global _registry
+    with _registry_lock:
+        if _registry is None or _registry.path != DATA_CONFIG["locations_path"]:
+            _registry = LocationRegistry(DATA_CONFIG["locations_path"])
+        return _registry
@@ -0,0 +1,147 @@
+import argparse
+import json
+import os
+import threading
+import time
+from Database.config import DATA_CONFIG
+
+
+# Append-only, line-delimited measurement log. Every append is a single
+# write() of one JSON line, flushed so readers see it immediately; fsync is
+# batched by count/time so the per-sample cost stays constant regardless of
+# how much history the file already holds.
+class MeasurementLog:
+    def __init__(self, path, fsync_every=10, fsync_interval=5.0):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._file = None
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def _ensure_open(self):
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self._file = open(self.path, 'ab')
+        return self._file
+
+    def append(self, entry):
+        line = (json.dumps(entry, separators=(',', ':')) + '\n').encode('utf-8')
+        with self._lock:
+            f = self._ensure_open()
+            f.write(line)
+            f.flush()
+            self._pending += 1
+            if (self._pending >= self.fsync_every
+                    or time.monotonic() - self._last_sync >= self.fsync_interval):
+                self._sync_locked()
+
+    def _sync_locked(self):
+        if self._file is not None and self._pending:
+            os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def sync(self):
+        with self._lock:
+            self._sync_locked()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._sync_locked()
+                self._file.close()
+                self._file = None
+
+
+# Reads complete lines starting at byte `offset`. A trailing line without a
+# newline (crash mid-write, or a writer racing us) is left for the next call.
+# Returns (entries, next_offset, bad_lines).
+def read_measurements(path, offset=0):
+    entries = []
+    bad_lines = 0
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            offset += len(line)
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                bad_lines += 1
+    return entries, offset, bad_lines
+
+
+# Same reading rules as read_measurements, one complete line at a time:
+# yields (entry, end_offset) where entry is None for a malformed line. The
+# end offset identifies the entry and is where a follower resumes after it.
+def iter_measurements(path, offset=0):
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b'\n'):
+                return
+            offset += len(line)
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line), offset
+            except ValueError:
+                yield None, offset
+
+
+# One-shot conversion of the legacy nested JSON document into the log format.
+# Entries are written in timestamp order and the target is replaced atomically.
+def migrate_json_to_log(json_path, log_path, overwrite=False):
+    if os.path.exists(log_path) and os.path.getsize(log_path) and not overwrite:
+        raise FileExistsError(f"{log_path} already exists; pass overwrite=True to replace it")
+
+    with open(json_path, 'r') as f:
+        data = json.load(f)
+
+    entries = [entry for measurements in data.values() for entry in measurements]
+    entries.sort(key=lambda entry: str(entry.get('timestamp', '')) if isinstance(entry, dict) else '')
+
+    tmp_path = log_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for entry in entries:
+            f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, log_path)
+    return len(entries)
+
+
+_log = None
+_log_lock = threading.Lock()
+
+
+# Process-wide log used by the collector. The first time it is opened, any
+# existing legacy JSON history is migrated so no samples are lost.
+def get_measurement_log():
+    global _log
+    with _log_lock:
+        if _log is None:
+            log_path = DATA_CONFIG["log_path"]
+            json_path = DATA_CONFIG["json_path"]
+            if not os.path.exists(log_path) and os.path.exists(json_path):
+                count = migrate_json_to_log(json_path, log_path)
+                print(f"✅ Migrated {count} entries from {json_path} to {log_path}")
+            _log = MeasurementLog(log_path, DATA_CONFIG["fsync_every"], DATA_CONFIG["fsync_interval"])
+        return _log
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Convert the nested wifi_data.json into the JSON Lines log")
+    parser.add_argument('--source', default=DATA_CONFIG["json_path"])
+    parser.add_argument('--target', default=DATA_CONFIG["log_path"])
+    parser.add_argument('--overwrite', action='store_true')
+    args = parser.parse_args()
+    count = migrate_json_to_log(args.source, args.target, overwrite=args.overwrite)
+    print(f"✅ Migrated {count} entries to {args.target}")
@@ -0,0 +1,158 @@
+import threading
+import time
+from datetime import datetime
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import BulkWriteError
+
+# One document per measurement. The old layout kept every sample for a
+# location in a single ever-growing array document under LEGACY_COLLECTION.
+MEASUREMENTS_COLLECTION = "measurements"
+LEGACY_COLLECTION = "wifi_data"
+LEGACY_BACKUP_COLLECTION = "wifi_data_nested_backup"
+
+METRIC_FIELDS = ["download_speed", "upload_speed", "latency_ms", "jitter_ms", "packet_loss", "rssi"]
+# Per-sample latency distribution from the ping RTTs; absent on older samples
+LATENCY_DETAIL_FIELDS = ["latency_min_ms", "latency_p50_ms", "latency_p95_ms", "latency_max_ms"]
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+# _id is the tie-breaker for keyset pagination (see Database.queries), so it
+# is part of both time-ordered indexes; the older indexes without it are
+# dropped as these cover their key prefixes.
+_RETIRED_INDEXES = ("location_timestamp", "timestamp_desc")
+
+
+def ensure_indexes(db):
+    col = db[MEASUREMENTS_COLLECTION]
+    existing = col.index_information()
+    for name in _RETIRED_INDEXES:
+        if name in existing:
+            col.drop_index(name)
+    col.create_index([("location", ASCENDING), ("timestamp", ASCENDING), ("_id", ASCENDING)],
+                     name="location_timestamp_id")
+    col.create_index([("timestamp", DESCENDING), ("_id", DESCENDING)], name="timestamp_id_desc")
+    col.create_index([("run_no", ASCENDING)], name="run_no")
+
+
+# Converts a stored entry (see src.main.build_entry) into a flat document.
+# The _id is derived from the sample itself so re-inserting it is a no-op.
+def measurement_document(entry):
+    location = entry["location"]
+    timestamp = entry["timestamp"]
+    if isinstance(timestamp, str):
+        timestamp = datetime.strptime(timestamp, TIMESTAMP_FORMAT)
+    doc = {
+        "_id": f"{location['position[name]']}|{entry.get('run_no')}|{timestamp.strftime(TIMESTAMP_FORMAT)}",
+        "timestamp": timestamp,
+        "run_no": entry.get("run_no"),
+        "location": location["position[name]"],
+        "position_x": location.get("position[x]"),
+        "position_y": location.get("position[y]"),
+    }
+    for field in METRIC_FIELDS + LATENCY_DETAIL_FIELDS:
+        doc[field] = entry.get(field)
+    return doc
+
+
+def _insert_documents(col, docs):
+    if not docs:
+        return 0
+    try:
+        return len(col.insert_many(docs, ordered=False).inserted_ids)
+    except BulkWriteError as e:
+        # Duplicate keys (code 11000) mean the sample is already stored.
+        errors = [err for err in e.details.get("writeErrors", []) if err.get("code") != 11000]
+        if errors:
+            raise
+        return e.details.get("nInserted", 0)
+
+
+# Buffers measurement documents and writes them with insert_many once
+# `batch_size` documents are pending or `flush_interval` seconds have passed.
+# Failed batches stay buffered (up to `max_buffer`) and are retried on the
+# next flush.
+class MeasurementWriter:
+    def __init__(self, db_getter, batch_size=50, flush_interval=5.0, max_buffer=10000):
+        self._db_getter = db_getter
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._indexed = False
+
+    def add(self, doc):
+        with self._lock:
+            self._buffer.append(doc)
+            if len(self._buffer) > self.max_buffer:
+                del self._buffer[:len(self._buffer) - self.max_buffer]
+            due = (len(self._buffer) >= self.batch_size
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+
+    # Buffers a whole batch and writes it immediately.
+    def add_many(self, docs):
+        with self._lock:
+            self._buffer.extend(docs)
+            if len(self._buffer) > self.max_buffer:
+                del self._buffer[:len(self._buffer) - self.max_buffer]
+        return self.flush()
+
+    def flush(self):
+        with self._lock:
+            docs, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+        if not docs:
+            return 0
+        try:
+            db = self._db_getter()
+            if not self._indexed:
+                ensure_indexes(db)
+                self._indexed = True
+            return _insert_documents(db[MEASUREMENTS_COLLECTION], docs)
+        except Exception:
+            with self._lock:
+                self._buffer[:0] = docs
+                del self._buffer[:max(0, len(self._buffer) - self.max_buffer)]
+            raise
+
+    def pending(self):
+        with self._lock:
+            return len(self._buffer)
+
+
+# Moves the nested per-location documents into the flat collection, then
+# renames the old collection so the migration runs only once.
+def migrate_nested_documents(db, batch_size=1000):
+    names = db.list_collection_names()
+    if LEGACY_COLLECTION not in names:
+        return 0
+
+    ensure_indexes(db)
+    col = db[MEASUREMENTS_COLLECTION]
+    migrated = 0
+    for doc in db[LEGACY_COLLECTION].find():
+        entries = doc.get(doc["_id"])
+        if not isinstance(entries, list):
+            continue
+        batch = []
+        for entry in entries:
+            try:
+                batch.append(measurement_document(entry))
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"⚠️ Skipping bad nested entry in {doc['_id']}: {e}")
+                continue
+            if len(batch) >= batch_size:
+                migrated += _insert_documents(col, batch)
+                batch = []
+        migrated += _insert_documents(col, batch)
+
+    db[LEGACY_COLLECTION].rename(LEGACY_BACKUP_COLLECTION, dropTarget=True)
+    return migrated
+
+
+if __name__ == '__main__':
+    from Database.database import get_db_connection
+    print(f"✅ Migrated {migrate_nested_documents(get_db_connection())} measurement(s)")
@@ -0,0 +1,123 @@
+import base64
+import json
+from datetime import datetime
+from pymongo import ASCENDING, DESCENDING
+from Database.models import MEASUREMENTS_COLLECTION, METRIC_FIELDS, LATENCY_DETAIL_FIELDS, TIMESTAMP_FORMAT
+
+# Read API over the flat measurements collection.
+#
+# Results are ordered by (timestamp, _id) and paginated with a keyset cursor:
+# the cursor encodes the last returned (timestamp, _id) and the next page
+# starts strictly after it, so every page is an index range scan (see
+# models.ensure_indexes) no matter how deep the client pages, and rows
+# inserted meanwhile never shift or repeat pages.
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 1000
+QUERYABLE_FIELDS = METRIC_FIELDS + LATENCY_DETAIL_FIELDS
+BASE_FIELDS = ["timestamp", "run_no", "location", "position_x", "position_y"]
+
+
+def parse_timestamp(value):
+    if value is None or value == "":
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid timestamp '{value}', expected YYYY-MM-DD[ HH:MM:SS]")
+
+
+def encode_cursor(doc):
+    raw = json.dumps([doc["timestamp"].strftime(TIMESTAMP_FORMAT), doc["_id"]])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor):
+    try:
+        timestamp, doc_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.strptime(timestamp, TIMESTAMP_FORMAT), doc_id
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def build_filter(locations=None, start=None, end=None, run_nos=None):
+    query = {}
+    if locations:
+        query["location"] = locations[0] if len(locations) == 1 else {"$in": list(locations)}
+    if start is not None or end is not None:
+        query["timestamp"] = {}
+        if start is not None:
+            query["timestamp"]["$gte"] = start
+        if end is not None:
+            query["timestamp"]["$lt"] = end
+    if run_nos:
+        query["run_no"] = run_nos[0] if len(run_nos) == 1 else {"$in": list(run_nos)}
+    return query
+
+
+# Returns only the base fields plus the requested metrics (all by default).
+# _id is always fetched because the cursor needs it; it is not returned.
+def build_projection(fields=None):
+    if fields:
+        unknown = [f for f in fields if f not in QUERYABLE_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    projection = {field: 1 for field in BASE_FIELDS + list(fields or QUERYABLE_FIELDS)}
+    projection["_id"] = 1
+    return projection
+
+
+def _keyset(query, cursor, descending):
+    if not cursor:
+        return query
+    timestamp, doc_id = decode_cursor(cursor)
+    op = "$lt" if descending else "$gt"
+    after = {"$or": [{"timestamp": {op: timestamp}}, {"timestamp": timestamp, "_id": {op: doc_id}}]}
+    return {"$and": [query, after]} if query else after
+
+
+def _find(db, query, fields, cursor, descending):
+    direction = DESCENDING if descending else ASCENDING
+    return (db[MEASUREMENTS_COLLECTION]
+            .find(_keyset(query, cursor, descending), build_projection(fields))
+            .sort([("timestamp", direction), ("_id", direction)]))
+
+
+# Makes a stored document JSON-friendly, in the same shape the collector logs.
+def serialize(doc):
+    out = {key: value for key, value in doc.items() if key != "_id"}
+    if isinstance(out.get("timestamp"), datetime):
+        out["timestamp"] = out["timestamp"].strftime(TIMESTAMP_FORMAT)
+    return out
+
+
+# One page of measurements plus the cursor for the next page (None on the
+# last page). One extra document is fetched to know whether more follow.
+def find_measurements(db, locations=None, start=None, end=None, run_nos=None, fields=None,
+                      limit=DEFAULT_PAGE_SIZE, cursor=None, descending=True):
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    query = build_filter(locations, start, end, run_nos)
+    docs = list(_find(db, query, fields, cursor, descending).limit(limit + 1))
+    next_cursor = encode_cursor(docs[limit - 1]) if len(docs) > limit else None
+    return [serialize(doc) for doc in docs[:limit]], next_cursor
+
+
+# Iterator over every matching measurement (or the first `limit`) that never
+# holds the result set in memory; the driver fetches STREAM_BATCH_SIZE at a
+# time. The query is built (and validated) before this returns, so bad
+# arguments raise here rather than halfway through a streamed response.
+def stream_measurements(db, locations=None, start=None, end=None, run_nos=None, fields=None,
+                        limit=None, cursor=None, descending=True):
+    query = build_filter(locations, start, end, run_nos)
+    results = _find(db, query, fields, cursor, descending).batch_size(STREAM_BATCH_SIZE)
+    if limit:
+        results = results.limit(int(limit))
+
+    def generate():
+        try:
+            for doc in results:
+                yield serialize(doc)
+        finally:
+            results.close()
+    return generate()
@@ -1,70 +1,171 @@
-from flask import Flask, redirect, jsonify, request, render_template
-from threading import Thread
-from src.main import start_collection, stop_collection, stop_event
+import json
+from flask import Flask, Response, redirect, jsonify, request, render_template, stream_with_context
+from src.jobs import get_job_manager
+from src.events import get_event_bus, start_log_relay, MEASUREMENT_TOPIC
 from dash_app import create_dash_app
-from Database.database import get_db_connection
+from Database.database import get_db_connection, pool_stats
+from Database.queries import find_measurements, stream_measurements, parse_timestamp, serialize, DEFAULT_PAGE_SIZE
+from Database.models import measurement_document
+from Database.locations import get_location_registry
+from modules.figure_cache import get_figure_cache
 
 proj = Flask(__name__)
 dash_app = create_dash_app(proj)
 
-collection_thread = None  # Global thread reference
+# Every worker follows the measurement log, so /events streams each sample
+# whichever worker's collector took it
+start_log_relay(lambda entry: serialize(measurement_document(entry)))
 
 @proj.route('/')
 def dashboard():
     return redirect('/dashboard/')
 
+def _arg_list(name):
+    values = []
+    for value in request.args.getlist(name):
+        values.extend(v.strip() for v in value.split(',') if v.strip())
+    return values
+
+
+def _measurement_query_args():
+    return {
+        "locations": _arg_list('location') or None,
+        "start": parse_timestamp(request.args.get('start')),
+        "end": parse_timestamp(request.args.get('end')),
+        "run_nos": [int(run) for run in _arg_list('run_no')] or None,
+        "fields": _arg_list('fields') or None,
+        "cursor": request.args.get('cursor') or None,
+        "descending": request.args.get('order', 'desc') != 'asc',
+    }
+
+
+# Measurements, newest first by default. Filters: location (repeatable or
+# comma separated), start/end (timestamp range, end exclusive), run_no,
+# fields (metrics to return), order=asc|desc. Returns one page plus
+# `next_cursor` to pass back as `cursor`; with format=ndjson (or an
+# application/x-ndjson Accept header) streams every match as JSON Lines.
 @proj.route('/showdata')
 def showdata():
     try:
+        args = _measurement_query_args()
         db = get_db_connection()
-        wifi_data_col = db["wifi_data"]
-        data = list(wifi_data_col.find({}, {"_id": 0}).sort("timestamp", -1).limit(100))
-        return jsonify(data)
+        if request.args.get('format') == 'ndjson' or request.accept_mimetypes.best == 'application/x-ndjson':
+            limit = request.args.get('limit', type=int)
+            rows = stream_measurements(db, limit=limit, **args)
+            lines = (json.dumps(row) + "\n" for row in rows)
+            return Response(stream_with_context(lines), mimetype='application/x-ndjson')
+
+        limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+        data, next_cursor = find_measurements(db, limit=limit, **args)
+        return jsonify({"data": data, "count": len(data), "next_cursor": next_cursor})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)})
 
+SSE_KEEPALIVE_SECONDS = 15
+
+
+def _sse_events(subscription):
+    try:
+        while True:
+            event = subscription.get(timeout=SSE_KEEPALIVE_SECONDS)
+            if event is None:
+                if subscription.closed:
+                    return
+                yield ": keep-alive\n\n"
+                continue
+            event_id, topic, payload = event
+            yield f"id: {event_id}\nevent: {topic}\ndata: {json.dumps(payload)}\n\n"
+    finally:
+        subscription.close()
+
+
+# Server-Sent Events stream of new measurements for the dashboard
+# (assets/live_updates.js). A reconnecting browser sends Last-Event-ID and
+# gets the events it missed replayed first; ids are log offsets, so this
+# works whichever worker it reconnects to.
+@proj.route('/events')
+def events():
+    last_id = request.headers.get('Last-Event-ID', type=int)
+    subscription = get_event_bus().subscribe([MEASUREMENT_TOPIC], last_id=last_id)
+    return Response(
+        stream_with_context(_sse_events(subscription)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@proj.route('/events/stats')
+def events_stats():
+    return jsonify(get_event_bus().stats())
+
+@proj.route('/db/pool')
+def db_pool():
+    return jsonify(pool_stats())
+
+@proj.route('/dashboard-cache/stats')
+def dashboard_cache_stats():
+    return jsonify(get_figure_cache().stats())
+
+# Collection state comes from the shared job registry, so every worker
+# reports (and can stop) the same collector
 @proj.route('/collection/status')
 def collection_status():
-    is_running = collection_thread and collection_thread.is_alive()
-    return {'status': is_running}
+    job = get_job_manager().status()
+    return {'status': job is not None, 'job': job}
+
+@proj.route('/collection/jobs')
+def collection_jobs():
+    return jsonify(get_job_manager().jobs(request.args.get('limit', 20, type=int)))
+
+
+# Location registry: GET lists the registered locations, POST adds or
+# updates one ({"name", "x", "y", "collect"}) without a code change
+@proj.route('/locations', methods=['GET', 'POST'])
+def locations():
+    registry = get_location_registry()
+    if request.method == 'GET':
+        return jsonify(registry.all())
+    body = request.get_json(silent=True) or {}
+    try:
+        location = registry.add(body['name'], body['x'], body['y'], collect=body.get('collect', False))
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({"error": f"Expected name, x and y: {e}"}), 400
+    return jsonify(location)
+
+@proj.route('/locations/<name>', methods=['DELETE'])
+def delete_location(name):
+    if not get_location_registry().remove(name):
+        return jsonify({"error": f"Unknown location '{name}'"}), 404
+    return jsonify({"removed": name})
 
 
 #Combined Start/Stop UI + Logic Route
 @proj.route('/collection', methods=['GET', 'POST'])
 def collection():
-    global collection_thread
+    manager = get_job_manager()
     message = ""
-    status = False
 
     if request.method == 'POST':
         action = request.form.get('action')
         if action == 'start':
-            if collection_thread and collection_thread.is_alive():
-                status = True
-                message = "⚠️ Data collection is already running!"
+            # Locations flagged "collect" in the registry
+            loc = get_location_registry().collection_targets()
+            if not loc:
+                message = "⚠️ No locations are enabled for collection"
             else:
-                stop_event.clear()
-                # loc = [['ECC', 67.12, -43.45], ['GEC', 70.21, -40.31], ['SDB', 65.78, -42.5],
-                #        ['FOODCOURT', 68.33, -41.25], ['LOUNGE', 69.0, -39.9]]
-                loc = [['ECC', 67.12, -43.45]]
-                collection_thread = Thread(target=start_collection, args=(loc,))
-                collection_thread.start()
-                status = True
-                message = "🚀 Data Collection Started"
+                job, started = manager.start(loc, continuous=request.form.get('mode') == 'continuous')
+                if started:
+                    message = "🚀 Data Collection Started"
+                else:
+                    message = "⚠️ Data collection is already running!"
         elif action == 'stop':
-            stop_collection()
-            if collection_thread and collection_thread.is_alive():
-                collection_thread.join(timeout=5)
-                message = "🛑 Data Collection Stopped"
+            if manager.stop() is not None:
+                message = "🛑 Data Collection Stopping"
             else:
                 message = "⚠️ No active data collection to stop"
 
-    # ✅ Check if thread is still alive after the POST request logic
-    if collection_thread and collection_thread.is_alive():
-        status = True
-    else:
-        status = False
-
+    status = manager.status() is not None
     return render_template("collection.html", message=message, status=status)
 
 
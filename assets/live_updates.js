@@ -0,0 +1,39 @@
+// Receives new measurements from the collector over Server-Sent Events
+// (/events) and hands them to Dash through the 'live-measurement' store.
+// Samples arriving close together are delivered as one batch so a burst
+// triggers a single callback; EventSource reconnects on its own and the
+// server replays missed events from Last-Event-ID.
+(function () {
+    if (!window.EventSource) {
+        return;
+    }
+
+    var FLUSH_MS = 250;
+    var MAX_PENDING = 2000;
+    var pending = [];
+    var timer = null;
+    var batch = 0;
+
+    function flush() {
+        timer = null;
+        if (!pending.length || !window.dash_clientside || !window.dash_clientside.set_props) {
+            return;
+        }
+        batch += 1;
+        window.dash_clientside.set_props('live-measurement', {
+            data: {batch: batch, samples: pending}
+        });
+        pending = [];
+    }
+
+    var source = new EventSource('/events');
+    source.addEventListener('measurement', function (event) {
+        pending.push(JSON.parse(event.data));
+        if (pending.length > MAX_PENDING) {
+            pending.splice(0, pending.length - MAX_PENDING);
+        }
+        if (timer === null) {
+            timer = setTimeout(flush, FLUSH_MS);
+        }
+    });
+})();
@@ -0,0 +1,93 @@
+# Times the anomaly detector on --days of 5-minute samples for every registered
+# location (a year by default): one full scan, as after a dataset load, then
+# a day of samples appended in --batches increments, as the store feeds it
+# while collecting. A latency spike and a download-speed drop are injected
+# per location and must come out as the top events.
+#
+#   python -m benchmarks.bench_anomalies --days 365
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from modules.anomalies import AnomalyDetector
+from modules.data_loader import METRIC_COLUMNS
+from Database.locations import get_location_registry
+
+SAMPLES_PER_DAY = 288
+
+
+def make_frame(days, locations, seed=0):
+    rng = np.random.default_rng(seed)
+    periods = days * SAMPLES_PER_DAY
+    timestamps = pd.date_range('2025-01-01', periods=periods, freq='5min')
+    # Busier (slower) in the afternoon
+    load = 1 + 0.3 * np.sin(2 * np.pi * (timestamps.hour.to_numpy() - 8) / 24)
+    frames = []
+    for i, location in enumerate(locations):
+        frame = pd.DataFrame({
+            'timestamp': timestamps,
+            'location': location,
+            'download_speed': rng.normal(120, 8, periods) / load,
+            'upload_speed': rng.normal(60, 4, periods) / load,
+            'latency_ms': rng.normal(20, 2, periods) * load,
+            'jitter_ms': np.abs(rng.normal(3, 0.5, periods)) * load,
+            'packet_loss': np.abs(rng.normal(0.2, 0.05, periods)),
+            'rssi': rng.normal(-60, 2, periods),
+        })
+        spike = periods // 3 + i * 97
+        frame.loc[spike:spike + 3, 'latency_ms'] *= 6
+        drop = periods // 2 + i * 211
+        frame.loc[drop:drop + SAMPLES_PER_DAY, 'download_speed'] *= 0.5
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--batches', type=int, default=24)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    locations = get_location_registry().names()
+    frame = make_frame(args.days, locations)
+    frame['location'] = frame['location'].astype('category')
+    cutoff = frame['timestamp'].max() - pd.Timedelta(days=1)
+    history, recent = frame[frame['timestamp'] <= cutoff], frame[frame['timestamp'] > cutoff]
+    recent = recent.sort_values('timestamp')
+    edges = np.linspace(0, len(recent), args.batches + 1).astype(int)
+    batches = [recent.iloc[a:b] for a, b in zip(edges[:-1], edges[1:])]
+    print(f"rows: {len(frame)}  locations: {frame['location'].nunique()}  metrics: {len(METRIC_COLUMNS)}")
+
+    full = []
+    for _ in range(args.repeat):
+        detector = AnomalyDetector(METRIC_COLUMNS)
+        start = time.perf_counter()
+        detector.on_rows(frame, True)
+        full.append(time.perf_counter() - start)
+    print(f"full scan        {min(full) * 1000:8.1f} ms")
+
+    detector = AnomalyDetector(METRIC_COLUMNS)
+    detector.on_rows(history, True)
+    start = time.perf_counter()
+    for batch in batches:
+        detector.on_rows(batch, False)
+    elapsed = time.perf_counter() - start
+    print(f"incremental      {elapsed / len(batches) * 1000:8.2f} ms per batch of ~{len(recent) // len(batches)} rows")
+
+    events = detector.events()
+    expected = {(loc, m) for loc in locations for m in ('latency_ms', 'download_speed')}
+    ranked = [(e['location'], e['metric']) in expected for e in events]
+    false_positive = ranked.index(False) if False in ranked else len(ranked)
+    found = {(e['location'], e['metric']) for e in events[:false_positive]}
+    print(f"events: {len(events)}  injected degradations ranked above every other event: "
+          f"{len(found)}/{len(expected)}")
+    for event in events[:5]:
+        print(f"  {event['severity']:6.1f}  {event['location']:<10} {event['metric']:<15} {event['kind']:<6}"
+              f" {event['start']:%Y-%m-%d %H:%M} -> {event['end']:%Y-%m-%d %H:%M}")
+
+
+if __name__ == '__main__':
+    main()
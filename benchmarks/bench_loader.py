@@ -0,0 +1,103 @@
+# Compares the vectorized loader against the original per-record loop on a
+# synthetic nested {location: [measurements]} document and checks both
+# produce the same frame.
+#
+#   python -m benchmarks.bench_loader --rows 200000
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from modules.data_loader import _read_wifi_json
+
+
+def legacy_read_wifi_json(json_path):
+    with open(json_path, 'r') as file:
+        data = json.load(file)
+
+    records = []
+    for location, measurements in data.items():
+        for measurement in measurements:
+            try:
+                timestamp = datetime.strptime(measurement['timestamp'], '%Y-%m-%d %H:%M:%S')
+                records.append({
+                    'timestamp': timestamp,
+                    'date': timestamp.strftime('%Y-%m-%d'),
+                    'hour': timestamp.strftime('%H:00'),
+                    'location': measurement['location']['position[name]'],
+                    'download_speed': measurement['download_speed'],
+                    'upload_speed': measurement['upload_speed'],
+                    'latency_ms': measurement['latency_ms'],
+                    'jitter_ms': measurement['jitter_ms'],
+                    'packet_loss': measurement['packet_loss'],
+                    'rssi': measurement['rssi']
+                })
+            except Exception:
+                continue
+    return pd.DataFrame(records)
+
+
+def make_document(rows, locations=("ECC", "GEC", "SDB", "FOODCOURT", "LOUNGE")):
+    per_location = max(1, rows // len(locations))
+    start = datetime(2025, 1, 1)
+    data = {}
+    for name in locations:
+        entries = []
+        for i in range(per_location):
+            entries.append({
+                "timestamp": (start + timedelta(minutes=5 * i)).strftime("%Y-%m-%d %H:%M:%S"),
+                "run_no": i + 1,
+                "location": {"position[x]": 0.0, "position[y]": 0.0, "position[name]": name},
+                "download_speed": random.uniform(10, 100),
+                "upload_speed": random.uniform(4, 50),
+                "latency_ms": float(random.randint(30, 120)),
+                "jitter_ms": 0.0,
+                "packet_loss": 0.0,
+                "rssi": 100
+            })
+        data[name] = entries
+    # A couple of malformed entries, which both loaders must skip.
+    data[locations[0]].append({"timestamp": "not a timestamp", "location": {}})
+    data[locations[0]].append({"timestamp": "2025-01-01 00:00:00"})
+    return data
+
+
+def timed(fn, *args, repeat=3):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'wifi_data.json')
+        with open(path, 'w') as f:
+            json.dump(make_document(args.rows), f)
+
+        legacy_time, legacy = timed(legacy_read_wifi_json, path)
+        vector_time, (vectorized, _) = timed(_read_wifi_json, path)
+
+    # The legacy loop only builds the original columns
+    vectorized = vectorized[list(legacy.columns)].astype({'date': str, 'hour': str})
+    pd.testing.assert_frame_equal(legacy, vectorized)
+
+    print(f"rows: {len(legacy)}")
+    print(f"legacy loop: {legacy_time * 1000:.1f} ms")
+    print(f"vectorized:  {vector_time * 1000:.1f} ms ({legacy_time / vector_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
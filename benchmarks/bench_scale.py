@@ -0,0 +1,180 @@
+# Scale benchmark: load, filter, aggregate and figure-build latency for
+# every dashboard callback at several dataset sizes, to catch regressions.
+#
+# For each --rows size a seeded synthetic dataset (dummydatageneration) is
+# written as a JSON Lines log plus its Parquet snapshot, then measured in a
+# fresh interpreter so sizes do not share caches. Each step reports its
+# first (cold) call and the best of the following --repeat calls (warm;
+# figure and grid caches hit). --save writes the results as JSON and
+# --compare flags steps more than --tolerance slower than in a saved run.
+#
+#   python -m benchmarks.bench_scale --rows 10000 1000000 10000000 --save bench.json
+#   python -m benchmarks.bench_scale --rows 10000 1000000 --compare bench.json
+#
+# The full load parses the whole log: 10M rows need several GB of memory.
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from Database.locations import get_location_registry
+from dummydatageneration import generate_frames, write_jsonl, write_parquet
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, sys, time
+from Database.config import DATA_CONFIG
+DATA_CONFIG.update(json.loads(sys.argv[1]))
+repeat = int(sys.argv[2])
+import pandas as pd
+from flask import Flask
+from dash_app import create_dash_app
+import modules.data_loader as dl
+
+callbacks = create_dash_app(Flask(__name__)).callback_map
+results, covered = [], set()
+
+def measure(group, name, fn, *args, warm=True):
+    start = time.perf_counter()
+    fn(*args)
+    first = time.perf_counter() - start
+    best = None
+    for _ in range(repeat if warm else 0):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best or float('inf'), time.perf_counter() - start)
+    results.append({'group': group, 'name': name, 'first': first, 'warm': best})
+
+def callback(output):
+    key = next(key for key in callbacks if output in key)
+    covered.add(key)
+    return callbacks[key]['callback'].__wrapped__
+
+from modules.metadata import dataset_metadata
+meta = dataset_metadata()
+location, date = meta['locations'][0], meta['dates'][len(meta['dates']) // 2]
+start = pd.Timestamp(date)
+end = start + pd.Timedelta(days=7)
+
+measure('load', 'snapshot pushdown (location, day)', dl.load_wifi_data, [location], [date], warm=False)
+measure('load', 'full dataset', dl.load_wifi_data, warm=False)
+
+measure('filter', 'location + day', dl.load_wifi_data, [location], [date])
+measure('filter', 'location + 7 days', dl.slice_wifi_data, location, start, end)
+measure('filter', 'hour of day', dl.load_wifi_data, None, None, ['13:00'])
+
+measure('aggregate', 'rollups by location', lambda: dl.get_rollups().location_summary())
+measure('aggregate', 'percentile sketches', lambda: [dl.get_streaming_stats().summary('latency_ms', loc)
+                                                     for loc in meta['locations']])
+measure('aggregate', 'anomaly events', lambda: dl.get_anomaly_detector().events(limit=50))
+measure('aggregate', 'heatmap grid (all data)', dl.get_heatmap_grid, 'rssi')
+
+render = callback('tab-content.children')
+for tab in ('overview', 'trends', 'heatmap', 'insights'):
+    measure('figure', f'render_tab_content {tab}', render, tab)
+trends = callback('trends-time-series.figure')
+measure('figure', 'update_trends all hours', trends, location, 'download_speed', 'All Hours')
+measure('figure', 'update_trends 13:00', trends, location, 'download_speed', '13:00')
+samples = [{'location': location, 'timestamp': f"{date} 13:{i % 60:02d}:00", 'download_speed': 50.0}
+           for i in range(100)]
+measure('figure', 'extend_trends 100 samples', callback('trends-time-series.extendData'),
+        {'batch': 1, 'samples': samples}, location, 'download_speed', 'All Hours')
+overview = callback('overview-percentiles.figure')
+measure('figure', 'update_overview all locations', overview, 'latency_ms', 'All Locations')
+measure('figure', 'update_overview by hour', overview, 'latency_ms', location)
+heatmap = callback('heatmap-graph.figure')
+measure('figure', 'update_heatmap all data', heatmap, 'download_speed', 'All Data')
+measure('figure', 'update_heatmap one day', heatmap, 'download_speed', date)
+measure('figure', 'update_insights', callback('insights-events.children'),
+        'All Locations', 'All Parameters', None)
+measure('figure', 'toggle_button', callback('data-toggle-btn.children'), 1, {'active': False})
+
+missing = sorted(set(callbacks) - covered)
+print(json.dumps({'rows': len(dl.load_wifi_data()), 'results': results, 'uncovered': missing}))
+"""
+
+
+def generate(rows, directory):
+    registry = get_location_registry()
+    locations = [(loc['name'], loc['x'], loc['y']) for loc in registry.all()]
+    periods = max(1, -(-rows // len(locations)))
+    frames = list(generate_frames(locations, periods))
+    config = {
+        'json_path': os.path.join(directory, 'wifi_data.json'),
+        'log_path': os.path.join(directory, 'wifi_data.jsonl'),
+        'snapshot_dir': os.path.join(directory, 'snapshots'),
+        'meta_path': os.path.join(directory, 'wifi_meta.json'),
+    }
+    write_jsonl(frames, config['log_path'])
+    try:
+        write_parquet(frames, config['snapshot_dir'], config['log_path'])
+    except RuntimeError as e:
+        print(f"⚠️ {e}; measuring without a snapshot")
+    return config
+
+
+def run_child(config, repeat):
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD, json.dumps(config), str(repeat)],
+        cwd=REPO_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+# Compared against a baseline: the warm time when the step has one (best of
+# several calls), else the single cold call. Differences under NOISE_FLOOR
+# seconds are never flagged.
+NOISE_FLOOR = 0.001
+
+
+def _steady(result):
+    return result['warm'] if result['warm'] is not None else result['first']
+
+
+def report(rows, run, baseline, tolerance):
+    print(f"\nrows: {run['rows']:,} (requested {rows:,})")
+    print(f"  {'step':<46}{'first ms':>11}{'warm ms':>11}")
+    for result in run['results']:
+        warm = '' if result['warm'] is None else f"{result['warm'] * 1000:11.2f}"
+        line = f"  {result['group'] + ': ' + result['name']:<46}{result['first'] * 1000:11.2f}{warm:>11}"
+        previous = baseline.get((result['group'], result['name']))
+        if previous is not None:
+            now, before = _steady(result), _steady(previous)
+            if now > before * (1 + tolerance) and now - before > NOISE_FLOOR:
+                line += f"  ⚠️ {now / before:.1f}x slower than baseline"
+        print(line)
+    if run['uncovered']:
+        print(f"  ⚠️ callbacks not benchmarked: {', '.join(run['uncovered'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 1000000, 10000000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--save', help="write the results to this JSON file")
+    parser.add_argument('--compare', help="JSON file from an earlier --save run")
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args()
+
+    baselines = {}
+    if args.compare:
+        with open(args.compare) as f:
+            for rows, run in json.load(f).items():
+                baselines[int(rows)] = {(r['group'], r['name']): r for r in run['results']}
+
+    runs = {}
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            runs[rows] = run_child(generate(rows, tmp), args.repeat)
+        report(rows, runs[rows], baselines.get(rows, {}), args.tolerance)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(runs, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
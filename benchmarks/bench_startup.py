@@ -0,0 +1,89 @@
+# Measures dashboard start-up in a fresh interpreter: building the Flask +
+# Dash app, serving the first layout and reading the dataset metadata (what
+# the Trends tab needs for its dropdowns), against a synthetic log of --rows
+# samples. "eager" additionally loads the full dataset during start-up, as
+# create_dash_app used to. "lazy (cold)" is the first start without the
+# metadata sidecar, which reads the log once to build it.
+#
+#   python -m benchmarks.bench_startup --rows 200000
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.bench_loader import make_document
+from Database.measurement_log import migrate_json_to_log
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+from Database.config import DATA_CONFIG
+DATA_CONFIG.update(json.loads(sys.argv[1]))
+from flask import Flask
+from dash_app import create_dash_app
+app = Flask(__name__)
+create_dash_app(app)
+if sys.argv[2] == 'eager':
+    from modules.data_loader import load_wifi_data
+    load_wifi_data()
+built = time.perf_counter()
+assert app.test_client().get('/dashboard/_dash-layout').status_code == 200
+served = time.perf_counter()
+from modules.metadata import dataset_metadata
+dataset_metadata()
+done = time.perf_counter()
+print(json.dumps({'build': built - start, 'first_layout': served - built, 'metadata': done - served,
+                  'pandas_imported': 'pandas' in sys.modules}))
+"""
+
+
+def run_child(config, mode):
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD, json.dumps(config), mode],
+        cwd=REPO_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def best_of(config, mode, repeat):
+    runs = [run_child(config, mode) for _ in range(repeat)]
+    return min(runs, key=lambda run: run['build'] + run['first_layout'] + run['metadata'])
+
+
+def report(label, run):
+    total = run['build'] + run['first_layout'] + run['metadata']
+    print(f"{label:<12} build {run['build'] * 1000:7.1f} ms  first layout {run['first_layout'] * 1000:6.1f} ms"
+          f"  metadata {run['metadata'] * 1000:6.1f} ms  total {total * 1000:7.1f} ms"
+          f"  pandas imported: {run['pandas_imported']}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'wifi_data.json')
+        with open(json_path, 'w') as f:
+            json.dump(make_document(args.rows), f)
+        config = {
+            'json_path': json_path,
+            'log_path': os.path.join(tmp, 'wifi_data.jsonl'),
+            'meta_path': os.path.join(tmp, 'wifi_meta.json'),
+            'snapshot_dir': os.path.join(tmp, 'snapshots'),
+        }
+        migrate_json_to_log(json_path, config['log_path'])
+
+        print(f"rows: {args.rows}")
+        report("lazy (cold)", run_child(config, 'lazy'))
+        report("lazy", best_of(config, 'lazy', args.repeat))
+        report("eager", best_of(config, 'eager', args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,4 @@
 from dash import Dash
-from modules.data_loader import load_wifi_data
 from modules.layouts import serve_layout
 
 from modules.callbacks import register_callbacks
@@ -17,11 +16,6 @@ def create_dash_app(flask_app):
 }
 
 
-    df = load_wifi_data()
-    locations = sorted(df['location'].unique()) if not df.empty else []
-    dates = ['All Dates'] + sorted(df['date'].unique()) if not df.empty else ['All Dates']
-    hours = ['All Hours'] + sorted(df['hour'].unique()) if not df.empty else ['All Hours']
-
     dash_app.index_string = '''
     <!DOCTYPE html>
     <html>
@@ -120,6 +114,25 @@ h2, h3, h4 {
     background-color: #0056b3;
 }
 
+.insights-table {
+    width: 100%;
+    border-collapse: collapse;
+    color: #ECEFF1;
+    font-size: 14px;
+}
+
+.insights-table th,
+.insights-table td {
+    padding: 8px 10px;
+    border-bottom: 1px solid #33475B;
+    text-align: left;
+}
+
+.insights-table th {
+    color: #00BFA6;
+    font-weight: 600;
+}
+
 .status-text {
     font-size: 11px;
     color: #ccc;
@@ -140,7 +153,9 @@ h2, h3, h4 {
     </html>
     '''
 
-    dash_app.layout = serve_layout(colors, locations, dates, hours)
+    # Built per page load; data-dependent options come from the metadata
+    # index, so creating the app never touches the dataset itself
+    dash_app.layout = lambda: serve_layout(colors)
 
     register_callbacks(dash_app, colors)
 
@@ -1,53 +1,238 @@
-import random
+import argparse
 import json
-from datetime import datetime, timedelta
-
-# Define locations and their coordinates
-locations = {
-    "ECC": (67.12, -43.45),
-    "GEC": (70.21, -40.31),
-    "SDB": (65.78, -42.50),
-    "FOODCOURT": (68.33, -41.25),
-    "LOUNGE": (69.0, -39.9)
-}
-
-# Time range and interval
-start_time = datetime(2025, 4, 5, 8, 0)
-end_time = datetime(2025, 4, 8, 18, 0)
-interval = timedelta(minutes=5)
-
-# Container for final dataset
-wifi_data = []
-
-# Loop through each location
-for loc_name, (x, y) in locations.items():
-    records = []
-    timestamp = start_time
-    run_no = 1
-    while timestamp <= end_time:
-        record = {
-            "timestamp": timestamp.strftime('%Y-%m-%d %H:%M:%S'),
-            "location": {
-                "position[name]": loc_name,
-                "position[x]": x,
-                "position[y]": y
-            },
-            "download_speed": round(random.uniform(10, 100), 10),
-            "upload_speed": round(random.uniform(4, 50), 10),
-            "latency_ms": random.randint(30, 120),
-            "jitter_ms": 0,
-            "packet_loss": 0,
-            "rssi": 100,
-            "run_no": run_no
-        }
-        records.append(record)
-        run_no += 1
-        timestamp += interval
-
-    wifi_data.append({loc_name: records})
-
-# Save to JSON
-with open("data/dummy_wifi_data.json", "w") as f:
-    json.dump(wifi_data, f, indent=2)
-
-print("✅ Large dataset written to data/large_wifi_data.json")
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from Database.locations import get_location_registry
+from Database.models import MeasurementWriter, LATENCY_DETAIL_FIELDS
+
+# Synthetic WiFi measurements in every format the dashboard reads.
+#
+# Samples are generated per location with NumPy: one sweep every `interval`
+# minutes (one run_no per sweep, as the collector numbers them), a diurnal
+# load curve with a midday and an evening peak, per-location quality and
+# random outages (near-zero throughput, high latency and loss). Signal is
+# modelled in dBm and stored as the 0-100 quality the collector records
+# (netsh "Signal", or dBm mapped by the Linux RSSI probe). The same seed
+# always gives the same data.
+#
+#   python dummydatageneration.py --days 3
+#   python dummydatageneration.py --rows 1000000 --formats jsonl parquet
+#   python dummydatageneration.py --days 30 --formats mongo
+
+FORMATS = ("json", "jsonl", "parquet", "mongo")
+METRIC_FIELDS = ["download_speed", "upload_speed", "latency_ms", "jitter_ms", "packet_loss", "rssi"]
+
+_LINE = ('{{"timestamp":"{}","run_no":{},"location":{{"position[x]":{},"position[y]":{},'
+         '"position[name]":{}}},"download_speed":{},"upload_speed":{},"latency_ms":{},"jitter_ms":{},'
+         '"packet_loss":{},"rssi":{},"latency_min_ms":{},"latency_p50_ms":{},"latency_p95_ms":{},'
+         '"latency_max_ms":{}}}')
+
+
+# Share of peak load at each fractional hour of day: quiet overnight,
+# busiest around 13:00 with a second peak around 18:30.
+def diurnal_load(hours):
+    return (0.15 + 0.85 * np.exp(-((hours - 13.0) / 3.0) ** 2)
+            + 0.6 * np.exp(-((hours - 18.5) / 1.5) ** 2)).clip(0, 1)
+
+
+# dBm -> the 0-100 signal quality stored in the rssi column; vectorized
+# LinuxRssiProbe.to_quality.
+def rssi_quality(dbm):
+    return np.clip(2 * (np.asarray(dbm, dtype=float) + 100), 0, 100).astype(int)
+
+
+def _outage_mask(rng, periods, interval, outages_per_day):
+    days = periods * interval / 1440
+    count = rng.poisson(outages_per_day * days)
+    mask = np.zeros(periods + 1, dtype=np.int32)
+    starts = rng.integers(0, periods, count)
+    lengths = np.maximum(1, rng.exponential(30.0 / interval, count).astype(int))
+    np.add.at(mask, starts, 1)
+    np.add.at(mask, np.minimum(starts + lengths, periods), -1)
+    return np.cumsum(mask[:-1]) > 0
+
+
+# One location's samples as a frame with the loader's columns plus run_no.
+def _location_frame(rng, name, x, y, timestamps, run_nos, interval, outages_per_day):
+    periods = len(timestamps)
+    stamps = timestamps + pd.to_timedelta(rng.integers(0, 60, periods), unit='s')
+    load = diurnal_load(stamps.hour.to_numpy() + stamps.minute.to_numpy() / 60)
+    down = _outage_mask(rng, periods, interval, outages_per_day)
+
+    base_down = rng.uniform(60, 150)
+    download = base_down * (1 - 0.55 * load) * rng.lognormal(0, 0.12, periods)
+    upload = download * rng.uniform(0.3, 0.5) * rng.lognormal(0, 0.1, periods)
+    latency = rng.uniform(12, 35) * (1 + 1.5 * load) + rng.gamma(2.0, 2.0, periods)
+    jitter = latency * 0.08 * rng.gamma(2.0, 0.5, periods)
+    packet_loss = np.maximum(rng.exponential(0.4 * load) - 0.3, 0)
+    rssi = rng.uniform(-70, -45) - 4 * load + rng.normal(0, 2, periods)
+
+    download = np.where(down, download * 0.02, download)
+    upload = np.where(down, upload * 0.02, upload)
+    latency = np.where(down, latency * 8, latency)
+    jitter = np.where(down, jitter * 5, jitter)
+    packet_loss = np.where(down, rng.uniform(30, 100, periods), packet_loss)
+    rssi = np.where(down, rssi - 20, rssi)
+
+    frame = pd.DataFrame({
+        'timestamp': stamps,
+        'run_no': run_nos,
+        'location': name,
+        'x': float(x),
+        'y': float(y),
+        'download_speed': download.round(3),
+        'upload_speed': upload.round(3),
+        'latency_ms': latency.round(3),
+        'jitter_ms': jitter.round(3),
+        'packet_loss': packet_loss.clip(0, 100).round(3),
+        'rssi': rssi_quality(rssi),
+    })
+    frame['latency_min_ms'] = (latency * rng.uniform(0.6, 0.9, periods)).round(3)
+    frame['latency_p50_ms'] = (latency * rng.uniform(0.9, 1.05, periods)).round(3)
+    frame['latency_p95_ms'] = (latency * rng.uniform(1.2, 2.0, periods)).round(3)
+    frame['latency_max_ms'] = (frame['latency_p95_ms'] * rng.uniform(1.0, 1.5, periods)).round(3)
+    return frame
+
+
+# Yields one frame per location with `periods` sweeps each. `locations` is a
+# list of (name, x, y).
+def generate_frames(locations, periods, interval=5, start=datetime(2025, 4, 5), seed=42,
+                    outages_per_day=0.2):
+    timestamps = pd.date_range(start, periods=periods, freq=f"{interval}min")
+    run_nos = np.arange(1, periods + 1)
+    for i, (name, x, y) in enumerate(locations):
+        rng = np.random.default_rng([seed, i])
+        yield _location_frame(rng, name, x, y, timestamps, run_nos, interval, outages_per_day)
+
+
+# Stored-entry JSON lines (see src.main.build_entry) for the rows of a frame.
+def entry_lines(frame):
+    stamps = np.datetime_as_string(frame['timestamp'].to_numpy(dtype='datetime64[s]'), unit='s')
+    quoted = {name: json.dumps(str(name)) for name in frame['location'].unique()}
+    names = [quoted[name] for name in frame['location'].tolist()]
+    columns = [frame[c].tolist() for c in ['run_no', 'x', 'y']]
+    metrics = [frame[c].tolist() for c in METRIC_FIELDS + LATENCY_DETAIL_FIELDS]
+    for stamp, run_no, x, y, name, *values in zip(stamps.tolist(), *columns, names, *metrics):
+        yield _LINE.format(stamp.replace('T', ' '), run_no, x, y, name, *values)
+
+
+# Legacy nested {location: [entries]} document.
+def write_json(frames, path):
+    with open(path, 'w') as f:
+        f.write('{')
+        for i, frame in enumerate(frames):
+            name = json.dumps(str(frame['location'].iloc[0]))
+            f.write(f"{',' if i else ''}\n{name}: [\n")
+            f.write(',\n'.join(entry_lines(frame)))
+            f.write('\n]')
+        f.write('\n}\n')
+
+
+# Append-only log, in timestamp order like the collector writes it.
+def write_jsonl(frames, path):
+    frame = pd.concat(frames, ignore_index=True).sort_values('timestamp', kind='stable')
+    with open(path, 'w') as f:
+        for start in range(0, len(frame), 100000):
+            f.write('\n'.join(entry_lines(frame.iloc[start:start + 100000])) + '\n')
+
+
+# Parquet snapshot of a log written by write_jsonl, with a manifest saying it
+# covers the whole log so the loader reads it instead of re-parsing.
+def write_parquet(frames, snapshot_dir, log_path):
+    from modules.data_loader import _FRAME_COLUMNS, HOUR_LABELS, _file_identity
+    from modules.snapshots import write_partitions, save_manifest
+
+    frame = pd.concat(frames, ignore_index=True)
+    frame['date'] = frame['timestamp'].dt.strftime('%Y-%m-%d')
+    frame['hour'] = pd.Categorical.from_codes(frame['timestamp'].dt.hour, categories=HOUR_LABELS)
+    os.makedirs(snapshot_dir, exist_ok=True)
+    rows = write_partitions(frame[_FRAME_COLUMNS], snapshot_dir)
+    inode, size = _file_identity(log_path)
+    save_manifest(snapshot_dir, {"log_inode": inode, "offset": size, "rows": rows, "columns": _FRAME_COLUMNS})
+
+
+# Flat documents in the measurements collection (see Database.models).
+def write_mongo(frames, batch_size=5000):
+    from Database.database import get_db_connection
+
+    db = get_db_connection()
+    writer = MeasurementWriter(lambda: db, batch_size=float('inf'), flush_interval=float('inf'),
+                               max_buffer=batch_size)
+    inserted = 0
+    for frame in frames:
+        docs = frame.rename(columns={'x': 'position_x', 'y': 'position_y'})
+        docs.insert(0, '_id', docs['location'] + '|' + docs['run_no'].astype(str) + '|'
+                    + docs['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S'))
+        for i, doc in enumerate(docs.to_dict('records'), 1):
+            writer.add(doc)
+            if i % batch_size == 0:
+                inserted += writer.flush()
+        inserted += writer.flush()
+    return inserted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic WiFi measurements")
+    parser.add_argument('--locations', nargs='+', help="registered location names (default: all)")
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument('--days', type=float, default=3)
+    size.add_argument('--rows', type=int, help="total samples across all locations")
+    parser.add_argument('--interval', type=int, default=5, help="minutes between sweeps")
+    parser.add_argument('--start', type=datetime.fromisoformat, default=datetime(2025, 4, 5))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--outages-per-day', type=float, default=0.2)
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=['json'])
+    parser.add_argument('--output-dir', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data'))
+    parser.add_argument('--name', default='dummy_wifi_data')
+    args = parser.parse_args()
+
+    registry = get_location_registry()
+    names = args.locations or registry.names()
+    locations = []
+    for name in names:
+        entry = registry.get(name)
+        if entry is None:
+            print(f"⚠️ Location {name} is not registered, skipping")
+            continue
+        locations.append((entry['name'], entry['x'], entry['y']))
+    if not locations:
+        print("❌ No locations to generate")
+        return
+
+    if args.rows:
+        periods = max(1, -(-args.rows // len(locations)))
+    else:
+        periods = int(args.days * 1440 // args.interval) + 1
+    frames = list(generate_frames(locations, periods, args.interval, args.start, args.seed,
+                                  args.outages_per_day))
+    os.makedirs(args.output_dir, exist_ok=True)
+    base = os.path.join(args.output_dir, args.name)
+    formats = set(args.formats)
+    if 'parquet' in formats and 'jsonl' not in formats:
+        print("⚠️ The Parquet snapshot indexes the JSON Lines log, writing that too")
+        formats.add('jsonl')
+
+    if 'json' in formats:
+        write_json(frames, base + '.json')
+        print(f"✅ Nested JSON written to {base}.json")
+    if 'jsonl' in formats:
+        write_jsonl(frames, base + '.jsonl')
+        print(f"✅ JSON Lines log written to {base}.jsonl")
+    if 'parquet' in formats:
+        write_parquet(frames, base + '_snapshots', base + '.jsonl')
+        print(f"✅ Parquet snapshot written to {base}_snapshots")
+    if 'mongo' in formats:
+        try:
+            print(f"✅ {write_mongo(frames)} documents inserted into MongoDB")
+        except Exception as e:
+            print(f"❌ Error writing to MongoDB: {e}")
+    print(f"{periods * len(locations)} samples: {len(locations)} locations x {periods} sweeps "
+          f"every {args.interval} min from {args.start}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+import threading
+import numpy as np
+import pandas as pd
+
+# Direction in which each metric gets worse: +1 when higher is worse,
+# -1 when lower is worse. Only degradations are reported.
+DEGRADATION_DIRECTION = {
+    'download_speed': -1,
+    'upload_speed': -1,
+    'latency_ms': 1,
+    'jitter_ms': 1,
+    'packet_loss': 1,
+    'rssi': -1,
+}
+
+
+def _runs(flags):
+    # (start, stop) index pairs of the True runs in a boolean array
+    edges = np.diff(np.r_[0, flags.astype(np.int8), 0])
+    return zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1))
+
+
+# Per-series detector state: the trailing `window` samples (the baseline
+# context for the next batch), the CUSUM statistic, when it last rose from
+# zero, and the events still open at the end of the last batch.
+class _SeriesState:
+    def __init__(self):
+        self.values = np.empty(0)
+        self.cusum = 0.0
+        self.rise_time = None
+        self.open = {'spike': None, 'shift': None}
+
+
+# Degradation detector over every (location, metric) series.
+#
+# Each sample is scored against the `window` samples before it (mean and
+# standard deviation from cumulative sums, so a batch costs O(rows) in
+# NumPy), as a z-score signed so that positive means "worse":
+#   * "spike": a run of samples with z above `z_threshold`;
+#   * "shift": a sustained degradation, found with a one-sided CUSUM over the
+#     z-scores, S = max(0, S + z - cusum_drift), flagged while S exceeds
+#     `cusum_threshold`. The recurrence has the closed form
+#     S_t = C_t - min(0, min C_s) over the running sum C, so it is vectorized
+#     too; the event starts where S last left zero.
+# Severity is the peak z (or S) relative to its threshold, so both kinds
+# rank on one scale.
+#
+# on_rows() follows the DatasetStore: a reset rescans the frame, appended
+# rows are scored against the stored trailing context only, and events that
+# were still open are extended instead of duplicated.
+class AnomalyDetector:
+    def __init__(self, metrics, window=288, min_periods=144, z_threshold=4.0,
+                 cusum_drift=1.0, cusum_threshold=12.0, min_scale=1e-3, max_z=50.0,
+                 max_events=5000):
+        self.metrics = [m for m in metrics if m in DEGRADATION_DIRECTION]
+        self.window = window
+        self.min_periods = min_periods
+        self.z_threshold = z_threshold
+        self.cusum_drift = cusum_drift
+        self.cusum_threshold = cusum_threshold
+        self.min_scale = min_scale
+        self.max_z = max_z
+        self.max_events = max_events
+        self._lock = threading.Lock()
+        self._series = {}
+        self._events = []
+        self.version = 0
+
+    def _scores(self, state, values):
+        # Trailing mean/std for the new values, with the stored context first
+        context = np.concatenate([state.values, values])
+        offset = len(state.values)
+        # Running sums with `window` leading zeros: entry i + window is the
+        # sum of the first i values, so both window edges are plain slices
+        padding = np.zeros(self.window + 1)
+        sums = np.concatenate([padding, np.cumsum(context)])
+        squares = np.concatenate([padding, np.cumsum(context * context)])
+        upper, lower = slice(offset + self.window, len(context) + self.window), slice(offset, len(context))
+        counts = np.minimum(np.arange(offset, len(context)), self.window)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = (sums[upper] - sums[lower]) / counts
+            variances = (squares[upper] - squares[lower]) / counts - means * means
+        scales = np.maximum(np.sqrt(np.maximum(variances, 0)), self.min_scale)
+        valid = counts >= self.min_periods
+        z = np.where(valid, (values - means) / scales, 0.0)
+        return np.clip(z, -self.max_z, self.max_z), np.where(valid, means, np.nan), valid
+
+    def _cusum(self, state, z, valid):
+        steps = np.where(valid, z - self.cusum_drift, 0.0)
+        running = state.cusum + np.cumsum(steps)
+        return running - np.minimum(np.minimum.accumulate(running), 0.0)
+
+    def _emit(self, state, kind, location, metric, times, values, baselines, scores, flags,
+              threshold, starts=None):
+        for start, stop in _runs(flags):
+            peak = start + int(np.argmax(scores[start:stop]))
+            event = state.open[kind] if start == 0 else None
+            if event is None:
+                begin = times[start] if starts is None else starts[start]
+                event = {'location': location, 'metric': metric, 'kind': kind,
+                         'start': int(begin), 'end': int(times[stop - 1]),
+                         'samples': 0, 'severity': 0.0, 'value': None, 'baseline': None}
+                self._events.append(event)
+            event['end'] = int(times[stop - 1])
+            event['samples'] += int(stop - start)
+            severity = float(scores[peak] / threshold)
+            if severity > event['severity']:
+                event.update(severity=severity, value=float(values[peak]),
+                             baseline=float(baselines[peak]))
+        state.open[kind] = event if len(flags) and flags[-1] else None
+
+    def _add_series(self, location, metric, times, values):
+        keep = np.isfinite(values)
+        times, values = times[keep], values[keep]
+        if not len(values):
+            return
+        state = self._series.get((location, metric))
+        if state is None:
+            state = self._series[(location, metric)] = _SeriesState()
+
+        z, baselines, valid = self._scores(state, values)
+        z = z * DEGRADATION_DIRECTION[metric]
+        self._emit(state, 'spike', location, metric, times, values, baselines, z,
+                   valid & (z > self.z_threshold), self.z_threshold)
+
+        cusum = self._cusum(state, z, valid)
+        # Time at which the current rise of S began, for each sample; a rise
+        # carried over from the previous batch keeps its stored start
+        carried = times[0] if state.rise_time is None else state.rise_time
+        rising = (cusum > 0) & (np.r_[state.cusum, cusum[:-1]] <= 0)
+        rise_index = np.maximum.accumulate(np.where(rising, np.arange(len(cusum)), -1))
+        starts = np.where(rise_index >= 0, times[np.maximum(rise_index, 0)], carried)
+        self._emit(state, 'shift', location, metric, times, values, baselines, cusum,
+                   cusum > self.cusum_threshold, self.cusum_threshold, starts)
+
+        state.cusum = float(cusum[-1])
+        state.rise_time = int(starts[-1]) if state.cusum > 0 else None
+        state.values = np.concatenate([state.values, values])[-self.window:]
+
+    def _prune(self):
+        if len(self._events) <= self.max_events:
+            return
+        open_events = {id(e) for s in self._series.values() for e in s.open.values() if e is not None}
+        ranked = sorted(self._events, key=lambda e: (id(e) in open_events, e['severity']), reverse=True)
+        self._events = ranked[:self.max_events]
+
+    # DatasetStore listener.
+    def on_rows(self, rows, reset):
+        with self._lock:
+            if reset:
+                self._series, self._events = {}, []
+            if not rows.empty:
+                codes, names = pd.factorize(rows['location'])
+                times = rows['timestamp'].to_numpy(dtype='datetime64[ns]').astype(np.int64)
+                order = np.lexsort((times, codes))
+                codes, times = codes[order], times[order]
+                starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+                stops = np.r_[starts[1:], len(order)]
+                for metric in self.metrics:
+                    values = rows[metric].to_numpy(dtype=float, na_value=np.nan)[order]
+                    for start, stop in zip(starts, stops):
+                        if codes[start] >= 0:
+                            self._add_series(str(names[codes[start]]), metric,
+                                             times[start:stop], values[start:stop])
+                self._prune()
+            self.version += 1
+
+    # Ranked degradation events, most severe first; `start`/`end` are
+    # pandas Timestamps and `ongoing` marks events still open at the latest
+    # sample of their series.
+    def events(self, limit=None, location=None, metric=None, kind=None):
+        with self._lock:
+            open_events = {id(e) for s in self._series.values() for e in s.open.values() if e is not None}
+            selected = [
+                dict(event, start=pd.Timestamp(event['start']), end=pd.Timestamp(event['end']),
+                     ongoing=id(event) in open_events)
+                for event in self._events
+                if (location is None or event['location'] == location)
+                and (metric is None or event['metric'] == metric)
+                and (kind is None or event['kind'] == kind)
+            ]
+        selected.sort(key=lambda event: event['severity'], reverse=True)
+        return selected if limit is None else selected[:limit]
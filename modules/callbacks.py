@@ -1,10 +1,56 @@
 from dash import Input, Output, html, dcc
-from modules.data_loader import load_wifi_data,prepare_heatmap_data
-import plotly.express as px
-import pandas as pd
 from dash.dependencies import Input, Output, State
+from dash.exceptions import PreventUpdate
 import plotly.graph_objects as go
-from modules.utils import get_pixel_coords
+from modules.figure_cache import get_figure_cache
+from modules.metadata import dataset_metadata
+
+# The dataset modules (pandas, numpy) and plotly express are imported inside
+# the callbacks on first use, so building the app at worker start-up does not
+# pay for them.
+
+
+def _data():
+    import modules.data_loader as data_loader
+    return data_loader
+
+
+def _data_version():
+    return _data().data_version()
+
+
+PARAMETERS = ['download_speed', 'upload_speed', 'latency_ms', 'jitter_ms', 'packet_loss', 'rssi']
+PARAMETER_LABELS = {
+    'download_speed': 'Download Speed (Mbps)',
+    'upload_speed': 'Upload Speed (Mbps)',
+    'latency_ms': 'Latency (ms)',
+    'jitter_ms': 'Jitter (ms)',
+    'packet_loss': 'Packet Loss (%)',
+    'rssi': 'RSSI (dBm)'
+}
+# Fields shown on hover over the trend line, in customdata order (the
+# plotted parameter is left out, it is the trace's y).
+TREND_HOVER_FORMATS = {
+    'download_speed': ':.2f',
+    'upload_speed': ':.2f',
+    'rssi': ':.0f',
+    'latency_ms': ':.1f',
+    'jitter_ms': ':.1f',
+    'packet_loss': ':.2f'
+}
+PERCENTILES = (0.5, 0.95, 0.99)
+INSIGHT_EVENT_LIMIT = 50
+
+
+def trend_hover_fields(parameter):
+    return [field for field in TREND_HOVER_FORMATS if field != parameter]
+
+
+def trend_hovertemplate(parameter):
+    lines = ['timestamp=%{x}', f"{parameter}=%{{y}}"]
+    for i, field in enumerate(trend_hover_fields(parameter)):
+        lines.append(f"{field}=%{{customdata[{i}]{TREND_HOVER_FORMATS[field]}}}")
+    return '<br>'.join(lines) + '<extra></extra>'
 
 
 def register_callbacks(dash_app, colors):
@@ -15,27 +61,48 @@ def register_callbacks(dash_app, colors):
     )
     def render_tab_content(tab):
         if tab == 'overview':
+            locations = dataset_metadata()['locations']
+            if not locations:
+                return html.Div("❌ No data available for overview")
+
             return html.Div([
-                html.H3("📊 Overview content will go here.")
+                html.Div([
+                    html.Div([
+                        html.Div("Parameter", className='filter-label'),
+                        dcc.Dropdown(
+                            id='overview-parameter',
+                            options=[{'label': PARAMETER_LABELS[p], 'value': p} for p in PARAMETERS],
+                            value='latency_ms',
+                            clearable=False
+                        )
+                    ], className='filter-item'),
+
+                    html.Div([
+                        html.Div("Location", className='filter-label'),
+                        dcc.Dropdown(
+                            id='overview-location',
+                            options=[{'label': loc, 'value': loc} for loc in ['All Locations'] + locations],
+                            value='All Locations',
+                            clearable=False
+                        )
+                    ], className='filter-item'),
+                ], style={
+                    'display': 'flex',
+                    'gap': '20px',
+                    'marginBottom': '20px',
+                    'flexWrap': 'wrap'
+                }),
+
+                dcc.Graph(id='overview-percentiles', className='graph-container')
             ])
-    
 
         elif tab == 'trends':
-            df = load_wifi_data()
-            if df.empty:
+            meta = dataset_metadata()
+            locations = meta['locations']
+            if not locations:
                 return html.Div("❌ No data available for trends view")
 
-            locations = sorted(df['location'].unique())
-            parameters = ['download_speed', 'upload_speed', 'latency_ms', 'jitter_ms', 'packet_loss', 'rssi']
-            parameter_labels = {
-                'download_speed': 'Download Speed (Mbps)',
-                'upload_speed': 'Upload Speed (Mbps)',
-                'latency_ms': 'Latency (ms)',
-                'jitter_ms': 'Jitter (ms)',
-                'packet_loss': 'Packet Loss (%)',
-                'rssi': 'RSSI (dBm)'
-            }
-            hours = ['All Hours'] + sorted(df['hour'].unique())
+            hours = ['All Hours'] + meta['hours']
 
             return html.Div([
             html.Div([
@@ -53,7 +120,7 @@ def register_callbacks(dash_app, colors):
                     html.Div("Parameter", className='filter-label'),
                     dcc.Dropdown(
                         id='trends-parameter',
-                        options=[{'label': parameter_labels[p], 'value': p} for p in parameters],
+                        options=[{'label': PARAMETER_LABELS[p], 'value': p} for p in PARAMETERS],
                         value='download_speed',
                         clearable=False
                     )
@@ -80,62 +147,102 @@ def register_callbacks(dash_app, colors):
         ])
 
         elif tab == 'heatmap':
-            df = load_wifi_data()
             parameters = ['download_speed', 'upload_speed', 'latency_ms', 'jitter_ms', 'packet_loss', 'rssi']
+            dates = ['All Data'] + sorted(dataset_metadata()['dates'], reverse=True)
             return html.Div([
                 html.Div([
-                    html.Div("Select Parameter", className='filter-label'),
-                    dcc.Dropdown(
-                        id='heatmap-param',
-                        options=[{'label': p.replace("_", " ").title(), 'value': p} for p in parameters],
-                        value='rssi',
-                        clearable=False
-                    ),
-                ], style={'maxWidth': '300px', 'marginBottom': '20px'}),
+                    html.Div([
+                        html.Div("Select Parameter", className='filter-label'),
+                        dcc.Dropdown(
+                            id='heatmap-param',
+                            options=[{'label': p.replace("_", " ").title(), 'value': p} for p in parameters],
+                            value='rssi',
+                            clearable=False
+                        ),
+                    ], className='filter-item'),
+
+                    html.Div([
+                        html.Div("Time Window", className='filter-label'),
+                        dcc.Dropdown(
+                            id='heatmap-window',
+                            options=[{'label': d, 'value': d} for d in dates],
+                            value='All Data',
+                            clearable=False
+                        ),
+                    ], className='filter-item'),
+                ], style={
+                    'display': 'flex',
+                    'gap': '20px',
+                    'marginBottom': '20px',
+                    'flexWrap': 'wrap',
+                    'maxWidth': '640px'
+                }),
 
                 dcc.Graph(id='heatmap-graph', className='graph-container')
             ])
         elif tab == 'insights':
+            locations = dataset_metadata()['locations']
+            if not locations:
+                return html.Div("❌ No data available for insights")
+
             return html.Div([
-                html.H3("🧠 AI-based insights will go here.")
+                html.Div([
+                    html.Div([
+                        html.Div("Location", className='filter-label'),
+                        dcc.Dropdown(
+                            id='insights-location',
+                            options=[{'label': loc, 'value': loc} for loc in ['All Locations'] + locations],
+                            value='All Locations',
+                            clearable=False
+                        )
+                    ], className='filter-item'),
+
+                    html.Div([
+                        html.Div("Parameter", className='filter-label'),
+                        dcc.Dropdown(
+                            id='insights-parameter',
+                            options=[{'label': 'All Parameters', 'value': 'All Parameters'}]
+                                    + [{'label': PARAMETER_LABELS[p], 'value': p} for p in PARAMETERS],
+                            value='All Parameters',
+                            clearable=False
+                        )
+                    ], className='filter-item'),
+                ], style={
+                    'display': 'flex',
+                    'gap': '20px',
+                    'marginBottom': '20px',
+                    'flexWrap': 'wrap'
+                }),
+
+                html.Div(id='insights-events', className='graph-container')
             ])
         return html.Div("🚧 This section is under construction.")
     
     
-    @dash_app.callback(
-    Output('trends-time-series', 'figure'),
-    Input('trends-location', 'value'),
-    Input('trends-parameter', 'value'),
-    Input('trends-hour', 'value')
+    def build_trend_figure(filtered, location, parameter):
+        import plotly.express as px
+        from modules.decimation import decimate, TREND_POINT_BUDGET, WEBGL_THRESHOLD
 
-)
-    def update_trend_timeseries(location, parameter, selected_hour):
-        df = load_wifi_data()
-        if df.empty or not location:
+        if filtered.empty:
             return {}
 
-        filtered = df[df['location'] == location]
-
-        if selected_hour != 'All Hours':
-            filtered = filtered[filtered['hour'] == selected_hour]
+        # Bound the payload: decimate to the point budget, switch to WebGL when dense
+        plotted = decimate(filtered, 'timestamp', parameter, TREND_POINT_BUDGET)
+        dense = len(plotted) > WEBGL_THRESHOLD
 
         fig = px.line(
-            filtered,
+            plotted,
             x='timestamp',
             y=parameter,
             title=f"{parameter.replace('_', ' ').title()} Over Time - {location}",
-            markers=True,
-            hover_data={
-                'timestamp': True,
-                'location': False,
-                'download_speed': ':.2f',
-                'upload_speed': ':.2f',
-                'rssi': ':.0f',
-                'latency_ms': ':.1f',
-                'jitter_ms': ':.1f',
-                'packet_loss': ':.2f',
-                parameter: True
-            }
+            markers=not dense,
+            render_mode='webgl' if dense else 'svg'
+        )
+        # Hover values travel as customdata in a fixed order, so extend_trends
+        # can append (and trim) them in step with x/y
+        fig.update_traces(
+            customdata=plotted[trend_hover_fields(parameter)].to_numpy().tolist(),
+            hovertemplate=trend_hovertemplate(parameter)
         )
 
         fig.update_layout(
@@ -147,21 +254,12 @@ def register_callbacks(dash_app, colors):
         )
         return fig
 
+    def build_hourly_avg_figure(location, parameter):
+        import plotly.express as px
 
-
-    @dash_app.callback(
-    Output('hourly-bar-wrapper', 'children'),
-    Input('trends-location', 'value'),
-    Input('trends-parameter', 'value'),
-    Input('trends-hour', 'value')
-    )
-    def update_hourly_avg(location, parameter, selected_hour):
-        df = load_wifi_data()
-        if df.empty or not location or selected_hour != 'All Hours':
-            return None  # hides the entire container
-
-        filtered = df[df['location'] == location]
-        hourly_avg = filtered.groupby('hour')[parameter].mean().reset_index()
+        hourly_avg = _data().get_rollups().hourly_mean(location, parameter)
+        if hourly_avg.empty:
+            return {}
 
         fig = px.bar(
             hourly_avg,
@@ -178,8 +276,153 @@ def register_callbacks(dash_app, colors):
             margin=dict(l=60, r=20, t=50, b=50),
             height=400
         )
+        return fig
 
-        return dcc.Graph(figure=fig, className='graph-container')
+    # Both Trends figures depend on the same three inputs, so one callback
+    # serves them with at most one data load per interaction, and none for
+    # figures found in the figure cache. The hourly figure needs the rollups,
+    # i.e. the full dataset in memory; when it is built first, the time
+    # series is sliced from that same frame instead of pushing its filter
+    # down to the snapshot as a second load.
+    @dash_app.callback(
+    Output('trends-time-series', 'figure'),
+    Output('hourly-bar-wrapper', 'children'),
+    Input('trends-location', 'value'),
+    Input('trends-parameter', 'value'),
+    Input('trends-hour', 'value')
+    )
+    def update_trends(location, parameter, selected_hour):
+        if not location:
+            return {}, None
+
+        cache = get_figure_cache()
+        version = _data_version()
+        hourly = None
+        if selected_hour == 'All Hours':
+            hourly = cache.memoize('hourly-avg', [location, parameter], version,
+                                   lambda: build_hourly_avg_figure(location, parameter))
+
+        def trend_view():
+            hours = None if selected_hour == 'All Hours' else [selected_hour]
+            columns = ['timestamp', 'location', 'hour'] + _data().METRIC_COLUMNS
+            return _data().load_wifi_data(locations=[location], hours=hours, columns=columns)
+
+        timeseries = cache.memoize(
+            'trends-time-series', [location, parameter, selected_hour], version,
+            lambda: build_trend_figure(trend_view(), location, parameter)
+        )
+        if not hourly:
+            return timeseries, None  # hides the hourly container
+        return timeseries, dcc.Graph(figure=hourly, className='graph-container')
+
+    # Live samples pushed by the collector (SSE -> assets/live_updates.js ->
+    # 'live-measurement' store) are appended to the open trend line with
+    # extendData, so an update costs O(new points) instead of a rebuild.
+    @dash_app.callback(
+    Output('trends-time-series', 'extendData'),
+    Input('live-measurement', 'data'),
+    State('trends-location', 'value'),
+    State('trends-parameter', 'value'),
+    State('trends-hour', 'value'),
+    prevent_initial_call=True
+    )
+    def extend_trends(live, location, parameter, selected_hour):
+        from modules.decimation import TREND_POINT_BUDGET
+
+        fields = trend_hover_fields(parameter)
+        xs, ys, hover = [], [], []
+        for sample in (live or {}).get('samples', []):
+            if sample.get('location') != location or sample.get(parameter) is None:
+                continue
+            if selected_hour != 'All Hours' and f"{sample['timestamp'][11:13]}:00" != selected_hour:
+                continue
+            xs.append(sample['timestamp'])
+            ys.append(sample[parameter])
+            hover.append([sample.get(field) for field in fields])
+        if not xs:
+            raise PreventUpdate
+        # customdata is extended and trimmed with x/y so hovers stay aligned
+        return dict(x=[xs], y=[ys], customdata=[hover]), [0], TREND_POINT_BUDGET
+
+    # Tail percentiles from the streaming sketches: per location, or per hour
+    # of day for one location. Each value is an O(1) lookup, so the figure is
+    # rebuilt on every call instead of going through the figure cache (live
+    # samples change the sketches without changing the data files).
+    @dash_app.callback(
+    Output('overview-percentiles', 'figure'),
+    Input('overview-parameter', 'value'),
+    Input('overview-location', 'value')
+    )
+    def update_overview(parameter, location):
+        stats = _data().get_streaming_stats()
+        label = PARAMETER_LABELS.get(parameter, parameter)
+        if location == 'All Locations':
+            keys, x_title = stats.locations(), 'Location'
+            rows = [stats.summary(parameter, loc, quantiles=PERCENTILES) for loc in keys]
+            title = f"{label}: p50 / p95 / p99 by Location"
+        else:
+            keys, x_title = stats.hours(location), 'Hour'
+            rows = [stats.summary(parameter, location, hour, quantiles=PERCENTILES) for hour in keys]
+            title = f"{label}: p50 / p95 / p99 by Hour - {location}"
+
+        keys, rows = [k for k, r in zip(keys, rows) if r], [r for r in rows if r]
+        fig = go.Figure()
+        for q in PERCENTILES:
+            name = f"p{q * 100:g}"
+            fig.add_trace(go.Bar(x=keys, y=[r[name] for r in rows], name=name))
+        fig.add_trace(go.Scatter(
+            x=keys, y=[r['ewma'] for r in rows], name='EWMA', mode='markers',
+            marker=dict(symbol='diamond', size=10, color=colors['secondary']),
+            customdata=[r['count'] for r in rows],
+            hovertemplate='%{x}<br>EWMA: %{y:.2f}<br>Samples: %{customdata}<extra></extra>'
+        ))
+        fig.update_layout(
+            title=title,
+            barmode='group',
+            xaxis_title=x_title,
+            yaxis_title=label,
+            plot_bgcolor='white',
+            paper_bgcolor='white',
+            font={'color': colors['text']},
+            margin=dict(l=60, r=20, t=50, b=50),
+            height=450
+        )
+        return fig
+
+    # Ranked degradation events from the anomaly detector, which scores new
+    # rows as the store picks them up; live samples only trigger a refresh.
+    @dash_app.callback(
+    Output('insights-events', 'children'),
+    Input('insights-location', 'value'),
+    Input('insights-parameter', 'value'),
+    Input('live-measurement', 'data')
+    )
+    def update_insights(location, parameter, live):
+        events = _data().get_anomaly_detector().events(
+            limit=INSIGHT_EVENT_LIMIT,
+            location=None if location == 'All Locations' else location,
+            metric=None if parameter == 'All Parameters' else parameter
+        )
+        if not events:
+            return html.H4("✅ No degradations detected")
+
+        header = ['Severity', 'Location', 'Parameter', 'Type', 'From', 'To', 'Samples', 'Worst', 'Baseline']
+        rows = []
+        for event in events:
+            end = 'ongoing' if event['ongoing'] else f"{event['end']:%Y-%m-%d %H:%M}"
+            rows.append(html.Tr([
+                html.Td(f"{event['severity']:.1f}"),
+                html.Td(event['location']),
+                html.Td(PARAMETER_LABELS.get(event['metric'], event['metric'])),
+                html.Td('Level shift' if event['kind'] == 'shift' else 'Spike'),
+                html.Td(f"{event['start']:%Y-%m-%d %H:%M}"),
+                html.Td(end),
+                html.Td(event['samples']),
+                html.Td(f"{event['value']:.2f}"),
+                html.Td(f"{event['baseline']:.2f}"),
+            ]))
+        return html.Table([html.Thead(html.Tr([html.Th(h) for h in header])), html.Tbody(rows)],
+                          className='insights-table')
 
     # Track whether collection is active
 
@@ -202,66 +445,54 @@ def register_callbacks(dash_app, colors):
 
         return new_label, {'active': new_state}
     
+    # Coverage map: the selected parameter interpolated (IDW) from the recorded
+    # measurement positions onto a grid. Grids are cached per (parameter,
+    # day) and only rebuilt when that day receives new samples.
     @dash_app.callback(
     Output('heatmap-graph', 'figure'),
-    Input('heatmap-param', 'value')
+    Input('heatmap-param', 'value'),
+    Input('heatmap-window', 'value')
     )
-    def update_heatmap(param):
-        df = load_wifi_data()
-        if df.empty:
+    def update_heatmap(param, window):
+        date = None if window == 'All Data' else window
+        grid = _data().get_heatmap_grid(param, date)
+        if grid is None:
             return go.Figure()
 
-        # Group by location to get averages + count
-        agg_df = df.groupby('location').agg({
-            'download_speed': 'mean',
-            'upload_speed': 'mean',
-            'latency_ms': 'mean',
-            'jitter_ms': 'mean',
-            'packet_loss': 'mean',
-            'rssi': 'mean',
-            'timestamp': 'count'
-        }).reset_index().rename(columns={'timestamp': 'count'})
-
-        # Add pixel coordinates
-        agg_df['x'], agg_df['y'] = zip(*agg_df['location'].map(get_pixel_coords))
-        agg_df = agg_df.dropna(subset=[param, 'x', 'y'])
-
-        # Remove (0, 0) default fallbacks (i.e., unmapped locations)
-        agg_df = agg_df[(agg_df['x'] != 0) | (agg_df['y'] != 0)]
-
-        # Normalize marker size
-        max_count = agg_df['count'].max()
-        agg_df['size'] = agg_df['count'] / max_count * 40 + 10  # Scale 10–50 px
-
-        fig = go.Figure(data=go.Scatter(
-            x=agg_df['x'],
-            y=agg_df['y'],
-            mode='markers',
-            marker=dict(
-                size=agg_df['size'],
-                color=agg_df[param],
+        label = PARAMETER_LABELS.get(param, param)
+        positions, values = grid['points']
+        fig = go.Figure(data=[
+            go.Heatmap(
+                x=grid['x'],
+                y=grid['y'],
+                z=grid['z'],
                 colorscale='Viridis',
-                colorbar=dict(title=param.replace('_', ' ').title()),
-                showscale=True,
-                line=dict(width=1, color='black')
+                reversescale=param in ('latency_ms', 'jitter_ms', 'packet_loss'),
+                colorbar=dict(title=label),
+                hovertemplate="X: %{x:.2f}<br>Y: %{y:.2f}<br>" + label + ": %{z:.2f}<extra></extra>"
             ),
-            customdata=agg_df[['location', 'download_speed', 'upload_speed', 'latency_ms', 'jitter_ms', 'packet_loss', 'rssi', 'count']],
-            hovertemplate=(
-                "<b>%{customdata[0]}</b><br>" +
-                "Download: %{customdata[1]:.2f} Mbps<br>" +
-                "Upload: %{customdata[2]:.2f} Mbps<br>" +
-                "Latency: %{customdata[3]:.2f} ms<br>" +
-                "Jitter: %{customdata[4]:.2f} ms<br>" +
-                "Packet Loss: %{customdata[5]:.2f}<br>" +
-                "RSSI: %{customdata[6]}<br>" +
-                "Data Points: %{customdata[7]}<extra></extra>"
+            go.Scatter(
+                x=positions[:, 0],
+                y=positions[:, 1],
+                mode='markers+text',
+                text=grid['labels'],
+                textposition='top center',
+                textfont=dict(color='white'),
+                marker=dict(size=9, color='white', line=dict(width=1, color='black')),
+                customdata=list(zip(values, grid['counts'])),
+                hovertemplate=(
+                    "<b>%{text}</b><br>" +
+                    label + ": %{customdata[0]:.2f}<br>" +
+                    "Data Points: %{customdata[1]}<extra></extra>"
+                ),
+                showlegend=False
             )
-        ))
+        ])
 
         fig.update_layout(
-            title=f"📍 Average {param.replace('_', ' ').title()} Across Locations",
+            title=f"📍 {label} Coverage" + ("" if date is None else f" - {date}"),
             xaxis=dict(title="X", showgrid=False, zeroline=False),
-            yaxis=dict(title="Y", showgrid=False, zeroline=False),
+            yaxis=dict(title="Y", showgrid=False, zeroline=False, scaleanchor='x'),
             plot_bgcolor='white',
             height=600
         )
@@ -1,46 +1,428 @@
 import pandas as pd
+import numpy as np
 import json
-from datetime import datetime
-from .utils import get_pixel_coords
+import shutil
+import threading
+from collections import OrderedDict
+from pandas.api.types import union_categoricals
+from .data_store import DatasetStore
+from .dataset_index import DatasetIndex, sort_for_index
+from .rollups import RollupStore
+from .sketches import StreamingStats
+from .anomalies import AnomalyDetector
+from .interpolation import GridCache, interpolate_grid
+from .snapshots import (snapshots_available, load_manifest, save_manifest,
+                        write_partitions, read_partitions)
+from Database.config import DATA_CONFIG
+from Database.locations import get_location_registry
+from Database.measurement_log import read_measurements, migrate_json_to_log
+from src.events import get_event_bus, MEASUREMENT_TOPIC
 import os
 
-def load_wifi_data():
+METRIC_COLUMNS = ['download_speed', 'upload_speed', 'latency_ms', 'jitter_ms', 'packet_loss', 'rssi']
+# Optional per-sample latency percentiles; NaN for samples recorded before them
+LATENCY_DETAIL_COLUMNS = ['latency_min_ms', 'latency_p50_ms', 'latency_p95_ms', 'latency_max_ms']
+HOUR_LABELS = [f"{h:02d}:00" for h in range(24)]
+_REQUIRED_KEYS = frozenset(['timestamp', 'location'] + METRIC_COLUMNS)
+_FRAME_COLUMNS = ['timestamp', 'date', 'hour', 'location', 'x', 'y'] + METRIC_COLUMNS + LATENCY_DETAIL_COLUMNS
+
+
+def _location_fields(location):
+    if isinstance(location, dict):
+        return location.get('position[name]'), location.get('position[x]'), location.get('position[y]')
+    return None, None, None
+
+
+# Registry coordinates for a column of location names: one lookup per
+# distinct name, then a take by the names' codes. NaN where unregistered.
+def registry_coordinates(locations):
+    codes, names = pd.factorize(pd.Series(locations))
+    xs, ys = get_location_registry().coordinates(names.astype(str))
+    xs, ys = np.append(xs, np.nan), np.append(ys, np.nan)  # code -1 (missing name)
+    return xs[codes], ys[codes]
+
+
+# Samples recorded without a position (e.g. imported from elsewhere) take
+# their location's registered coordinates.
+def _fill_positions(df):
+    missing = (df['x'].isna() | df['y'].isna()).to_numpy()
+    if missing.any():
+        xs, ys = registry_coordinates(df['location'].to_numpy()[missing])
+        df.loc[missing, 'x'] = xs
+        df.loc[missing, 'y'] = ys
+
+
+# Flattens a list of raw measurement dicts into the dashboard frame in bulk:
+# one DataFrame construction, one vectorized timestamp parse and categorical
+# date/hour columns. Bad records are dropped and counted, not raised.
+def measurements_to_frame(measurements):
+    total = len(measurements)
+    measurements = [m for m in measurements if isinstance(m, dict) and _REQUIRED_KEYS.issubset(m)]
+    if not measurements:
+        return pd.DataFrame(columns=_FRAME_COLUMNS), total
+
+    raw = pd.DataFrame.from_records(
+        measurements, columns=['timestamp', 'location'] + METRIC_COLUMNS + LATENCY_DETAIL_COLUMNS
+    )
+    timestamps = pd.to_datetime(raw['timestamp'], format='%Y-%m-%d %H:%M:%S', errors='coerce')
+    names, xs, ys = zip(*[_location_fields(loc) for loc in raw['location']])
+    names = pd.Series(names, index=raw.index, dtype=object)
+    positions = pd.DataFrame({'x': xs, 'y': ys}, index=raw.index).apply(pd.to_numeric, errors='coerce')
+
+    valid = timestamps.notna() & names.notna()
+    if not valid.all():
+        raw, timestamps, names, positions = raw[valid], timestamps[valid], names[valid], positions[valid]
+
+    day_codes, days = pd.factorize(timestamps.dt.floor('D'), sort=True)
+    df = pd.DataFrame({
+        'timestamp': timestamps.to_numpy(),
+        'date': pd.Categorical.from_codes(day_codes, categories=days.strftime('%Y-%m-%d')),
+        'hour': pd.Categorical.from_codes(timestamps.dt.hour.to_numpy(), categories=HOUR_LABELS),
+        'location': names.to_numpy(),
+        'x': positions['x'].to_numpy(dtype=float),
+        'y': positions['y'].to_numpy(dtype=float),
+    })
+    _fill_positions(df)
+    for column in METRIC_COLUMNS:
+        df[column] = raw[column].to_numpy()
+    for column in LATENCY_DETAIL_COLUMNS:
+        df[column] = pd.to_numeric(raw[column], errors='coerce').to_numpy(dtype=float)
+    return df, total - len(df)
+
+
+def _report_skipped(path, skipped):
+    if skipped:
+        print(f"⚠️ Skipped {skipped} bad record(s) while loading {os.path.basename(path)}")
+
+
+def _read_wifi_json(json_path):
+    with open(json_path, 'r') as file:
+        data = json.load(file)
+
+    measurements = [m for location_measurements in data.values() for m in location_measurements]
+    df, skipped = measurements_to_frame(measurements)
+    _report_skipped(json_path, skipped)
+    return df, os.path.getsize(json_path)
+
+
+def _read_wifi_log(log_path, offset=0):
+    entries, offset, bad_lines = read_measurements(log_path, offset)
+    df, skipped = measurements_to_frame(entries)
+    _report_skipped(log_path, skipped + bad_lines)
+    return df, offset
+
+
+def _append_frames(base, tail):
+    if tail.empty:
+        return base
+    if base.empty:
+        return tail
+    dates = union_categoricals([base['date'].array, tail['date'].array], sort_categories=True)
+    locations = union_categoricals([pd.Categorical(base['location']), pd.Categorical(tail['location'])],
+                                   sort_categories=True)
+    df = pd.concat([base, tail], ignore_index=True)
+    df['date'] = dates
+    df['location'] = locations
+    return df
+
+
+def _read_wifi_source(path):
+    if path.endswith('.jsonl'):
+        return _read_wifi_log(path)
+    return _read_wifi_json(path)
+
+
+# Only the append-only log can be extended in place; a changed legacy JSON
+# document is always re-read in full.
+def _read_wifi_tail(path, frame, offset):
+    if not path.endswith('.jsonl'):
+        return None
+    tail, offset = _read_wifi_log(path, offset)
+    return _append_frames(frame, tail), offset
+
+
+# The collector writes to the JSON Lines log; the legacy document is only
+# read until it has been migrated.
+def _resolve_data_path():
+    if os.path.exists(DATA_CONFIG["log_path"]):
+        return DATA_CONFIG["log_path"]
+    return DATA_CONFIG["json_path"]
+
+
+# Shared, process-wide store. The returned frame is shared between callbacks,
+# so callers must treat it as read-only (copy before mutating). It is kept
+# sorted by (location, timestamp) with a categorical location so that
+# DatasetIndex can slice it by binary search.
+_store = DatasetStore(_resolve_data_path, _read_wifi_source, _read_wifi_tail, prepare=sort_for_index)
+
+# Rollups follow the store: rebuilt on a full load, merged on appended rows.
+_rollups = RollupStore(METRIC_COLUMNS)
+_store.subscribe(_rollups.on_rows)
+
+# Percentile sketches and EWMAs: backfilled from the store and fed live by
+# the log relay (src.events) in web processes.
+_stats = StreamingStats(METRIC_COLUMNS)
+_store.subscribe(_stats.on_rows)
+get_event_bus().add_listener(_stats.add_sample, [MEASUREMENT_TOPIC])
+
+# Degradation events for the Insights tab: a full scan on load, then only
+# the appended rows are scored.
+_anomalies = AnomalyDetector(METRIC_COLUMNS)
+_store.subscribe(_anomalies.on_rows)
+
+# Interpolated heatmap grids, dropped per day as new rows arrive.
+_grids = GridCache()
+_store.subscribe(_grids.on_rows)
+
+
+def get_data_store():
+    return _store
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+# Index over the store's current frame; rebuilt only when the store hands
+# out a new frame (full load or appended tail).
+def get_dataset_index():
+    global _index
+    frame = load_wifi_data()
+    with _index_lock:
+        if _index is None or _index.df is not frame:
+            _index = DatasetIndex(frame)
+        return _index
+
+
+# Rows of the in-memory dataset for one location and/or a time range
+# [start, end) and/or an hour-of-day label, found by binary search instead of
+# scanning the whole frame.
+def slice_wifi_data(location=None, start=None, end=None, hour=None, columns=None):
+    try:
+        return get_dataset_index().slice(
+            locations=None if location is None else [location],
+            time_from=start, time_to=end,
+            hours=None if hour is None else [hour],
+            columns=columns
+        )
+    except Exception as e:
+        print(f"❌ Error slicing data: {e}")
+        return pd.DataFrame()
+
+
+# Stamp identifying the current state of the data files; cheap (one stat)
+# and identical across worker processes on the same host.
+def data_version():
+    path = _resolve_data_path()
+    try:
+        st = os.stat(path)
+    except OSError:
+        return f"{path}:missing"
+    return f"{path}:{st.st_ino}:{st.st_mtime_ns}:{st.st_size}"
+
+
+# Brings the store (and so the rollups) up to date with the data files, which
+# is a stat() when nothing changed, then returns the rollups. Callers that
+# already loaded data in the same request pass sync=False; the store is then
+# only loaded if it never was.
+def get_rollups(sync=True):
+    if sync or not _store.is_loaded():
+        load_wifi_data()
+    return _rollups
+
+
+# Same contract as get_rollups(), for the streaming statistics.
+def get_streaming_stats(sync=True):
+    if sync or not _store.is_loaded():
+        load_wifi_data()
+    return _stats
+
+
+# Same contract as get_rollups(), for the anomaly detector.
+def get_anomaly_detector(sync=True):
+    if sync or not _store.is_loaded():
+        load_wifi_data()
+    return _anomalies
+
+
+def _warn_unplaced(df):
+    unplaced = df.loc[df['x'].isna() | df['y'].isna(), 'location']
+    if not unplaced.empty:
+        names = ', '.join(sorted(unplaced.astype(str).unique()))
+        print(f"⚠️ No coordinates for {names}; add them to {DATA_CONFIG['locations_path']}")
+
+
+def _build_heatmap_grid(metric, date):
+    start = None if date is None else pd.Timestamp(date)
+    end = None if date is None else start + pd.Timedelta(days=1)
+    df = slice_wifi_data(start=start, end=end, columns=['location', 'x', 'y', metric])
+    _warn_unplaced(df)
+    df = df.dropna()
+    if df.empty:
+        return None
+    grouped = df.groupby(['x', 'y'], sort=False)
+    means = grouped[metric].mean()
+    positions = np.column_stack([means.index.get_level_values('x'), means.index.get_level_values('y')])
+    grid = interpolate_grid(positions, means.to_numpy())
+    grid['labels'] = grouped['location'].first().astype(str).to_numpy()
+    grid['counts'] = grouped.size().to_numpy()
+    return grid
+
+
+# Inverse-distance-weighted grid of `metric` over the recorded measurement
+# positions, from the samples of one date ('YYYY-MM-DD') or of all data.
+# Returns the interpolate_grid() dict plus per-position 'labels' and
+# 'counts', or None without positioned samples. Cached until that window
+# receives new rows.
+def get_heatmap_grid(metric, date=None):
+    load_wifi_data()
+    return _grids.get(metric, date, lambda: _build_heatmap_grid(metric, date))
+
+
+def _file_identity(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_size)
+
+
+# Folds everything appended to the log since the last compaction into the
+# Parquet snapshot. The manifest records how far into the log the snapshot
+# reaches; a replaced or truncated log starts the snapshot over.
+def compact_snapshots(snapshot_dir=None):
+    snapshot_dir = snapshot_dir or DATA_CONFIG["snapshot_dir"]
+    log_path = DATA_CONFIG["log_path"]
+    if not os.path.exists(log_path) and os.path.exists(DATA_CONFIG["json_path"]):
+        migrate_json_to_log(DATA_CONFIG["json_path"], log_path)
+
+    identity = _file_identity(log_path)
+    if identity is None:
+        return 0
+
+    manifest = load_manifest(snapshot_dir)
+    if (manifest is None or manifest.get("columns") != _FRAME_COLUMNS
+            or manifest["log_inode"] != identity[0] or manifest["offset"] > identity[1]):
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
+        manifest = {"log_inode": identity[0], "offset": 0, "rows": 0, "columns": _FRAME_COLUMNS}
+
+    entries, offset, bad_lines = read_measurements(log_path, manifest["offset"])
+    df, skipped = measurements_to_frame(entries)
+    _report_skipped(log_path, skipped + bad_lines)
+    os.makedirs(snapshot_dir, exist_ok=True)
+    written = write_partitions(df, snapshot_dir)
+
+    manifest["offset"] = offset
+    manifest["rows"] += written
+    save_manifest(snapshot_dir, manifest)
+    return written
+
+
+# Boolean-mask filter for small unsorted frames (e.g. the log tail read on
+# the snapshot path); the in-memory dataset goes through the index instead.
+def _filter_frame(df, locations=None, dates=None, hours=None, columns=None):
+    mask = pd.Series(True, index=df.index)
+    if locations is not None:
+        mask &= df['location'].isin(locations)
+    if dates is not None:
+        mask &= df['date'].isin(dates)
+    if hours is not None:
+        mask &= df['hour'].isin(hours)
+    return df.loc[mask, columns if columns is not None else df.columns]
+
+
+# Gives a filtered frame the shape the in-memory index hands out: categorical
+# location/date/hour holding only the values present, rows in (location,
+# timestamp) order and a fresh RangeIndex. Both _load_filtered paths end here
+# so a query returns the same frame whether the store is warm or not.
+def _restore_dtypes(df, columns):
+    df = df.reset_index(drop=True)
+    for column in ('location', 'date'):
+        if column in df.columns:
+            values = df[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.cat.remove_unused_categories()
+                df[column] = values.cat.reorder_categories(sorted(values.cat.categories))
+            else:
+                df[column] = pd.Categorical(values.astype(str))
+    if 'hour' in df.columns:
+        df['hour'] = pd.Categorical(df['hour'].astype(str), categories=HOUR_LABELS)
+    if not df.empty:
+        df = sort_for_index(df)
+    return df[columns]
+
+
+_filtered_cache = OrderedDict()
+_filtered_lock = threading.Lock()
+_FILTERED_CACHE_SIZE = 32
+
+
+def _freeze(values):
+    return None if values is None else tuple(values)
+
+
+# Once the full frame is in memory (it also feeds the rollups) slicing it
+# through the index is cheapest. On a cold process, predicate/column pushdown reads only the
+# matching date/location partitions and requested columns from the
+# snapshot, plus whatever the log gained since the last compaction. Without
+# a usable snapshot it falls back to loading and filtering the full frame.
+def _load_filtered(locations, dates, hours, columns):
+    columns = list(columns) if columns is not None else list(_FRAME_COLUMNS)
+    # The sort keys ride along until _restore_dtypes has ordered the rows
+    read_columns = columns + [key for key in ('location', 'timestamp') if key not in columns]
+    if _store.is_loaded():
+        df = get_dataset_index().slice(locations=locations, dates=dates, hours=hours, columns=read_columns)
+        return _restore_dtypes(df, columns)
+
+    snapshot_dir = DATA_CONFIG["snapshot_dir"]
+    manifest = load_manifest(snapshot_dir) if snapshots_available() else None
+    log_path = DATA_CONFIG["log_path"]
+    identity = _file_identity(log_path)
+    if (manifest is None or not manifest["rows"] or identity is None
+            or manifest.get("columns") != _FRAME_COLUMNS
+            or identity[0] != manifest["log_inode"] or identity[1] < manifest["offset"]):
+        df = get_dataset_index().slice(locations=locations, dates=dates, hours=hours, columns=read_columns)
+        return _restore_dtypes(df, columns)
+
+    key = (_freeze(locations), _freeze(dates), _freeze(hours), tuple(columns),
+           manifest["offset"], manifest["rows"], identity)
+    with _filtered_lock:
+        if key in _filtered_cache:
+            _filtered_cache.move_to_end(key)
+            return _filtered_cache[key]
+
+    df = read_partitions(snapshot_dir, read_columns, locations, dates, hours)
+    if identity[1] > manifest["offset"]:
+        entries, _, _ = read_measurements(log_path, manifest["offset"])
+        tail, _ = measurements_to_frame(entries)
+        if not tail.empty:
+            tail = _filter_frame(tail, locations, dates, hours, read_columns)
+            df = pd.concat([df, tail], ignore_index=True)
+    df = _restore_dtypes(df, columns)
+
+    with _filtered_lock:
+        _filtered_cache[key] = df
+        while len(_filtered_cache) > _FILTERED_CACHE_SIZE:
+            _filtered_cache.popitem(last=False)
+    return df
+
+
+# With no arguments returns the full cached frame. `locations`, `dates` and
+# `hours` restrict rows and `columns` restricts the returned columns; when a
+# snapshot exists these are pushed down to the Parquet reader.
+def load_wifi_data(locations=None, dates=None, hours=None, columns=None):
     try:
-        
-        json_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'wifi_data.json')
-        with open(json_path, 'r') as file:
-            data = json.load(file)
-
-        records = []
-        for location, measurements in data.items():
-            for measurement in measurements:
-                try:
-                    timestamp = datetime.strptime(measurement['timestamp'], '%Y-%m-%d %H:%M:%S')
-                    record = {
-                        'timestamp': timestamp,
-                        'date': timestamp.strftime('%Y-%m-%d'),
-                        'hour': timestamp.strftime('%H:00'),
-                        'location': measurement['location']['position[name]'],
-                        'download_speed': measurement['download_speed'],
-                        'upload_speed': measurement['upload_speed'],
-                        'latency_ms': measurement['latency_ms'],
-                        'jitter_ms': measurement['jitter_ms'],
-                        'packet_loss': measurement['packet_loss'],
-                        'rssi': measurement['rssi']
-                    }
-                    records.append(record)
-                except Exception as e:
-                    print(f"⚠️ Skipping bad record: {e}")
-                    continue
-
-        df = pd.DataFrame(records)
-        return df
+        if locations is None and dates is None and hours is None and columns is None:
+            return _store.get()
+        return _load_filtered(locations, dates, hours, columns)
     except Exception as e:
         print(f"❌ Error loading data: {e}")
         return pd.DataFrame()
 
+# Per-sample heatmap points at each location's registered coordinates.
 def prepare_heatmap_data(df, selected_param):
-    df = df.copy()
-    df['x'], df['y'] = zip(*df['location'].map(get_pixel_coords))
+    xs, ys = registry_coordinates(df['location'].to_numpy())
+    df = df.assign(x=xs, y=ys)
+    _warn_unplaced(df)
     df = df.dropna(subset=[selected_param, 'x', 'y'])
     return df[['x', 'y', selected_param, 'location']]
@@ -0,0 +1,124 @@
+import os
+import threading
+
+
+# Keeps the parsed WiFi dataset in memory and re-parses the source file only
+# when its mtime/size signature changes. One lock guards both the check and
+# the load, so concurrent callbacks under Flask's threaded server wait for a
+# single parse instead of each re-reading the file.
+#
+# `resolve_path()` names the current source file, `loader(path)` returns
+# (frame, offset) and the optional `tail_loader(path, frame, offset)` returns
+# the same pair after reading only what was appended past `offset`, or None
+# if the file cannot be tailed. A file that grew in place is extended with
+# the tail loader; anything else (replaced, truncated, not tailable)
+# triggers a full reload. The optional `prepare(frame)` normalizes every new
+# frame (e.g. sorts it) before it is cached.
+#
+# Listeners registered with subscribe() are called under the store lock as
+# listener(rows, reset): with the whole frame and reset=True after a full
+# load, or with just the appended rows and reset=False after a tail read, so
+# derived structures can be maintained incrementally.
+class DatasetStore:
+    def __init__(self, resolve_path, loader, tail_loader=None, prepare=None):
+        self._resolve_path = resolve_path
+        self._loader = loader
+        self._tail_loader = tail_loader
+        self._prepare = prepare
+        self._lock = threading.Lock()
+        self._frame = None
+        self._signature = None
+        self._offset = 0
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.appends = 0
+        self._listeners = []
+
+    @property
+    def path(self):
+        return self._resolve_path()
+
+    def _stat_signature(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (path, st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _grew_in_place(self, signature):
+        old = self._signature
+        return (self._tail_loader is not None and old is not None and signature is not None
+                and old[:2] == signature[:2] and signature[3] > old[3])
+
+    def get(self):
+        path = self._resolve_path()
+        signature = self._stat_signature(path)
+        with self._lock:
+            if self._frame is not None and signature == self._signature:
+                self.hits += 1
+                return self._frame
+
+            self.misses += 1
+            # The loaders raise on unreadable files; nothing is cached in that
+            # case so the next call retries.
+            tailed = None
+            if self._frame is not None and self._grew_in_place(signature):
+                tailed = self._tail_loader(path, self._frame, self._offset)
+
+            if tailed is not None:
+                self.appends += 1
+                previous_rows = len(self._frame)
+                frame, offset = tailed
+                reset, rows = False, frame.iloc[previous_rows:]
+            else:
+                if self._frame is not None:
+                    self.reloads += 1
+                frame, offset = self._loader(path)
+                reset, rows = True, frame
+
+            if self._prepare is not None:
+                frame = self._prepare(frame)
+                if reset:
+                    rows = frame
+            self._frame = frame
+            self._offset = offset
+            self._signature = signature
+            self._notify(rows, reset)
+            return frame
+
+    def is_loaded(self):
+        with self._lock:
+            return self._frame is not None
+
+    def subscribe(self, listener):
+        with self._lock:
+            self._listeners.append(listener)
+            if self._frame is not None:
+                listener(self._frame, True)
+
+    def _notify(self, rows, reset):
+        if not reset and rows.empty:
+            return
+        for listener in self._listeners:
+            try:
+                listener(rows, reset)
+            except Exception as e:
+                print(f"⚠️ Dataset listener failed: {e}")
+
+    def invalidate(self):
+        with self._lock:
+            self._frame = None
+            self._signature = None
+            self._offset = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'reloads': self.reloads,
+                'appends': self.appends,
+                'cached': self._frame is not None,
+                'rows': 0 if self._frame is None else len(self._frame),
+            }
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+
+
+# Orders a dataset frame by (location, timestamp) with `location` as a
+# categorical, which is the layout DatasetIndex expects. The stable sort is
+# close to linear on frames that are already mostly in order (e.g. a sorted
+# frame with a freshly appended tail).
+def sort_for_index(df):
+    if df.empty:
+        return df
+    if not isinstance(df['location'].dtype, pd.CategoricalDtype):
+        df = df.assign(location=pd.Categorical(df['location']))
+    elif not df['location'].cat.categories.is_monotonic_increasing:
+        df = df.assign(location=df['location'].cat.reorder_categories(sorted(df['location'].cat.categories)))
+    order = np.lexsort((df['timestamp'].to_numpy(), df['location'].cat.codes.to_numpy()))
+    if (order[1:] > order[:-1]).all():
+        return df.reset_index(drop=True)
+    return df.take(order).reset_index(drop=True)
+
+
+# Positional index over a frame sorted by (location, timestamp):
+#   * each location owns one contiguous row range, found by binary search on
+#     the categorical codes;
+#   * inside that range timestamps are sorted, so a time range is another
+#     pair of binary searches;
+#   * per (location, hour-of-day) the matching row positions are precomputed
+#     in time order.
+# Slicing therefore costs O(log n + result) instead of a full boolean scan.
+class DatasetIndex:
+    def __init__(self, df):
+        self.df = df
+        if df.empty:
+            self._bounds = {}
+            self._hour_positions = {}
+            return
+
+        codes = df['location'].cat.codes.to_numpy()
+        categories = df['location'].cat.categories
+        starts = np.searchsorted(codes, np.arange(len(categories)), side='left')
+        stops = np.searchsorted(codes, np.arange(len(categories)), side='right')
+        self._bounds = {
+            location: (int(start), int(stop))
+            for location, start, stop in zip(categories, starts, stops) if stop > start
+        }
+        self._timestamps = df['timestamp'].to_numpy()
+
+        hours = df['hour'].cat.codes.to_numpy()
+        hour_labels = df['hour'].cat.categories
+        self._hour_positions = {}
+        for location, (start, stop) in self._bounds.items():
+            local = hours[start:stop]
+            order = np.argsort(local, kind='stable')
+            counts = np.bincount(local, minlength=len(hour_labels))
+            for code, positions in enumerate(np.split(order + start, np.cumsum(counts)[:-1])):
+                if len(positions):
+                    self._hour_positions[(location, hour_labels[code])] = positions
+
+    def locations(self):
+        return list(self._bounds)
+
+    def hours(self):
+        return sorted({hour for _, hour in self._hour_positions})
+
+    def _time_window(self, start, stop, time_from, time_to):
+        timestamps = self._timestamps[start:stop]
+        if time_from is not None:
+            start += int(np.searchsorted(timestamps, np.datetime64(pd.Timestamp(time_from)), side='left'))
+        if time_to is not None:
+            stop = start + int(np.searchsorted(
+                self._timestamps[start:stop], np.datetime64(pd.Timestamp(time_to)), side='left'
+            ))
+        return start, max(start, stop)
+
+    # Row positions for one location, optionally within [time_from, time_to)
+    # and at one hour-of-day label ('HH:00').
+    def positions(self, location, time_from=None, time_to=None, hour=None):
+        if location not in self._bounds:
+            return np.empty(0, dtype=np.int64)
+        start, stop = self._time_window(*self._bounds[location], time_from, time_to)
+        if hour is None:
+            return np.arange(start, stop)
+        positions = self._hour_positions.get((location, hour))
+        if positions is None:
+            return np.empty(0, dtype=np.int64)
+        return positions[np.searchsorted(positions, start):np.searchsorted(positions, stop)]
+
+    # Rows matching every given filter, in (location, timestamp) order.
+    # `dates` are 'YYYY-MM-DD' strings,
+    # each covering one day, and are intersected with [time_from, time_to).
+    def slice(self, locations=None, time_from=None, time_to=None, dates=None, hours=None, columns=None):
+        locations = self.locations() if locations is None else locations
+        windows = [(time_from, time_to)]
+        if dates is not None:
+            windows = []
+            for date in sorted(dates):
+                day = pd.Timestamp(date)
+                low = day if time_from is None else max(day, pd.Timestamp(time_from))
+                high = day + pd.Timedelta(days=1)
+                high = high if time_to is None else min(high, pd.Timestamp(time_to))
+                windows.append((low, high))
+
+        parts = []
+        for location in locations:
+            for low, high in windows:
+                if hours is None:
+                    parts.append(self.positions(location, low, high))
+                    continue
+                for hour in hours:
+                    parts.append(self.positions(location, low, high, hour))
+        positions = np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+        if len(parts) > 1:
+            positions.sort()
+        frame = self.df if columns is None else self.df[columns]
+        return frame.take(positions)
@@ -0,0 +1,73 @@
+import numpy as np
+
+# Point budget for time-series figures and the size above which traces are
+# drawn with WebGL (Scattergl) instead of SVG.
+TREND_POINT_BUDGET = 2000
+WEBGL_THRESHOLD = 1000
+
+
+# Largest-Triangle-Three-Buckets: keeps the first and last point and, for
+# each of the n_out - 2 buckets in between, the point forming the largest
+# triangle with the previously kept point and the next bucket's average.
+# Preserves the visual shape (peaks, dips) far better than striding.
+def lttb_indices(x, y, n_out):
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    previous = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_start, next_stop = edges[i + 1], (edges[i + 2] if i + 2 < len(edges) else n)
+        next_x = x[next_start:next_stop].mean()
+        next_y = y[next_start:next_stop].mean()
+
+        bucket_x = x[start:stop]
+        bucket_y = y[start:stop]
+        areas = np.abs((x[previous] - next_x) * (bucket_y - y[previous])
+                       - (x[previous] - bucket_x) * (next_y - y[previous]))
+        previous = start + int(np.argmax(areas))
+        indices[i + 1] = previous
+    return indices
+
+
+# Min/max bucketing: for each bucket keeps the positions of its minimum and
+# maximum, in time order. Cheaper than LTTB and guarantees extremes survive.
+def minmax_indices(y, n_out):
+    n = len(y)
+    buckets = max(1, n_out // 2)
+    if n_out >= n:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(0, n, buckets + 1).astype(int)
+    starts = edges[:-1]
+    lows = np.array([start + np.argmin(y[start:stop]) for start, stop in zip(starts, edges[1:])])
+    highs = np.array([start + np.argmax(y[start:stop]) for start, stop in zip(starts, edges[1:])])
+    return np.unique(np.concatenate([lows, highs]))
+
+
+# Reduces `df` to at most `max_points` rows for plotting `y` against `x`.
+# Rows where y is missing are dropped first, as the line would not draw them.
+def decimate(df, x, y, max_points=TREND_POINT_BUDGET, method='lttb'):
+    df = df[df[y].notna()]
+    if len(df) <= max_points:
+        return df
+    if not df[x].is_monotonic_increasing:
+        df = df.sort_values(x, kind='stable')
+
+    xs = df[x]
+    if np.issubdtype(xs.dtype, np.datetime64):
+        xs = xs.astype('int64')
+    if method == 'minmax':
+        indices = minmax_indices(df[y].to_numpy(), max_points)
+    else:
+        indices = lttb_indices(xs.to_numpy(), df[y].to_numpy(), max_points)
+    return df.iloc[indices]
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+import plotly.io as pio
+from Database.config import FIGURE_CACHE_CONFIG
+
+
+# Memoizes figure JSON keyed by (callback name, inputs, data version).
+#
+# Entries live in an in-memory LRU bounded by entry count and total JSON
+# bytes, and expire after `ttl` seconds. With `disk_dir` set, entries are
+# also written there so several worker processes share one cache; a memory
+# miss falls through to disk before the figure is rebuilt. Because the data
+# version is part of the key, new data never serves a stale figure: old
+# entries simply stop being requested and age out. Every disk write also
+# prunes the directory: expired files are deleted, then the oldest ones until
+# it is back within max_entries and max_bytes, the same bounds as memory.
+class FigureCache:
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024, ttl=600.0, disk_dir=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.disk_dir = disk_dir
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(name, inputs, version):
+        raw = json.dumps([name, inputs, version], sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _read_disk(self, key):
+        path = self._disk_path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_disk(self, key, payload):
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ Could not write figure cache entry: {e}")
+        self._prune_disk(keep=path)
+
+    # Other workers prune the same directory, so files may vanish mid-scan.
+    # `keep` (the entry just written) is never deleted.
+    def _prune_disk(self, keep=None):
+        now = time.time()
+        files = []
+        try:
+            names = os.listdir(self.disk_dir)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.disk_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            # Leftover temp files of interrupted writes expire like entries
+            if now - st.st_mtime > self.ttl:
+                self._remove_disk(path)
+            elif name.endswith('.json'):
+                files.append((path == keep, st.st_mtime_ns, st.st_size, path))
+
+        files.sort()  # oldest first, `keep` last
+        total = sum(size for _, _, size, _ in files)
+        while len(files) > 1 and (len(files) > self.max_entries or total > self.max_bytes):
+            _, _, size, path = files.pop(0)
+            self._remove_disk(path)
+            total -= size
+
+    @staticmethod
+    def _remove_disk(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _store_locked(self, key, payload):
+        if key in self._entries:
+            self._bytes -= len(self._entries.pop(key)[1])
+        self._entries[key] = (time.monotonic() + self.ttl, payload)
+        self._bytes += len(payload)
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.evictions += 1
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] >= time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                self._bytes -= len(self._entries.pop(key)[1])
+
+        payload = self._read_disk(key) if self.disk_dir else None
+        with self._lock:
+            if payload is not None:
+                self.disk_hits += 1
+                self._store_locked(key, payload)
+            else:
+                self.misses += 1
+        return payload
+
+    def put(self, key, payload):
+        with self._lock:
+            self._store_locked(key, payload)
+        if self.disk_dir:
+            self._write_disk(key, payload)
+
+    # Returns the cached figure (as a dict) for (name, inputs, version),
+    # calling build() and caching its result on a miss.
+    def memoize(self, name, inputs, version, build):
+        key = self.make_key(name, inputs, version)
+        payload = self.get(key)
+        if payload is None:
+            payload = pio.to_json(build(), validate=False)
+            self.put(key, payload)
+        return json.loads(payload)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+
+_cache = FigureCache(
+    max_entries=FIGURE_CACHE_CONFIG["max_entries"],
+    max_bytes=FIGURE_CACHE_CONFIG["max_bytes"],
+    ttl=FIGURE_CACHE_CONFIG["ttl"],
+    disk_dir=FIGURE_CACHE_CONFIG["disk_dir"]
+)
+
+
+def get_figure_cache():
+    return _cache
+
@@ -0,0 +1,134 @@
+import threading
+import numpy as np
+
+# scipy (in requirements.txt) answers the neighbour queries with cKDTree.
+# Without it a chunked brute-force search in NumPy does, at O(cells x
+# positions): fine for the few hundred positions a floor plan has.
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+# Grid cells per side and the number of nearest measurement positions each
+# cell is interpolated from.
+GRID_SIZE = 120
+IDW_NEIGHBOURS = 8
+IDW_POWER = 2
+
+
+# Same query() contract as cKDTree for the k nearest points.
+class _BruteForceNeighbours:
+    def __init__(self, points, chunk=4096):
+        self.points = np.asarray(points, dtype=float)
+        self._norms = (self.points * self.points).sum(axis=1)
+        self.chunk = chunk
+
+    def query(self, targets, k):
+        targets = np.asarray(targets, dtype=float)
+        k = min(k, len(self.points))
+        distances = np.empty((len(targets), k))
+        indices = np.empty((len(targets), k), dtype=np.int64)
+        for start in range(0, len(targets), self.chunk):
+            block = targets[start:start + self.chunk]
+            # |t - p|^2 = |t|^2 - 2 t.p + |p|^2, one matrix product per chunk
+            squared = (block * block).sum(axis=1)[:, None] - 2 * block @ self.points.T + self._norms
+            np.maximum(squared, 0, out=squared)
+            if k < len(self.points):
+                nearest = np.argpartition(squared, k - 1, axis=1)[:, :k]
+            else:
+                nearest = np.tile(np.arange(k), (len(block), 1))
+            distances[start:start + len(block)] = np.sqrt(np.take_along_axis(squared, nearest, axis=1))
+            indices[start:start + len(block)] = nearest
+        return distances, indices
+
+
+def neighbour_index(points):
+    if cKDTree is not None:
+        return cKDTree(points)
+    return _BruteForceNeighbours(points)
+
+
+# Inverse distance weighting: every target gets the average of its k
+# nearest points' values weighted by 1 / distance**power; a target that
+# coincides with a point takes that point's value.
+def idw(points, values, targets, k=IDW_NEIGHBOURS, power=IDW_POWER):
+    values = np.asarray(values, dtype=float)
+    k = min(k, len(values))
+    distances, indices = neighbour_index(points).query(targets, k=k)
+    if k == 1:
+        return values[np.asarray(indices).reshape(-1)]
+    with np.errstate(divide='ignore'):
+        weights = 1.0 / distances ** power
+    exact = ~np.isfinite(weights)
+    if exact.any():
+        hit = exact.any(axis=1)
+        weights[hit] = exact[hit]
+    return (weights * values[indices]).sum(axis=1) / weights.sum(axis=1)
+
+
+# Interpolates per-position means onto a size x size grid covering the
+# positions' bounding box plus a margin. Returns {'x', 'y', 'z', 'points'}
+# with x/y the axis coordinates and z[row][column] the grid values.
+def interpolate_grid(positions, values, size=GRID_SIZE, k=IDW_NEIGHBOURS, power=IDW_POWER):
+    positions = np.asarray(positions, dtype=float)
+    low, high = positions.min(axis=0), positions.max(axis=0)
+    margin = np.maximum((high - low) * 0.1, 1.0)
+    xs = np.linspace(low[0] - margin[0], high[0] + margin[0], size)
+    ys = np.linspace(low[1] - margin[1], high[1] + margin[1], size)
+    grid_x, grid_y = np.meshgrid(xs, ys)
+    targets = np.column_stack([grid_x.ravel(), grid_y.ravel()])
+    z = idw(positions, values, targets, k=k, power=power).reshape(size, size)
+    return {'x': xs, 'y': ys, 'z': z, 'points': (positions, np.asarray(values, dtype=float))}
+
+
+# Interpolated grids keyed by (metric, window), where a window is one date
+# ('YYYY-MM-DD') or None for all data.
+#
+# As a DatasetStore listener it drops only the grids whose window received
+# new rows (the all-data grids always do), so appending today's samples
+# leaves earlier days cached. Grids are built outside the lock (building
+# reads the store, whose lock is held while listeners run); a grid whose
+# window was invalidated while it was being built is returned but not kept.
+class GridCache:
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._grids = {}
+        self._generation = {}
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, metric, window, build):
+        key = (metric, window)
+        with self._lock:
+            if key in self._grids:
+                self.hits += 1
+                return self._grids[key]
+            self.misses += 1
+            stamp = (self._epoch, self._generation.get(window, 0))
+        grid = build()
+        with self._lock:
+            if (self._epoch, self._generation.get(window, 0)) == stamp:
+                if len(self._grids) >= self.max_entries:
+                    self._grids.pop(next(iter(self._grids)))
+                self._grids[key] = grid
+        return grid
+
+    def _invalidate(self, windows):
+        for window in windows:
+            self._generation[window] = self._generation.get(window, 0) + 1
+        self._grids = {key: grid for key, grid in self._grids.items() if key[1] not in windows}
+
+    # DatasetStore listener.
+    def on_rows(self, rows, reset):
+        with self._lock:
+            if reset:
+                self._epoch += 1
+                self._grids, self._generation = {}, {}
+            elif not rows.empty:
+                self._invalidate({None} | set(rows['date'].astype(str).unique()))
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._grids), 'hits': self.hits, 'misses': self.misses}
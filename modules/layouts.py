@@ -1,9 +1,11 @@
 from dash import html, dcc
 
-def serve_layout(colors, locations, dates, hours):
+def serve_layout(colors):
     return html.Div([
         dcc.Location(id='url', refresh=False),
         dcc.Store(id='collection-state', data={'active': False}),
+        # Filled by assets/live_updates.js with samples pushed over /events
+        dcc.Store(id='live-measurement'),
 
 
         # 📍 Top-right Start/Stop Button
@@ -0,0 +1,111 @@
+import json
+import os
+import threading
+from Database.config import DATA_CONFIG
+from Database.measurement_log import read_measurements
+from Database.models import METRIC_FIELDS
+
+# Small index of what the dataset contains (distinct locations, dates and
+# hours, first/last timestamp, row count) for building the dashboard layout
+# without loading the dataset or importing pandas.
+#
+# It is persisted next to the data (DATA_CONFIG["meta_path"]) together with
+# the log inode and byte offset it covers, and caught up by reading only the
+# lines appended since, so a page load costs a stat() and worker start-up
+# does not scale with history size. The legacy JSON document has no offsets
+# and is re-read in full whenever it changes.
+
+_REQUIRED_KEYS = frozenset(['timestamp', 'location'] + METRIC_FIELDS)
+_lock = threading.Lock()
+_cached = None
+
+
+def _empty(source=None):
+    return {"source": source, "offset": 0, "rows": 0, "locations": [], "dates": [], "hours": [],
+            "first": None, "last": None}
+
+
+# Timestamps are "YYYY-MM-DD HH:MM:SS", so string order is time order.
+def _fold(meta, entries):
+    locations, dates, hours = set(meta["locations"]), set(meta["dates"]), set(meta["hours"])
+    first, last, rows = meta["first"], meta["last"], meta["rows"]
+    for entry in entries:
+        if not isinstance(entry, dict) or not _REQUIRED_KEYS.issubset(entry):
+            continue
+        timestamp, location = entry["timestamp"], entry["location"]
+        name = location.get("position[name]") if isinstance(location, dict) else None
+        if not isinstance(timestamp, str) or len(timestamp) < 13 or not name:
+            continue
+        locations.add(name)
+        dates.add(timestamp[:10])
+        hours.add(f"{timestamp[11:13]}:00")
+        first = timestamp if first is None or timestamp < first else first
+        last = timestamp if last is None or timestamp > last else last
+        rows += 1
+    meta.update(locations=sorted(locations), dates=sorted(dates), hours=sorted(hours),
+                first=first, last=last, rows=rows)
+    return meta
+
+
+def _load_saved(meta_path):
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save(meta_path, meta):
+    tmp_path = f"{meta_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+    except OSError as e:
+        print(f"⚠️ Could not save dataset metadata: {e}")
+
+
+def _from_log(log_path, st, meta_path, current):
+    source = ["log", st.st_ino]
+    if current is None or current["source"] != source:
+        current = _load_saved(meta_path)
+    if current is None or current.get("source") != source or current["offset"] > st.st_size:
+        current = _empty(source)
+    if current["offset"] == st.st_size:
+        return current
+
+    entries, offset, _ = read_measurements(log_path, current["offset"])
+    if offset == current["offset"]:
+        return current  # only a partial last line so far
+    meta = _fold(dict(current), entries)
+    meta["offset"] = offset
+    _save(meta_path, meta)
+    return meta
+
+
+def _from_json(json_path, st, current):
+    source = ["json", st.st_ino, st.st_mtime_ns, st.st_size]
+    if current is not None and current["source"] == source:
+        return current
+    with open(json_path, 'r') as f:
+        data = json.load(f)
+    return _fold(_empty(source), [m for measurements in data.values() for m in measurements])
+
+
+# Current metadata for the dashboard's data source (the log, else the legacy
+# JSON document). Never raises: an unreadable source yields empty metadata.
+def dataset_metadata():
+    global _cached
+    log_path, json_path = DATA_CONFIG["log_path"], DATA_CONFIG["json_path"]
+    with _lock:
+        try:
+            if os.path.exists(log_path):
+                _cached = _from_log(log_path, os.stat(log_path), DATA_CONFIG["meta_path"], _cached)
+            elif os.path.exists(json_path):
+                _cached = _from_json(json_path, os.stat(json_path), _cached)
+            else:
+                _cached = _empty()
+        except Exception as e:
+            print(f"❌ Error reading dataset metadata: {e}")
+            return _empty()
+        return _cached
@@ -0,0 +1,118 @@
+import threading
+import numpy as np
+import pandas as pd
+
+
+# Pre-aggregated statistics maintained incrementally from dataset rows.
+#
+# For every grouping below and every metric the table keeps count (non-null
+# samples), sum, sum of squares, min and max, plus the number of rows per
+# group. New rows are aggregated on their own and merged into the existing
+# tables, whose size depends on locations/dates/hours rather than on the
+# number of raw samples, so queries never touch raw history.
+class RollupStore:
+    GROUPINGS = {
+        'hourly': ['location', 'date', 'hour'],
+        'location_hour': ['location', 'hour'],
+        'location': ['location'],
+    }
+    STATS = ('count', 'sum', 'sumsq', 'min', 'max')
+    # Columns of _finish(), as groupby(...)[metric].agg(['count', 'mean', 'std', 'min', 'max'])
+    SUMMARY = ['count', 'mean', 'std', 'min', 'max']
+
+    def __init__(self, metrics):
+        self.metrics = list(metrics)
+        self._lock = threading.Lock()
+        self._tables = {}
+
+    def _aggregate(self, df, keys):
+        # String keys so tables built from different categoricals merge cleanly
+        groups = [df[key].astype(str) for key in keys]
+        out = df.groupby(groups, sort=False).size().to_frame('rows')
+        for metric in self.metrics:
+            values = pd.to_numeric(df[metric], errors='coerce').astype(float)
+            grouped = values.groupby(groups, sort=False)
+            out[(metric, 'count')] = grouped.count()
+            out[(metric, 'sum')] = grouped.sum()
+            out[(metric, 'sumsq')] = (values * values).groupby(groups, sort=False).sum()
+            out[(metric, 'min')] = grouped.min()
+            out[(metric, 'max')] = grouped.max()
+        return out
+
+    @staticmethod
+    def _combine(current, update):
+        if current is None or current.empty:
+            return update
+        combined = pd.concat([current, update])
+        grouped = combined.groupby(level=list(range(combined.index.nlevels)))
+        functions = {}
+        for column in combined.columns:
+            stat = column[1] if isinstance(column, tuple) else 'rows'
+            functions[column] = stat if stat in ('min', 'max') else 'sum'
+        return grouped.agg(functions)
+
+    # DatasetStore listener: rebuild on a full load, merge on appended rows.
+    def on_rows(self, rows, reset):
+        tables = {}
+        for name, keys in self.GROUPINGS.items():
+            tables[name] = self._aggregate(rows, keys) if not rows.empty else None
+        with self._lock:
+            if reset:
+                self._tables = tables
+            else:
+                for name, table in tables.items():
+                    self._tables[name] = self._combine(self._tables.get(name), table)
+
+    def _table(self, name):
+        with self._lock:
+            return self._tables.get(name)
+
+    # Sample standard deviation (ddof=1, NaN below two samples) like pandas.
+    @staticmethod
+    def _finish(table, metric):
+        count = table[(metric, 'count')]
+        mean = table[(metric, 'sum')] / count.where(count > 0)
+        squares = table[(metric, 'sumsq')] - count * mean * mean
+        variance = squares / (count - 1).where(count > 1)
+        return pd.DataFrame({
+            'count': count,
+            'mean': mean,
+            'std': np.sqrt(variance.clip(lower=0)),
+            'min': table[(metric, 'min')],
+            'max': table[(metric, 'max')],
+        }, columns=RollupStore.SUMMARY)
+
+    # Per-hour mean of `metric` at `location`, shaped like
+    # df.groupby('hour')[metric].mean().reset_index().
+    def hourly_mean(self, location, metric):
+        table = self._table('location_hour')
+        if table is None or location not in table.index.get_level_values(0):
+            return pd.DataFrame(columns=['hour', metric])
+        stats = self._finish(table.xs(location, level=0), metric)
+        stats = stats[stats['count'] > 0].sort_index()
+        return pd.DataFrame({'hour': stats.index.to_numpy(), metric: stats['mean'].to_numpy()})
+
+    # Per-location means of every metric plus the row count, shaped like
+    # df.groupby('location').agg({...metrics: 'mean', 'timestamp': 'count'}).
+    def location_summary(self):
+        table = self._table('location')
+        if table is None:
+            return pd.DataFrame(columns=['location'] + self.metrics + ['count'])
+        table = table.sort_index()
+        out = pd.DataFrame({'location': table.index.to_numpy()})
+        for metric in self.metrics:
+            out[metric] = self._finish(table, metric)['mean'].to_numpy()
+        out['count'] = table['rows'].to_numpy()
+        return out
+
+    # Full statistics for one metric at the finest grain (location, date, hour).
+    def hourly_stats(self, metric, location=None):
+        keys = self.GROUPINGS['hourly']
+        table = self._table('hourly')
+        if table is None or (location is not None and location not in table.index.get_level_values(0)):
+            return pd.DataFrame(columns=keys + self.SUMMARY)
+        if location is not None:
+            table = table.xs(location, level=0, drop_level=False)
+        stats = self._finish(table.sort_index(), metric)
+        stats.index.names = keys
+        return stats.reset_index()
@@ -0,0 +1,233 @@
+import math
+import threading
+from collections import OrderedDict
+import numpy as np
+
+_MIN_INDEXABLE = 1e-9
+
+
+# DDSketch-style quantile sketch: values are counted in logarithmic buckets
+# of ratio gamma = (1 + a) / (1 - a), so every quantile it returns is within
+# relative error `a` of a true sample value. Memory depends on the value
+# range, not on the number of samples, and two sketches with the same
+# accuracy merge exactly by adding bucket counts.
+class QuantileSketch:
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zeros = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _keys(self, magnitudes):
+        return np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64)
+
+    def _value(self, key):
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value):
+        self.add_many(np.array([value], dtype=float))
+
+    # Adds every finite value of `values` (NaNs are ignored).
+    def add_many(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[np.isfinite(values)]
+        if not len(values):
+            return
+        self.count += len(values)
+        self.total += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.zeros += int((np.abs(values) <= _MIN_INDEXABLE).sum())
+        for store, selected in ((self.positive, values[values > _MIN_INDEXABLE]),
+                                (self.negative, -values[values < -_MIN_INDEXABLE])):
+            if len(selected):
+                keys, counts = np.unique(self._keys(selected), return_counts=True)
+                for key, count in zip(keys.tolist(), counts.tolist()):
+                    store[key] = store.get(key, 0) + count
+
+    def merge(self, other):
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for store, incoming in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, count in incoming.items():
+                store[key] = store.get(key, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return max(self.min, -self._value(key))
+        seen += self.zeros
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return min(self.max, self._value(key))
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+
+# Per-(location, hour, metric) streaming statistics: a QuantileSketch plus an
+# exponentially weighted moving average (weight `ewma_alpha` per sample, in
+# arrival order). Every entry also feeds an all-hours aggregate under
+# hour=None. Queries are dictionary lookups plus a walk over at most a few
+# hundred buckets, independent of history size.
+#
+# It is fed from two places: on_rows() follows the DatasetStore (full
+# backfill on reset, appended rows afterwards) and add_sample() takes samples
+# straight from the collector's event bus, so tails move before the data
+# files are re-read. The most recent `max_seen` (location, timestamp) keys
+# are remembered so a sample arriving from both paths is counted once.
+class StreamingStats:
+    def __init__(self, metrics, relative_accuracy=0.01, ewma_alpha=0.1, max_seen=10000):
+        self.metrics = list(metrics)
+        self.relative_accuracy = relative_accuracy
+        self.ewma_alpha = ewma_alpha
+        self.max_seen = max_seen
+        self._lock = threading.Lock()
+        self._sketches = {}
+        self._ewma = {}
+        self._seen = OrderedDict()
+        self._quantile_cache = {}
+        self.version = 0
+
+    def _sketch(self, key):
+        sketch = self._sketches.get(key)
+        if sketch is None:
+            sketch = self._sketches[key] = QuantileSketch(self.relative_accuracy)
+        return sketch
+
+    def _update_ewma(self, key, values):
+        values = values[np.isfinite(values)]
+        if not len(values):
+            return
+        alpha = self.ewma_alpha
+        previous = self._ewma.get(key)
+        if previous is None:
+            previous, values = values[0], values[1:]
+        weights = alpha * (1 - alpha) ** np.arange(len(values) - 1, -1, -1)
+        self._ewma[key] = float(previous * (1 - alpha) ** len(values) + (weights * values).sum())
+
+    def _add_group(self, location, hour, columns):
+        for metric, values in columns.items():
+            key = (location, hour, metric)
+            self._sketch(key).add_many(values)
+            self._update_ewma(key, values)
+
+    # Feeds rows to one sketch per (location, hour) group, or per location
+    # with hour=None. A stable sort keeps arrival order within each group,
+    # which the EWMA depends on.
+    def _add_grouped(self, locations, location_codes, hours, hour_codes, metric_values):
+        width = len(hours) if hours is not None else 1
+        codes = location_codes * width + (hour_codes if hours is not None else 0)
+        order = np.argsort(codes, kind='stable')
+        sorted_codes = codes[order]
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+        stops = np.r_[starts[1:], len(order)]
+        ordered = {metric: values[order] for metric, values in metric_values.items()}
+        for start, stop in zip(starts, stops):
+            code = sorted_codes[start]
+            hour = str(hours[code % width]) if hours is not None else None
+            self._add_group(str(locations[code // width]), hour,
+                            {metric: values[start:stop] for metric, values in ordered.items()})
+
+    def _remember(self, keys):
+        fresh = []
+        for key in keys:
+            fresh.append(key not in self._seen)
+            self._seen[key] = None
+        while len(self._seen) > self.max_seen:
+            self._seen.popitem(last=False)
+        return np.array(fresh, dtype=bool)
+
+    # DatasetStore listener.
+    def on_rows(self, rows, reset):
+        with self._lock:
+            if reset:
+                self._sketches, self._ewma, self._seen = {}, {}, OrderedDict()
+            if rows.empty:
+                self._changed()
+                return
+            recent = rows.iloc[-self.max_seen:]
+            keys = (recent['location'].astype(str) + '|'
+                    + recent['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S')).tolist()
+            fresh = self._remember(keys)
+            if not reset and not fresh.all():
+                rows = rows.iloc[np.concatenate([np.ones(len(rows) - len(recent), dtype=bool), fresh])]
+                # Every row already arrived through add_sample()
+                if rows.empty:
+                    self._changed()
+                    return
+
+            locations, location_codes = np.unique(rows['location'].astype(str).to_numpy(), return_inverse=True)
+            hours, hour_codes = np.unique(rows['hour'].astype(str).to_numpy(), return_inverse=True)
+            metric_values = {m: rows[m].to_numpy(dtype=float, na_value=np.nan) for m in self.metrics}
+            self._add_grouped(locations, location_codes, hours, hour_codes, metric_values)
+            self._add_grouped(locations, location_codes, None, None, metric_values)
+            self._changed()
+
+    # One sample from the collector (a flat measurement dict with a
+    # 'YYYY-MM-DD HH:MM:SS' timestamp).
+    def add_sample(self, sample):
+        location, timestamp = sample.get('location'), sample.get('timestamp')
+        if not location or not isinstance(timestamp, str):
+            return
+        with self._lock:
+            if not self._remember([f"{location}|{timestamp}"])[0]:
+                return
+            columns = {}
+            for metric in self.metrics:
+                value = sample.get(metric)
+                columns[metric] = np.array([np.nan if value is None else value], dtype=float)
+            self._add_group(location, f"{timestamp[11:13]}:00", columns)
+            self._add_group(location, None, columns)
+            self._changed()
+
+    def _changed(self):
+        self.version += 1
+        self._quantile_cache = {}
+
+    # {'count', 'mean', 'ewma', 'p50', ...} for one metric at `location`
+    # (and `hour`), or None when nothing was recorded.
+    def summary(self, metric, location, hour=None, quantiles=(0.5, 0.95, 0.99)):
+        key = (location, hour, metric, tuple(quantiles))
+        with self._lock:
+            if key in self._quantile_cache:
+                return self._quantile_cache[key]
+            sketch = self._sketches.get((location, hour, metric))
+            result = None
+            if sketch is not None and sketch.count:
+                result = {'count': sketch.count, 'mean': sketch.mean(),
+                          'ewma': self._ewma.get((location, hour, metric))}
+                for q in quantiles:
+                    result[f"p{q * 100:g}"] = sketch.quantile(q)
+            self._quantile_cache[key] = result
+            return result
+
+    def locations(self):
+        with self._lock:
+            return sorted({location for location, _, _ in self._sketches})
+
+    def hours(self, location):
+        with self._lock:
+            return sorted({hour for loc, hour, _ in self._sketches if loc == location and hour is not None})
+
@@ -0,0 +1,93 @@
+import json
+import os
+import uuid
+
+# pyarrow is optional: without it the loader keeps filtering the in-memory
+# frame and compaction is unavailable.
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:
+    pa = None
+    ds = None
+
+MANIFEST_NAME = '_manifest.json'
+PARTITION_COLUMNS = ['date', 'location']
+
+
+def snapshots_available():
+    return ds is not None
+
+
+def _manifest_path(snapshot_dir):
+    return os.path.join(snapshot_dir, MANIFEST_NAME)
+
+
+def load_manifest(snapshot_dir):
+    try:
+        with open(_manifest_path(snapshot_dir), 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def save_manifest(snapshot_dir, manifest):
+    path = _manifest_path(snapshot_dir)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+# Appends a frame to the snapshot as Parquet files laid out as
+# date=YYYY-MM-DD/location=NAME/part-*.parquet. Existing files are never
+# rewritten, so a compaction only costs as much as the rows it adds.
+def write_partitions(df, snapshot_dir):
+    if ds is None:
+        raise RuntimeError("pyarrow is required to write snapshots (pip install pyarrow)")
+    if df.empty:
+        return 0
+
+    df = df.astype({'date': str, 'hour': str, 'location': str})
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    ds.write_dataset(
+        table,
+        snapshot_dir,
+        format='parquet',
+        partitioning=PARTITION_COLUMNS,
+        partitioning_flavor='hive',
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior='overwrite_or_ignore'
+    )
+    return len(df)
+
+
+def _isin(field, values):
+    return ds.field(field).isin([str(v) for v in values])
+
+
+# Reads only the partitions matching `locations`/`dates` (directory pruning)
+# and only the requested columns; `hours` is pushed down as a row filter.
+def read_partitions(snapshot_dir, columns, locations=None, dates=None, hours=None):
+    dataset = ds.dataset(
+        snapshot_dir,
+        format='parquet',
+        partitioning=ds.partitioning(
+            pa.schema([('date', pa.string()), ('location', pa.string())]), flavor='hive'
+        ),
+        exclude_invalid_files=True,
+        ignore_prefixes=['_', '.']
+    )
+
+    expression = None
+    for field, values in (('location', locations), ('date', dates), ('hour', hours)):
+        if values is not None:
+            condition = _isin(field, values)
+            expression = condition if expression is None else expression & condition
+
+    return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+
+if __name__ == '__main__':
+    from modules.data_loader import compact_snapshots
+    print(f"✅ Compacted {compact_snapshots()} new row(s) into the snapshot")
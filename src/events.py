@@ -0,0 +1,211 @@
+import itertools
+import os
+import threading
+from collections import deque
+from Database.config import DATA_CONFIG
+from Database.measurement_log import iter_measurements
+
+# Per-process publish/subscribe channel feeding the web app's consumers
+# (SSE clients, live statistics).
+#
+# publish() never blocks the publisher: every subscriber has its own bounded
+# queue and, when a slow consumer lets it fill up, the oldest events are
+# dropped (and counted) rather than holding anything up. Events carry a
+# monotonically increasing id and the last `history` events are kept, so a
+# reconnecting client (SSE Last-Event-ID) can replay what it missed.
+#
+# The bus itself is not shared between processes. Measurements reach it
+# through LogRelay, which follows the measurement log every worker can read,
+# so each worker publishes every sample whichever process collected it, and
+# under the same id (the sample's offset in the log).
+
+MEASUREMENT_TOPIC = 'measurement'
+
+class Subscription:
+    def __init__(self, bus, topics, maxsize):
+        self._bus = bus
+        self.topics = topics
+        self._queue = deque(maxlen=maxsize)
+        self._ready = threading.Condition()
+        self.dropped = 0
+        self.closed = False
+
+    def _put(self, event):
+        with self._ready:
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+            self._queue.append(event)
+            self._ready.notify()
+
+    # Returns the next event (id, topic, payload), or None after `timeout`
+    # seconds without one or once the subscription is closed.
+    def get(self, timeout=None):
+        with self._ready:
+            if not self._queue and not self.closed:
+                self._ready.wait(timeout)
+            return self._queue.popleft() if self._queue else None
+
+    def close(self):
+        self._bus.unsubscribe(self)
+        with self._ready:
+            self.closed = True
+            self._ready.notify_all()
+
+
+class EventBus:
+    def __init__(self, history=500):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._subscribers = []
+        self._listeners = []
+        self._history = deque(maxlen=history)
+        self.published = 0
+
+    # `event_id` lets a producer supply ids that mean the same thing in
+    # every process (LogRelay uses log offsets); they must keep increasing.
+    def publish(self, topic, payload, event_id=None):
+        with self._lock:
+            event = (next(self._ids) if event_id is None else event_id, topic, payload)
+            self._history.append(event)
+            self.published += 1
+            subscribers = list(self._subscribers)
+            listeners = list(self._listeners)
+        for subscription in subscribers:
+            if subscription.topics is None or topic in subscription.topics:
+                subscription._put(event)
+        for callback, topics in listeners:
+            if topics is None or topic in topics:
+                try:
+                    callback(payload)
+                except Exception as e:
+                    print(f"⚠️ Event listener failed: {e}")
+        return event[0]
+
+    # Calls callback(payload) synchronously in the publishing thread, for
+    # cheap in-process consumers; anything slow should subscribe() instead.
+    def add_listener(self, callback, topics=None):
+        with self._lock:
+            self._listeners.append((callback, None if topics is None else frozenset(topics)))
+
+    # `topics=None` receives everything. With `last_id`, events newer than
+    # it that are still in the history are queued first.
+    def subscribe(self, topics=None, maxsize=1000, last_id=None):
+        subscription = Subscription(self, None if topics is None else frozenset(topics), maxsize)
+        with self._lock:
+            if last_id is not None:
+                for event in self._history:
+                    if event[0] > last_id and (subscription.topics is None or event[1] in subscription.topics):
+                        subscription._put(event)
+            self._subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'published': self.published,
+                'subscribers': len(self._subscribers),
+                'dropped': sum(s.dropped for s in self._subscribers),
+            }
+
+
+# Polls the measurement log and publishes each entry appended since the
+# previous poll, as transform(entry), with the entry's end offset as event id.
+# It starts at the end of the log, so history is not replayed. If the log is
+# replaced (a new inode, or a file shorter than the offset) it restarts at
+# the new end.
+class LogRelay:
+    def __init__(self, bus, path, topic, transform=None, poll_interval=1.0):
+        self.bus = bus
+        self.path = path
+        self.topic = topic
+        self.transform = transform
+        self.poll_interval = poll_interval
+        self._identity = self._stat()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_size)
+
+    # One pass over whatever was appended; returns the number of events.
+    def poll(self):
+        identity = self._stat()
+        if identity is None:
+            return 0
+        if self._identity is None:
+            inode, offset = identity[0], 0
+        else:
+            inode, offset = self._identity
+        if identity[0] != inode or identity[1] < offset:
+            print(f"⚠️ {os.path.basename(self.path)} was replaced, following it from its end")
+            self._identity = identity
+            return 0
+
+        published = 0
+        try:
+            for entry, end in iter_measurements(self.path, offset):
+                offset = end
+                if entry is None:
+                    continue
+                try:
+                    payload = entry if self.transform is None else self.transform(entry)
+                except Exception as e:
+                    print(f"⚠️ Skipping measurement the event relay could not convert: {e}")
+                    continue
+                self.bus.publish(self.topic, payload, event_id=end)
+                published += 1
+        finally:
+            self._identity = (inode, offset)
+        return published
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"⚠️ Event relay failed to read {self.path}: {e}")
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='event-relay', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+_bus = EventBus()
+_relay = None
+_relay_lock = threading.Lock()
+
+
+def get_event_bus():
+    return _bus
+
+
+def publish(topic, payload):
+    return _bus.publish(topic, payload)
+
+
+# Starts (once per process) relaying new measurement-log entries onto the
+# bus under MEASUREMENT_TOPIC.
+def start_log_relay(transform=None, poll_interval=None):
+    global _relay
+    with _relay_lock:
+        if _relay is None:
+            _relay = LogRelay(_bus, DATA_CONFIG["log_path"], MEASUREMENT_TOPIC, transform,
+                              poll_interval or DATA_CONFIG["events_poll_interval"])
+            _relay.start()
+        return _relay
@@ -0,0 +1,128 @@
+import os
+import socket
+import threading
+import time
+import uuid
+from Database.config import COLLECTOR_CONFIG
+from Database.database import get_db_connection
+from Database.job_registry import FileJobRegistry, MongoJobRegistry
+from src.main import start_collection, start_continuous_collection, stop_event
+
+
+# Runs collection jobs on behalf of the web tier so that any worker can
+# start, stop or report on the collector.
+#
+# State lives in the shared job registry, never in worker globals: start()
+# only runs the job if it wins the single collector lease; the worker that
+# owns the job renews the lease with a heartbeat thread and stops the
+# collector (through stop_event) when the job is cancelled from any worker
+# or when it loses the lease. The collector is stopped gracefully: the
+# current samples finish and buffered writes are flushed.
+class CollectionJobManager:
+    def __init__(self, registry, run=start_collection, run_continuous=start_continuous_collection,
+                 stop_event=stop_event, heartbeat_interval=5.0):
+        self.registry = registry
+        self._runners = {"once": run, "continuous": run_continuous}
+        self._stop_event = stop_event
+        self.heartbeat_interval = heartbeat_interval
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._lock = threading.Lock()
+        self._local_job = None
+
+    # Returns (job, started): the new job, or the job already holding the
+    # lease with started=False. Continuous jobs sweep until cancelled.
+    def start(self, locations, continuous=False):
+        with self._lock:
+            if self._local_job is not None:
+                return self.registry.get(self._local_job), False
+            now = time.time()
+            job = {
+                "_id": uuid.uuid4().hex,
+                "owner": self.owner,
+                "locations": [location[0] for location in locations],
+                "mode": "continuous" if continuous else "once",
+                "state": "running",
+                "started_at": now,
+                "heartbeat_at": now,
+                "finished_at": None,
+                "cancel_requested": False,
+                "error": None,
+            }
+            if not self.registry.acquire(job):
+                return self.registry.current(), False
+            self._local_job = job["_id"]
+
+        self._stop_event.clear()
+        threading.Thread(target=self._execute, args=(job, locations), daemon=True).start()
+        return job, True
+
+    def _execute(self, job, locations):
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job["_id"], done), daemon=True)
+        heartbeat.start()
+        state, error = "finished", None
+        try:
+            self._runners[job["mode"]](locations)
+            if self._stop_event.is_set():
+                state = "cancelled"
+        except Exception as e:
+            print(f"❌ Collection job {job['_id']} failed: {e}")
+            state, error = "failed", str(e)
+        finally:
+            done.set()
+            heartbeat.join()
+            try:
+                self.registry.finish(job["_id"], state, error)
+            except Exception as e:
+                print(f"⚠️ Could not record end of collection job {job['_id']}: {e}")
+            with self._lock:
+                self._local_job = None
+
+    def _heartbeat(self, job_id, done):
+        while not done.wait(self.heartbeat_interval):
+            try:
+                job = self.registry.heartbeat(job_id)
+            except Exception as e:
+                # Keep collecting; the lease only lapses after lease_ttl
+                print(f"⚠️ Heartbeat failed for collection job {job_id}: {e}")
+                continue
+            if job is None:
+                print(f"⚠️ Collection job {job_id} lost its lease, stopping")
+                self._stop_event.set()
+            elif job.get("cancel_requested"):
+                self._stop_event.set()
+
+    # Requests cancellation of the given job (default: the running one).
+    # The owner stops within one heartbeat; a local job stops immediately.
+    def stop(self, job_id=None):
+        job = self.registry.request_cancel(job_id)
+        with self._lock:
+            if job is not None and job["_id"] == self._local_job:
+                self._stop_event.set()
+        return job
+
+    def status(self):
+        return self.registry.current()
+
+    def jobs(self, limit=20):
+        return self.registry.list(limit)
+
+
+def _make_registry():
+    if COLLECTOR_CONFIG["job_registry"] == "mongo":
+        return MongoJobRegistry(get_db_connection, lease_ttl=COLLECTOR_CONFIG["lease_ttl"])
+    return FileJobRegistry(COLLECTOR_CONFIG["job_registry_path"], lease_ttl=COLLECTOR_CONFIG["lease_ttl"])
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager():
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = CollectionJobManager(
+                _make_registry(), heartbeat_interval=COLLECTOR_CONFIG["heartbeat_interval"]
+            )
+        return _manager
@@ -1,42 +1,47 @@
-import json
-from datetime import datetime
-import speedtest
+import os
 import time
+from datetime import datetime
 import subprocess
 import re
 from threading import Event
+from concurrent.futures import wait, FIRST_COMPLETED
 from Database.database import get_db_connection
+from Database.config import DATA_CONFIG, COLLECTOR_CONFIG
+from Database.counters import next_sequence, next_file_sequence
+from Database.measurement_log import get_measurement_log, read_measurements
+from Database.locations import get_location_registry
+from src.scheduler import ProbeScheduler
+from src.probes import ProbeEngine, make_probes
+from src.ping_stats import parse_ping_output, summarize_rtts, LATENCY_FIELDS
+from src.write_buffer import WriteBuffer
+from Database.models import (MeasurementWriter, measurement_document, migrate_nested_documents,
+                             MEASUREMENTS_COLLECTION)
 
 stop_event = Event()
 
 # Function to get WiFi RSSI on Windows using netsh
 def get_rssi():
     try:
-        result = subprocess.run(['netsh', 'wlan', 'show', 'interfaces'], capture_output=True, text=True)
+        result = subprocess.run(['netsh', 'wlan', 'show', 'interfaces'], capture_output=True, text=True, timeout=10)
         match = re.search(r"Signal\s+:\s+(\d+)", result.stdout)
         return int(match.group(1)) if match else None
     except Exception as e:
         print(f"Error getting RSSI: {e}")
         return None
 
-# Function to get packet loss, jitter, and latency using ping
+# Function to get packet loss, jitter and latency percentiles from per-packet ping RTTs
 def get_ping_stats():
     try:
-        result = subprocess.run(['ping', '-n', '10', '8.8.8.8'], capture_output=True, text=True)
-        output = result.stdout
-        match_loss = re.search(r"(\d+)% packet loss", output)
-        packet_loss = float(match_loss.group(1)) if match_loss else 0.0
-        match_latency = re.search(r"Average = (\d+)ms", output)
-        latency = float(match_latency.group(1)) if match_latency else 0.0
-        jitter = 0.0  # Jitter estimation not available in ping
-        return latency, jitter, packet_loss
+        result = subprocess.run(['ping', '-n', '10', '8.8.8.8'], capture_output=True, text=True, timeout=30)
+        return parse_ping_output(result.stdout)
     except Exception as e:
         print(f"Error getting ping stats: {e}")
-        return None, None, None
+        return summarize_rtts([])
 
 # Function to get download and upload speeds using speedtest-cli
 def get_speed():
     try:
+        import speedtest
         st = speedtest.Speedtest()
         st.get_best_server()
         download_speed = st.download() / 1e6  # Mbps
@@ -46,149 +51,269 @@ def get_speed():
         print(f"Error getting speed: {e}")
         return None, None
 
-# Function to write data to a JSON file
-def write_to_json_file(download_speed, upload_speed, latency_ms, jitter_ms, packet_loss, rssi,
-                       location, position_x, position_y, run_no, filename=r"data/wifi_data.json"):
-    try:
-        try:
-            with open(filename, 'r') as f:
-                existing_data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            existing_data = {}
-
-        entry = {
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "run_no": run_no,
-            "location": {
-                "position[x]": position_x,
-                "position[y]": position_y,
-                "position[name]": location
-            },
-            "download_speed": download_speed,
-            "upload_speed": upload_speed,
-            "latency_ms": latency_ms,
-            "jitter_ms": jitter_ms,
-            "packet_loss": packet_loss,
-            "rssi": rssi
-        }
-
-        if location not in existing_data:
-            existing_data[location] = []
-
-        existing_data[location].append(entry)
-
-        with open(filename, 'w') as f:
-            json.dump(existing_data, f, indent=4)
-    except Exception as e:
-        print(f"Error writing to JSON file: {e}")
+# Function to build a measurement entry in the stored format
+def build_entry(timestamp, download_speed, upload_speed, latency_ms, jitter_ms, packet_loss, rssi,
+                location, position_x, position_y, run_no, latency_stats=None):
+    entry = {
+        "timestamp": timestamp,
+        "run_no": run_no,
+        "location": {
+            "position[x]": position_x,
+            "position[y]": position_y,
+            "position[name]": location
+        },
+        "download_speed": download_speed,
+        "upload_speed": upload_speed,
+        "latency_ms": latency_ms,
+        "jitter_ms": jitter_ms,
+        "packet_loss": packet_loss,
+        "rssi": rssi
+    }
+    for field in LATENCY_FIELDS:
+        entry[field] = (latency_stats or {}).get(field)
+    return entry
 
+# Buffered writer for the flat one-document-per-measurement collection
+db_writer = MeasurementWriter(get_db_connection)
 
-# Function to store data in MongoDB in nested format by location
-def store_data_in_db(location_name, position_x, position_y, data):
-    try:
-        db = get_db_connection()
-        wifi_data_col = db["wifi_data"]
-
-        # Prepare new entry
-        new_entry = {
-            "timestamp": data['timestamp'],
-            "run_no": data['run_no'],
-            "location": {
-                "position[x]": position_x,
-                "position[y]": position_y,
-                "position[name]": location_name
-            },
-            "download_speed": data['download_speed'],
-            "upload_speed": data['upload_speed'],
-            "latency_ms": data['latency_ms'],
-            "jitter_ms": data['jitter_ms'],
-            "packet_loss": data['packet_loss'],
-            "rssi": data['rssi']
-        }
-
-        # Upsert by location_name: Push the new run data into the array
-        wifi_data_col.update_one(
-            {"_id": location_name},
-            {"$push": {location_name: new_entry}},
-            upsert=True
+# Storage sinks for the write buffer; each batch is appended to the log and
+# synced once, then written to MongoDB in one insert_many. Errors propagate
+# so the buffer does not count a failed batch as written (documents that
+# could not be inserted stay in db_writer and are retried with the next batch)
+def _log_sink(entries):
+    log = get_measurement_log()
+    for entry in entries:
+        log.append(entry)
+    log.sync()
+
+def _db_sink(entries):
+    db_writer.add_many([measurement_document(entry) for entry in entries])
+
+# Probes hand samples to this buffer, so storage latency never delays them
+write_buffer = WriteBuffer(
+    [_log_sink, _db_sink],
+    max_entries=COLLECTOR_CONFIG["write_buffer_size"],
+    batch_size=COLLECTOR_CONFIG["write_batch_size"],
+    flush_interval=COLLECTOR_CONFIG["write_flush_interval"],
+    policy=COLLECTOR_CONFIG["write_overflow_policy"],
+    block_timeout=COLLECTOR_CONFIG["write_block_timeout"],
+    high_water=COLLECTOR_CONFIG["write_high_water"]
+)
+
+_probe_engine = None
+
+# One engine (one event loop) per process, shared by every sweep
+def get_probe_engine():
+    global _probe_engine
+    if _probe_engine is None:
+        _probe_engine = ProbeEngine(
+            make_probes(COLLECTOR_CONFIG["probe_backend"]),
+            limits={"throughput": COLLECTOR_CONFIG["max_parallel_throughput"]}
         )
+    return _probe_engine
 
-        print(f"✅ Data stored under {location_name}")
-    except Exception as e:
-        print(f"❌ Error storing data in MongoDB: {e}")
+# Builds and queues the sample for one location from its probe results.
+# A sample is kept when the speed test or the ping produced a result: with
+# every packet lost (an outage) latency and jitter are None and packet_loss
+# is 100, and the dashboard and anomaly detector need to see exactly those.
+def store_sample(location, run_no, download_speed, upload_speed, ping, rssi):
+    location_name, position_x, position_y = location
+    latency, jitter, packet_loss = ping.get('latency_ms'), ping.get('jitter_ms'), ping.get('packet_loss')
 
-# Main function to collect and store WiFi data
-def collect_and_store_data(location_list, run_no):
-    for location in location_list:
-        if stop_event.is_set():
-            print("Data collection interrupted.")
-            break
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    measured_speed = download_speed is not None and upload_speed is not None
+    if measured_speed or packet_loss is not None:
+        entry = build_entry(
+            timestamp, download_speed, upload_speed, latency, jitter, packet_loss,
+            rssi, location_name, position_x, position_y, run_no=run_no, latency_stats=ping
+        )
+        if write_buffer.put(entry):
+            print(f"[Run {run_no}] Data saved at {timestamp} for {location_name}")
+        else:
+            print(f"⚠️ [Run {run_no}] Write buffer full, sample at {timestamp} for {location_name} dropped")
+    else:
+        print(f"[Run {run_no}] Data can't be saved at {timestamp} for {location_name}")
 
+# Measures one location with the blocking system probes (run concurrently
+# by the scheduler) and stores the sample
+def collect_location(scheduler, location, run_no):
+    print(f"[Run {run_no}] getting Data for {location[0]}...")
+    result = scheduler.measure(get_ping_stats, get_rssi, get_speed)
+    if result is None:
+        return
+    (download_speed, upload_speed), ping, rssi = result
+    store_sample(location, run_no, download_speed, upload_speed, ping, rssi)
+
+def _sweep_with_scheduler(locations, run_no):
+    scheduler = ProbeScheduler(
+        stop_event,
+        max_parallel_locations=COLLECTOR_CONFIG["max_parallel_locations"],
+        max_parallel_throughput=COLLECTOR_CONFIG["max_parallel_throughput"],
+        sample_interval=COLLECTOR_CONFIG["sample_interval"]
+    )
+    try:
+        scheduler.run(locations, lambda location: collect_location(scheduler, location, run_no),
+                      key=lambda location: location[0])
+    finally:
+        scheduler.close()
+
+# Every location of the sweep is measured at once on the probe engine's
+# loop (throughput tests limited by the engine); samples are stored as
+# locations finish. Stopping cancels the measurements still running.
+def _sweep_with_engine(locations, run_no):
+    engine = get_probe_engine()
+    pending = {}
+    for location in locations:
+        print(f"[Run {run_no}] getting Data for {location[0]}...")
+        pending[engine.submit(engine.measure(location[0]))] = location
+    try:
+        while pending and not stop_event.is_set():
+            done, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            for future in done:
+                location = pending.pop(future)
+                try:
+                    fields = future.result()
+                except Exception as e:
+                    print(f"Error in probe task for {location[0]}: {e}")
+                    continue
+                store_sample(location, run_no, fields.get('download_speed'), fields.get('upload_speed'),
+                             fields, fields.get('rssi'))
+    finally:
+        for future in pending:
+            future.cancel()
+
+# Main function to collect and store WiFi data (one sweep over the locations).
+# A location is [name, x, y] or just a registered name.
+def collect_and_store_data(location_list, run_no, flush=True):
+    registry = get_location_registry()
+    locations = []
+    for location in location_list:
+        if isinstance(location, str):
+            entry = registry.get(location)
+            if entry is None:
+                print("Unregistered location. Skipping:", location)
+                continue
+            location = [entry["name"], entry["x"], entry["y"]]
         if len(location) != 3:
             print("Invalid location format. Skipping:", location)
             continue
+        locations.append(location)
 
-        location_name, position_x, position_y = location
+    if COLLECTOR_CONFIG["probe_backend"] == "system":
+        _sweep_with_scheduler(locations, run_no)
+    else:
+        _sweep_with_engine(locations, run_no)
 
-        print(f"[Run {run_no}] getting Data for {location_name}...")
+    if stop_event.is_set():
+        print("Data collection interrupted.")
+    if flush:
+        write_buffer.flush()
+    print(f"[Run {run_no}] Data collection is Completed.")
 
-        download_speed, upload_speed = get_speed()
-        latency, jitter, packet_loss = get_ping_stats()
-        rssi = get_rssi()
 
-        if all(val is not None for val in [download_speed, upload_speed, latency]):
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+def _max_logged_run_no():
+    log_path = DATA_CONFIG["log_path"]
+    if not os.path.exists(log_path):
+        return 0
+    entries, _, _ = read_measurements(log_path)
+    return max((e["run_no"] for e in entries if isinstance(e.get("run_no"), int)), default=0)
 
-            write_to_json_file(
-                download_speed, upload_speed, latency, jitter, packet_loss,
-                rssi, location_name, position_x, position_y, run_no=run_no
-            )
 
-            data = {
-                "timestamp": timestamp,
-                "download_speed": download_speed,
-                "upload_speed": upload_speed,
-                "latency_ms": latency,
-                "jitter_ms": jitter,
-                "packet_loss": packet_loss,
-                "rssi": rssi,
-                "run_no": run_no
-            }
+def _max_stored_run_no(db):
+    latest = db[MEASUREMENTS_COLLECTION].find_one(
+        {"run_no": {"$ne": None}}, {"run_no": 1}, sort=[("run_no", -1)]
+    )
+    return latest["run_no"] if latest else 0
 
-            store_data_in_db(location_name, position_x, position_y, data)
-            print(f"[Run {run_no}] Data saved at {timestamp} for {location_name}")
-        else:
-            print(f"[Run {run_no}] Data can't be saved at {timestamp} for {location_name}")
-        time.sleep(5)
-    print(f"[Run {run_no}] Data collection is Completed.")
 
+# Whether run numbers come from the MongoDB counter; decided once per
+# collection by prepare_run_counter() and cleared on the first failure, so an
+# unreachable database costs one timeout instead of one per sweep.
+_use_mongo_counter = None
 
+# Called when a collection starts: migrates legacy documents and checks that
+# MongoDB is reachable before the sweeps need run numbers.
+def prepare_run_counter():
+    global _use_mongo_counter
+    _use_mongo_counter = False
+    if DATA_CONFIG["run_counter"] != "mongo":
+        return
+    try:
+        migrate_nested_documents(get_db_connection())
+        _use_mongo_counter = True
+    except Exception as e:
+        print(f"⚠️ MongoDB unavailable, using the file counter for run numbers: {e}")
+
+# Run numbers come from an atomic counter, so allocation is O(1) and two
+# concurrent starts never share a number. The counter is seeded once from the
+# highest run already stored.
 def get_next_run_no():
+    global _use_mongo_counter
+    if _use_mongo_counter is None:
+        prepare_run_counter()
+    if _use_mongo_counter:
+        try:
+            db = get_db_connection()
+            return next_sequence(db, "run_no", seed=lambda: _max_stored_run_no(db))
+        except Exception as e:
+            _use_mongo_counter = False
+            print(f"Error fetching run_no from MongoDB, using file counter: {e}")
     try:
-        db = get_db_connection()
-        wifi_data_col = db["wifi_data"]
-
-        max_run = 0
-        for doc in wifi_data_col.find():
-            key = doc["_id"]
-            if isinstance(doc.get(key), list):
-                for entry in doc[key]:
-                    if "run_no" in entry:
-                        max_run = max(max_run, entry["run_no"])
-
-        return max_run + 1
+        return next_file_sequence(DATA_CONFIG["run_counter_path"], seed=_max_logged_run_no)
     except Exception as e:
         print(f"Error fetching run_no: {e}")
         return 1
 
 
 
-def start_collection(location_list):
+# Without a location list, probes the registry's collection targets
+def start_collection(location_list=None):
+    if location_list is None:
+        location_list = get_location_registry().collection_targets()
+    prepare_run_counter()
     run_no = get_next_run_no()
     print(f"Starting data collection for Run {run_no} across {len(location_list)} locations...")
     collect_and_store_data(location_list, run_no)
     return True
 
+# Continuous mode: one sweep (with its own run number) every
+# `sweep_interval` seconds until stopped. Sweep starts are scheduled on a
+# fixed grid from the first one, so the cadence does not drift with sweep
+# duration; a sweep that overruns skips the slots it missed. While the
+# write buffer is saturated the next sweep is skipped (back-pressure) rather
+# than piling more samples onto slow storage. Without a location list every
+# sweep probes the registry's current collection targets, so locations added
+# while it runs are picked up.
+def start_continuous_collection(location_list=None, sweep_interval=None):
+    sweep_interval = sweep_interval or COLLECTOR_CONFIG["sweep_interval"]
+    targets = location_list if location_list is not None else get_location_registry().collection_targets()
+    print(f"Starting continuous collection every {sweep_interval}s across {len(targets)} locations...")
+    prepare_run_counter()
+    origin = time.monotonic()
+    sweeps = skipped = 0
+    try:
+        while not stop_event.is_set():
+            if write_buffer.saturated():
+                skipped += 1
+                print(f"⚠️ Storage is behind ({write_buffer.stats()['queued']} queued), skipping this sweep")
+            else:
+                if location_list is None:
+                    targets = get_location_registry().collection_targets()
+                collect_and_store_data(targets, get_next_run_no(), flush=False)
+                sweeps += 1
+
+            elapsed = time.monotonic() - origin
+            next_slot = int(elapsed // sweep_interval) + 1
+            missed = next_slot - (sweeps + skipped)
+            if missed > 0:
+                skipped += missed
+                print(f"⚠️ Sweep overran the {sweep_interval}s cadence, skipping {missed} slot(s)")
+            stop_event.wait(origin + next_slot * sweep_interval - time.monotonic())
+    finally:
+        write_buffer.flush()
+        print(f"Continuous collection stopped after {sweeps} sweep(s), {skipped} skipped.")
+    return True
+
 def stop_collection():
     stop_event.set()
     print("Data collection stopped.")
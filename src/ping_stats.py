@@ -0,0 +1,79 @@
+import math
+import re
+
+# Parses Windows (`ping -n`) and Linux/macOS (`ping -c`) output into
+# per-packet RTTs and summary statistics.
+#
+#   Reply from 8.8.8.8: bytes=32 time=14ms TTL=117          (Windows)
+#   Reply from 10.0.0.1: bytes=32 time<1ms TTL=64           (Windows)
+#   64 bytes from 8.8.8.8: icmp_seq=1 ttl=117 time=14.2 ms  (Linux)
+_RTT = re.compile(r"time\s*([=<])\s*([\d.]+)\s*ms", re.IGNORECASE)
+_LINUX_COUNTS = re.compile(r"(\d+) packets transmitted, (\d+) (?:packets )?received")
+_WINDOWS_COUNTS = re.compile(r"Sent = (\d+), Received = (\d+)")
+_LOSS = re.compile(r"([\d.]+)% (?:packet )?loss")
+
+LATENCY_FIELDS = ['latency_min_ms', 'latency_p50_ms', 'latency_p95_ms', 'latency_max_ms']
+
+# Windows reports sub-millisecond replies only as an upper bound
+# ("time<1ms"); they are recorded at the middle of that interval rather than
+# at the bound, which would inflate latency on fast links.
+SUB_MS_FRACTION = 0.5
+
+
+def _percentile(ordered, q):
+    # Linear interpolation between closest ranks (numpy's default method)
+    position = (len(ordered) - 1) * q
+    low = math.floor(position)
+    high = math.ceil(position)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+# Latency statistics for a list of RTTs in arrival order. Jitter is the
+# RFC 3550 interarrival estimate, J += (|D| - J) / 16, over consecutive RTT
+# differences; mean and jitter are accumulated in the same pass.
+def summarize_rtts(rtts):
+    if not rtts:
+        return {'latency_ms': None, 'jitter_ms': None, **{field: None for field in LATENCY_FIELDS}}
+
+    total = 0.0
+    jitter = 0.0
+    previous = None
+    for rtt in rtts:
+        total += rtt
+        if previous is not None:
+            jitter += (abs(rtt - previous) - jitter) / 16.0
+        previous = rtt
+
+    ordered = sorted(rtts)
+    return {
+        'latency_ms': total / len(rtts),
+        'jitter_ms': jitter,
+        'latency_min_ms': ordered[0],
+        'latency_p50_ms': _percentile(ordered, 0.50),
+        'latency_p95_ms': _percentile(ordered, 0.95),
+        'latency_max_ms': ordered[-1]
+    }
+
+
+def _rtt(operator, value):
+    value = float(value)
+    return value * SUB_MS_FRACTION if operator == '<' else value
+
+
+# Packet loss comes from the sent count and the replies that carried an RTT:
+# Windows counts "Destination host unreachable" replies as received.
+def parse_ping_output(output):
+    rtts = [_rtt(operator, value) for operator, value in _RTT.findall(output)]
+    stats = summarize_rtts(rtts)
+
+    counts = _LINUX_COUNTS.search(output) or _WINDOWS_COUNTS.search(output)
+    loss = _LOSS.search(output)
+    if counts and int(counts.group(1)):
+        sent, received = int(counts.group(1)), min(int(counts.group(2)), len(rtts))
+        stats['packet_loss'] = (sent - received) * 100.0 / sent
+    elif loss:
+        stats['packet_loss'] = float(loss.group(1))
+    else:
+        stats['packet_loss'] = 0.0 if rtts else None
+    stats['rtts'] = rtts
+    return stats
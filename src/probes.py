@@ -0,0 +1,282 @@
+import asyncio
+import random
+import re
+import sys
+import threading
+import weakref
+import zlib
+from src.ping_stats import parse_ping_output, summarize_rtts
+
+# asyncio probe engine. A Probe measures one thing for one location and
+# returns a dict of measurement fields; the engine runs many of them
+# concurrently on one persistent event loop (its own thread) with a
+# per-probe timeout, so thousands of probes can be in flight without a thread
+# each. Backends bundle the probes for a platform; the simulated backend
+# needs no network at all.
+
+
+class ProbeTimeout(Exception):
+    pass
+
+
+# Runs a command without blocking the loop; the process is killed if it
+# outlives `timeout`.
+async def run_command(args, timeout):
+    process = await asyncio.create_subprocess_exec(
+        *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise ProbeTimeout(f"{args[0]} timed out after {timeout}s")
+    return stdout.decode(errors='replace')
+
+
+class Probe:
+    name = 'probe'
+    timeout = 30.0
+
+    async def run(self, location):
+        raise NotImplementedError
+
+
+class LinuxPingProbe(Probe):
+    name = 'ping'
+
+    def __init__(self, host='8.8.8.8', count=10, interval=0.2, timeout=30.0):
+        self.host = host
+        self.count = count
+        self.interval = interval
+        self.timeout = timeout
+
+    async def run(self, location):
+        output = await run_command(
+            ['ping', '-n', '-c', str(self.count), '-i', str(self.interval), self.host], self.timeout
+        )
+        return parse_ping_output(output)
+
+
+# Reads the link level from /proc/net/wireless, falling back to `iw`. The
+# dBm value is converted to the 0-100 signal quality netsh reports, so
+# samples from either platform stay comparable.
+class LinuxRssiProbe(Probe):
+    name = 'rssi'
+    IW_INTERFACE = re.compile(r"Interface\s+(\S+)")
+    IW_SIGNAL = re.compile(r"signal:\s*(-?\d+)\s*dBm")
+
+    def __init__(self, proc_path='/proc/net/wireless', timeout=5.0):
+        self.proc_path = proc_path
+        self.timeout = timeout
+
+    @staticmethod
+    def to_quality(dbm):
+        return int(min(100, max(0, 2 * (dbm + 100))))
+
+    def _read_proc(self):
+        try:
+            with open(self.proc_path, 'r') as f:
+                lines = f.read().splitlines()[2:]
+        except OSError:
+            return None
+        for line in lines:
+            fields = line.split()
+            if len(fields) >= 4:
+                return float(fields[3].rstrip('.'))
+        return None
+
+    async def run(self, location):
+        dbm = self._read_proc()
+        if dbm is None:
+            interfaces = self.IW_INTERFACE.findall(await run_command(['iw', 'dev'], self.timeout))
+            for interface in interfaces:
+                match = self.IW_SIGNAL.search(await run_command(['iw', 'dev', interface, 'link'], self.timeout))
+                if match:
+                    dbm = float(match.group(1))
+                    break
+        return {'rssi': None if dbm is None else self.to_quality(dbm)}
+
+
+class WindowsPingProbe(Probe):
+    name = 'ping'
+
+    def __init__(self, host='8.8.8.8', count=10, timeout=30.0):
+        self.host = host
+        self.count = count
+        self.timeout = timeout
+
+    async def run(self, location):
+        return parse_ping_output(await run_command(['ping', '-n', str(self.count), self.host], self.timeout))
+
+
+class WindowsRssiProbe(Probe):
+    name = 'rssi'
+    SIGNAL = re.compile(r"Signal\s+:\s+(\d+)")
+
+    def __init__(self, timeout=10.0):
+        self.timeout = timeout
+
+    async def run(self, location):
+        match = self.SIGNAL.search(await run_command(['netsh', 'wlan', 'show', 'interfaces'], self.timeout))
+        return {'rssi': int(match.group(1)) if match else None}
+
+
+# speedtest-cli is blocking, so it runs in a worker thread.
+class SpeedtestProbe(Probe):
+    name = 'throughput'
+    timeout = 120.0
+
+    @staticmethod
+    def _measure():
+        import speedtest
+        st = speedtest.Speedtest()
+        st.get_best_server()
+        return st.download() / 1e6, st.upload() / 1e6
+
+    async def run(self, location):
+        download_speed, upload_speed = await asyncio.to_thread(self._measure)
+        return {'download_speed': download_speed, 'upload_speed': upload_speed}
+
+
+# Deterministic stand-in for any probe: values depend only on (seed,
+# location, probe name, call number), and `delay` simulates probe duration.
+class SimulatedProbe(Probe):
+    RANGES = {
+        'rssi': {'rssi': (30, 100)},
+        'throughput': {'download_speed': (10, 100), 'upload_speed': (4, 50)}
+    }
+
+    def __init__(self, name, seed=0, delay=0.0, timeout=5.0):
+        self.name = name
+        self.seed = seed
+        self.delay = delay
+        self.timeout = timeout
+        self._calls = {}
+        self._calls_lock = threading.Lock()
+
+    async def run(self, location):
+        with self._calls_lock:
+            call = self._calls.get(location, 0)
+            self._calls[location] = call + 1
+        rng = random.Random(zlib.crc32(f"{self.seed}|{location}|{self.name}|{call}".encode()))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.name == 'ping':
+            return self._simulate_ping(rng)
+        fields = {field: round(rng.uniform(low, high), 3) for field, (low, high) in self.RANGES[self.name].items()}
+        if 'rssi' in fields:
+            fields['rssi'] = int(fields['rssi'])
+        return fields
+
+    @staticmethod
+    def _simulate_ping(rng, count=10):
+        base = rng.uniform(20, 120)
+        rtts = [round(max(1.0, rng.gauss(base, base * 0.1)), 1) for _ in range(count)]
+        received = [rtt for rtt in rtts if rng.random() > 0.02]
+        stats = summarize_rtts(received)
+        stats['packet_loss'] = (count - len(received)) * 100.0 / count
+        stats['rtts'] = received
+        return stats
+
+
+def make_probes(backend, **options):
+    if backend == 'auto':
+        backend = 'windows' if sys.platform.startswith('win') else 'linux'
+    if backend == 'linux':
+        return [LinuxPingProbe(), LinuxRssiProbe(), SpeedtestProbe()]
+    if backend == 'windows':
+        return [WindowsPingProbe(), WindowsRssiProbe(), SpeedtestProbe()]
+    if backend == 'simulated':
+        return [SimulatedProbe(name, **options) for name in ('ping', 'rssi', 'throughput')]
+    raise ValueError(f"Unknown probe backend: {backend}")
+
+
+# Probes run on one event loop owned by the engine, started on first use in
+# a daemon thread. Thread-based callers hand coroutines to it with submit()
+# (a concurrent.futures.Future) or the blocking *_sync helpers, so every
+# probe shares the same `max_in_flight` cap and the per-probe-name `limits`
+# (e.g. {'throughput': 1}: speed tests saturate the uplink and would skew
+# each other). Coroutines awaited directly on another loop get that loop's
+# own semaphores.
+class ProbeEngine:
+    def __init__(self, probes, max_in_flight=1000, limits=None):
+        self.probes = {probe.name: probe for probe in probes}
+        self.max_in_flight = max_in_flight
+        self.limits = dict(limits or {})
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._loop = None
+        self._thread = None
+        self._loop_lock = threading.Lock()
+
+    def _semaphore(self, name=None):
+        # asyncio primitives belong to one loop, so keep them per running loop
+        loop = asyncio.get_running_loop()
+        semaphores = self._semaphores.setdefault(loop, {})
+        if name not in semaphores:
+            semaphores[name] = asyncio.Semaphore(self.max_in_flight if name is None else self.limits[name])
+        return semaphores[name]
+
+    # Runs one probe with its timeout; errors are reported and yield {} so a
+    # failing probe never sinks the rest of the measurement. The timeout
+    # starts once the probe holds its slots.
+    async def run_probe(self, name, location):
+        probe = self.probes[name]
+        if name in self.limits:
+            async with self._semaphore(name):
+                return await self._run_limited(probe, location)
+        return await self._run_limited(probe, location)
+
+    async def _run_limited(self, probe, location):
+        async with self._semaphore():
+            try:
+                return await asyncio.wait_for(probe.run(location), probe.timeout)
+            except (asyncio.TimeoutError, ProbeTimeout):
+                print(f"Probe {probe.name} timed out for {location}")
+            except Exception as e:
+                print(f"Error in probe {probe.name} for {location}: {e}")
+        return {}
+
+    async def measure(self, location, names=None):
+        names = list(names or self.probes)
+        results = await asyncio.gather(*(self.run_probe(name, location) for name in names))
+        fields = {}
+        for result in results:
+            fields.update(result)
+        return fields
+
+    async def measure_many(self, locations):
+        return await asyncio.gather(*(self.measure(location) for location in locations))
+
+    def _ensure_loop(self):
+        with self._loop_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name='probe-engine',
+                                                daemon=True)
+                self._thread.start()
+            return self._loop
+
+    # Schedules a coroutine (e.g. self.measure(location)) on the engine loop.
+    def submit(self, coroutine):
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise RuntimeError("ProbeEngine.submit() called from the engine loop; await instead")
+        return asyncio.run_coroutine_threadsafe(coroutine, loop)
+
+    # Blocking entry points for thread-based callers.
+    def run_probe_sync(self, name, location):
+        return self.submit(self.run_probe(name, location)).result()
+
+    def measure_sync(self, location, names=None):
+        return self.submit(self.measure(location, names)).result()
+
+    def close(self):
+        with self._loop_lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if thread is not None and thread.is_alive():
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
@@ -0,0 +1,74 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+# Runs probe sweeps concurrently.
+#
+# Within a location the independent probes (ping, RSSI) run alongside the
+# throughput test. Across locations up to `max_parallel_locations` run at
+# once, but two entries for the same location never overlap and throughput
+# tests (which saturate the uplink and would skew each other) are limited to
+# `max_parallel_throughput`. Each location slot is held for at least
+# `sample_interval` seconds, replacing a fixed sleep after every sample.
+# Everything waits on `stop_event`, so stopping returns promptly; probes
+# already running are left to finish in the background.
+class ProbeScheduler:
+    def __init__(self, stop_event, max_parallel_locations=2, max_parallel_throughput=1,
+                 sample_interval=5.0, poll_interval=0.2):
+        self.stop_event = stop_event
+        self.max_parallel_locations = max(1, max_parallel_locations)
+        self.sample_interval = sample_interval
+        self.poll_interval = poll_interval
+        self._throughput_slots = threading.BoundedSemaphore(max(1, max_parallel_throughput))
+        self._probe_pool = ThreadPoolExecutor(
+            max_workers=self.max_parallel_locations * 2, thread_name_prefix='probe'
+        )
+
+    def _acquire(self, semaphore):
+        while not semaphore.acquire(timeout=self.poll_interval):
+            if self.stop_event.is_set():
+                return False
+        return True
+
+    # Runs one location's probes; returns (speed, ping, rssi) results or None
+    # if stopped before the throughput slot became free.
+    def measure(self, ping_probe, rssi_probe, speed_probe):
+        ping_future = self._probe_pool.submit(ping_probe)
+        rssi_future = self._probe_pool.submit(rssi_probe)
+        if not self._acquire(self._throughput_slots):
+            ping_future.cancel()
+            rssi_future.cancel()
+            return None
+        try:
+            speed = speed_probe()
+        finally:
+            self._throughput_slots.release()
+        return speed, ping_future.result(), rssi_future.result()
+
+    def run(self, items, task, key=lambda item: item):
+        key_locks = {key(item): threading.Lock() for item in items}
+
+        def worker(item):
+            if self.stop_event.is_set():
+                return
+            with key_locks[key(item)]:
+                started = time.monotonic()
+                task(item)
+                remaining = self.sample_interval - (time.monotonic() - started)
+                if remaining > 0:
+                    self.stop_event.wait(remaining)
+
+        pool = ThreadPoolExecutor(max_workers=self.max_parallel_locations, thread_name_prefix='location')
+        pending = {pool.submit(worker, item) for item in items}
+        try:
+            while pending and not self.stop_event.is_set():
+                done, pending = wait(pending, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is not None:
+                        print(f"Error in probe task: {future.exception()}")
+        finally:
+            pool.shutdown(wait=not self.stop_event.is_set(), cancel_futures=True)
+
+    def close(self):
+        self._probe_pool.shutdown(wait=False, cancel_futures=True)
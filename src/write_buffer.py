@@ -0,0 +1,144 @@
+import threading
+import time
+from collections import deque
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+
+# Bounded in-memory queue between the probes and storage.
+#
+# put() only appends to the queue; a background thread drains it in batches
+# of up to `batch_size` (or whatever is queued after `flush_interval`
+# seconds) and hands each batch to every sink in turn, so a slow disk or
+# database never delays a measurement. When storage falls behind and the
+# queue holds `max_entries`, `policy` decides what happens:
+#   * "drop_oldest"  discard the oldest queued entry (favour fresh data);
+#   * "drop_newest"  discard the incoming entry (favour continuity);
+#   * "block"        wait up to `block_timeout` seconds for room, then drop
+#                    the incoming entry.
+# Drops are counted. saturated() lets the caller apply back-pressure at a
+# coarser level, e.g. skipping a sweep instead of blocking mid-probe.
+#
+# A sink is a callable taking a list of entries; it must handle its own
+# retries, since other sinks may already have stored the batch. A batch
+# counts as written only if every sink accepted it, otherwise its entries
+# are counted as failed.
+class WriteBuffer:
+    def __init__(self, sinks, max_entries=1000, batch_size=50, flush_interval=2.0,
+                 policy="drop_oldest", block_timeout=1.0, high_water=0.8):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{policy}', expected one of {OVERFLOW_POLICIES}")
+        self.sinks = list(sinks)
+        self.max_entries = max(1, max_entries)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.high_water = high_water
+        self._queue = deque()
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+        self._flushing = 0
+        self.written = 0
+        self.failed = 0
+        self.dropped = 0
+        self.batches = 0
+        self.sink_errors = 0
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._closed = False
+            self._thread = threading.Thread(target=self._drain, name='write-buffer', daemon=True)
+            self._thread.start()
+
+    # Queues an entry; returns False if it was dropped.
+    def put(self, entry):
+        with self._cond:
+            self._ensure_thread()
+            if len(self._queue) >= self.max_entries:
+                if self.policy == "drop_oldest":
+                    self._queue.popleft()
+                    self.dropped += 1
+                elif self.policy == "drop_newest" or not self._cond.wait_for(
+                        lambda: len(self._queue) < self.max_entries, timeout=self.block_timeout):
+                    self.dropped += 1
+                    return False
+            self._queue.append(entry)
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify_all()
+            return True
+
+    def saturated(self):
+        with self._cond:
+            return len(self._queue) >= self.high_water * self.max_entries
+
+    def _drain(self):
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self.flush_interval
+                while (len(self._queue) < self.batch_size and not self._closed
+                       and not (self._flushing and self._queue)):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if not self._queue:
+                    if self._closed:
+                        return
+                    continue
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                self._in_flight = len(batch)
+                self._cond.notify_all()  # room for blocked put() calls
+
+            errors = 0
+            for sink in self.sinks:
+                try:
+                    sink(batch)
+                except Exception as e:
+                    errors += 1
+                    print(f"❌ Error writing {len(batch)} buffered measurement(s): {e}")
+
+            with self._cond:
+                self._in_flight = 0
+                self.sink_errors += errors
+                if errors:
+                    self.failed += len(batch)
+                else:
+                    self.written += len(batch)
+                    self.batches += 1
+                self._cond.notify_all()
+
+    # Waits until everything queued so far has been handed to the sinks.
+    def flush(self, timeout=None):
+        with self._cond:
+            if self._thread is None:
+                return True
+            self._flushing += 1
+            self._cond.notify_all()
+            try:
+                return self._cond.wait_for(lambda: not self._queue and not self._in_flight, timeout=timeout)
+            finally:
+                self._flushing -= 1
+
+    def close(self, timeout=None):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def stats(self):
+        with self._cond:
+            return {
+                'queued': len(self._queue),
+                'max_entries': self.max_entries,
+                'policy': self.policy,
+                'written': self.written,
+                'failed': self.failed,
+                'dropped': self.dropped,
+                'batches': self.batches,
+                'sink_errors': self.sink_errors,
+            }
@@ -0,0 +1,52 @@
+import pytest
+from flask import Flask
+
+from Database.config import DATA_CONFIG
+from Database.locations import DEFAULT_LOCATIONS
+from dummydatageneration import generate_frames, write_jsonl, write_parquet
+import modules.data_loader as data_loader
+from modules.figure_cache import get_figure_cache
+
+
+def _reset_caches():
+    data_loader.get_data_store().invalidate()
+    with data_loader._filtered_lock:
+        data_loader._filtered_cache.clear()
+    get_figure_cache().clear()
+
+
+# A small synthetic dataset (two days, every default location) as a JSON
+# Lines log, with DATA_CONFIG pointed at it and the in-process caches cold.
+@pytest.fixture
+def dataset(tmp_path, monkeypatch):
+    for key, name in [('json_path', 'wifi_data.json'), ('log_path', 'wifi_data.jsonl'),
+                      ('snapshot_dir', 'snapshots'), ('meta_path', 'wifi_meta.json'),
+                      ('locations_path', 'locations.json')]:
+        monkeypatch.setitem(DATA_CONFIG, key, str(tmp_path / name))
+    locations = [(loc['name'], loc['x'], loc['y']) for loc in DEFAULT_LOCATIONS]
+    frames = list(generate_frames(locations, periods=2 * 288))
+    write_jsonl(frames, DATA_CONFIG['log_path'])
+    _reset_caches()
+    yield frames
+    _reset_caches()
+
+
+# The same dataset plus a Parquet snapshot covering the whole log.
+@pytest.fixture
+def snapshot_dataset(dataset):
+    write_parquet(dataset, DATA_CONFIG['snapshot_dir'], DATA_CONFIG['log_path'])
+    return dataset
+
+
+# callback(output) -> the undecorated function behind the Dash callback
+# that writes `output` ('component-id.property').
+@pytest.fixture(scope='session')
+def callback():
+    from dash_app import create_dash_app
+
+    callbacks = create_dash_app(Flask(__name__)).callback_map
+
+    def find(output):
+        key = next(key for key in callbacks if output in key)
+        return callbacks[key]['callback'].__wrapped__
+    return find
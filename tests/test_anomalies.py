@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Database.config import DATA_CONFIG
+from dummydatageneration import entry_lines
+import modules.data_loader as data_loader
+from modules.anomalies import AnomalyDetector
+
+START = pd.Timestamp('2025-04-05')
+
+
+def _frame(values, metric='download_speed', location='ECC'):
+    return pd.DataFrame({'timestamp': pd.date_range(START, periods=len(values), freq='5min'),
+                         'location': location, metric: values})
+
+
+def _baseline(n, seed=0):
+    return 50.0 + np.random.default_rng(seed).normal(0.0, 1.0, n)
+
+
+def _detect(frame, metric='download_speed', **kwargs):
+    detector = AnomalyDetector([metric], **kwargs)
+    detector.on_rows(frame, True)
+    return detector
+
+
+def _at(index):
+    return START + pd.Timedelta(minutes=5 * index)
+
+
+def test_stationary_noise_raises_nothing():
+    assert _detect(_frame(_baseline(1000))).events() == []
+
+
+def test_a_step_down_is_a_shift_starting_at_the_step():
+    values = _baseline(600)
+    values[400:] -= 3.0
+
+    shifts = _detect(_frame(values)).events(kind='shift')
+
+    assert len(shifts) == 1
+    assert shifts[0]['start'] == _at(400)
+    assert shifts[0]['end'] == _at(599) and shifts[0]['ongoing']
+
+
+def test_a_single_outlier_is_a_spike_at_its_index():
+    values = _baseline(600)
+    values[300] = 20.0
+
+    spikes = _detect(_frame(values)).events(kind='spike')
+
+    assert [(e['start'], e['end'], e['samples']) for e in spikes] == [(_at(300), _at(300), 1)]
+    assert spikes[0]['value'] == 20.0 and not spikes[0]['ongoing']
+
+
+def test_improvements_and_warm_up_samples_are_not_flagged():
+    values = _baseline(600)
+    values[400:] += 10.0  # download got faster
+    values[50] = 0.0      # before min_periods samples of context
+
+    assert _detect(_frame(values)).events() == []
+
+
+def test_higher_is_worse_for_latency():
+    values = _baseline(600) / 5
+    values[450:] += 5.0
+
+    events = _detect(_frame(values, 'latency_ms'), 'latency_ms').events()
+
+    assert {(e['kind'], e['start']) for e in events} == {('spike', _at(450)), ('shift', _at(450))}
+
+
+def _comparable(events):
+    rows = sorted(events, key=lambda e: (e['location'], e['metric'], e['kind'], e['start']))
+    return [{key: pytest.approx(value) if isinstance(value, float) else value
+             for key, value in event.items()} for event in rows]
+
+
+@pytest.mark.parametrize('chunks', [2, 9])
+def test_appends_through_the_store_match_a_full_recompute(dataset, chunks):
+    frame = pd.concat(dataset, ignore_index=True).sort_values('timestamp', kind='stable')
+    lines = list(entry_lines(frame))
+    edges = np.linspace(len(lines) // 2, len(lines), chunks + 1).astype(int)
+    with open(DATA_CONFIG['log_path'], 'w') as f:
+        f.write('\n'.join(lines[:edges[0]]) + '\n')
+    data_loader.get_data_store().invalidate()
+
+    detector = data_loader.get_anomaly_detector()
+    for start, stop in zip(edges[:-1], edges[1:]):
+        with open(DATA_CONFIG['log_path'], 'a') as f:
+            f.write('\n'.join(lines[start:stop]) + '\n')
+        assert data_loader.get_anomaly_detector() is detector
+    incremental = detector.events()
+
+    full = AnomalyDetector(data_loader.METRIC_COLUMNS)
+    full.on_rows(data_loader.load_wifi_data(), True)
+    assert incremental
+    assert _comparable(incremental) == _comparable(full.events())
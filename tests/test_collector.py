@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+import src.main as collector
+from modules.data_loader import measurements_to_frame
+from src.ping_stats import parse_ping_output
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'ping')
+LOCATION = ['ECC', 67.12, -43.45]
+
+
+class RecordingBuffer:
+    def __init__(self):
+        self.entries = []
+
+    def put(self, entry):
+        self.entries.append(entry)
+        return True
+
+
+@pytest.fixture
+def buffer(monkeypatch):
+    recording = RecordingBuffer()
+    monkeypatch.setattr(collector, 'write_buffer', recording)
+    return recording
+
+
+def _ping(name):
+    with open(os.path.join(FIXTURES, name), 'r', encoding='utf-8', newline='') as f:
+        return parse_ping_output(f.read())
+
+
+@pytest.mark.parametrize('name', ['linux_all_lost.txt', 'windows_timed_out.txt'])
+def test_a_sample_with_every_packet_lost_is_stored(buffer, name):
+    collector.store_sample(LOCATION, 7, None, None, _ping(name), 55)
+
+    assert len(buffer.entries) == 1
+    entry = buffer.entries[0]
+    assert entry['packet_loss'] == 100.0
+    assert entry['latency_ms'] is None and entry['jitter_ms'] is None
+    assert entry['run_no'] == 7 and entry['rssi'] == 55
+
+    frame, skipped = measurements_to_frame(buffer.entries)
+    assert skipped == 0
+    assert frame['packet_loss'].tolist() == [100.0]
+    assert frame['latency_ms'].isna().all()
+
+
+def test_a_normal_sample_is_stored(buffer):
+    collector.store_sample(LOCATION, 7, 95.0, 40.0, _ping('linux_ok.txt'), 70)
+
+    assert buffer.entries[0]['download_speed'] == 95.0
+    assert buffer.entries[0]['latency_ms'] == pytest.approx(14.4)
+
+
+def test_a_sample_without_any_measurement_is_not_stored(buffer):
+    collector.store_sample(LOCATION, 7, None, None, parse_ping_output(''), None)
+
+    assert buffer.entries == []
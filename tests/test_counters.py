@@ -0,0 +1,75 @@
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from Database.counters import next_file_sequence, next_sequence, COUNTERS_COLLECTION
+
+
+def test_file_counter_starts_from_the_seed(tmp_path):
+    path = str(tmp_path / 'run_counter')
+
+    assert next_file_sequence(path, seed=lambda: 41) == 42
+    assert next_file_sequence(path, seed=lambda: 1000) == 43
+    assert open(path).read() == '43'
+
+
+def test_file_counter_without_a_seed_starts_at_one(tmp_path):
+    path = str(tmp_path / 'nested' / 'run_counter')
+
+    assert [next_file_sequence(path) for _ in range(3)] == [1, 2, 3]
+
+
+def _allocate(path, count, results):
+    results.extend([next_file_sequence(path) for _ in range(count)])
+
+
+def test_concurrent_processes_never_share_a_number(tmp_path):
+    path = str(tmp_path / 'run_counter')
+    with multiprocessing.Manager() as manager:
+        results = manager.list()
+        workers = [multiprocessing.Process(target=_allocate, args=(path, 25, results)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(30)
+        allocated = sorted(results)
+
+    assert allocated == list(range(1, 101))
+
+
+def test_concurrent_threads_never_share_a_number(tmp_path):
+    path = str(tmp_path / 'run_counter')
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        allocated = sorted(pool.map(lambda _: next_file_sequence(path), range(80)))
+
+    assert allocated == list(range(1, 81))
+
+
+@pytest.fixture
+def db():
+    mongomock = pytest.importorskip('mongomock')
+    return mongomock.MongoClient().db
+
+
+def test_mongo_counter_is_seeded_once(db):
+    seeds = []
+
+    def seed():
+        seeds.append(1)
+        return 41
+
+    assert next_sequence(db, 'run_no', seed=seed) == 42
+    assert next_sequence(db, 'run_no', seed=seed) == 43
+    assert len(seeds) == 1
+
+
+def test_mongo_counter_seed_never_lowers_the_value(db):
+    db[COUNTERS_COLLECTION].insert_one({'_id': 'run_no', 'seq': 100})
+
+    assert next_sequence(db, 'run_no', seed=lambda: 5) == 101
+
+
+def test_mongo_counter_without_a_seed_starts_at_one(db):
+    assert [next_sequence(db, 'other') for _ in range(3)] == [1, 2, 3]
+    assert next_sequence(db, 'run_no') == 1
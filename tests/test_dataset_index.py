@@ -0,0 +1,91 @@
+import pandas as pd
+import pytest
+
+from Database.config import DATA_CONFIG
+from Database.measurement_log import MeasurementLog
+import modules.data_loader as data_loader
+from modules.data_loader import load_wifi_data, METRIC_COLUMNS
+from modules.dataset_index import DatasetIndex
+
+SLICES = [
+    dict(locations=['ECC']),
+    dict(locations=['ECC', 'SDB'], dates=['2025-04-06']),
+    dict(dates=['2025-04-05'], hours=['00:00', '13:00', '23:00']),
+    dict(locations=['SDB'], time_from='2025-04-05 10:00', time_to='2025-04-05 12:30', hours=['11:00']),
+    dict(dates=['2025-04-05', '2025-04-06'], time_from='2025-04-05 22:00', time_to='2025-04-06 02:00'),
+    # empty and out-of-bounds ranges
+    dict(locations=['NOWHERE']),
+    dict(dates=['2024-01-01']),
+    dict(time_from='2025-04-06 12:00', time_to='2025-04-06 12:00'),
+    dict(time_from='2025-04-06 12:00', time_to='2025-04-05 12:00'),
+    dict(time_from='2020-01-01', time_to='2030-01-01'),
+    dict(locations=['ECC'], time_from='2030-01-01'),
+    dict(locations=['ECC'], time_to='2020-01-01'),
+]
+
+
+def _mask(df, locations=None, dates=None, hours=None, time_from=None, time_to=None):
+    mask = pd.Series(True, index=df.index)
+    if locations is not None:
+        mask &= df['location'].isin(locations)
+    if dates is not None:
+        mask &= df['date'].isin(dates)
+    if hours is not None:
+        mask &= df['hour'].isin(hours)
+    if time_from is not None:
+        mask &= df['timestamp'] >= pd.Timestamp(time_from)
+    if time_to is not None:
+        mask &= df['timestamp'] < pd.Timestamp(time_to)
+    return df[mask]
+
+
+@pytest.mark.parametrize('filters', SLICES)
+def test_slice_matches_a_pandas_mask(dataset, filters):
+    frame = load_wifi_data()
+    index = DatasetIndex(frame)
+
+    pd.testing.assert_frame_equal(index.slice(**filters), _mask(frame, **filters))
+
+
+def test_slice_projects_columns(dataset):
+    frame = load_wifi_data()
+    columns = ['timestamp', 'latency_ms']
+
+    sliced = DatasetIndex(frame).slice(locations=['SDB'], hours=['09:00'], columns=columns)
+
+    pd.testing.assert_frame_equal(sliced, _mask(frame, locations=['SDB'], hours=['09:00'])[columns])
+
+
+def test_slice_of_an_empty_frame_is_empty():
+    frame = pd.DataFrame(columns=['timestamp', 'location', 'hour', 'latency_ms'])
+
+    assert DatasetIndex(frame).slice(locations=['ECC'], hours=['01:00']).empty
+
+
+def _append_tail():
+    log = MeasurementLog(DATA_CONFIG['log_path'])
+    for minute in range(0, 30, 5):
+        log.append({'timestamp': f"2025-04-07 13:{minute:02d}:00", 'run_no': 5000 + minute,
+                    'location': {'position[x]': 1.0, 'position[y]': 2.0, 'position[name]': 'ECC'},
+                    **{m: float(minute) for m in METRIC_COLUMNS}})
+    log.close()
+
+
+@pytest.mark.parametrize('with_tail', [False, True])
+def test_pushdown_and_warm_index_return_equal_frames(snapshot_dataset, with_tail):
+    if with_tail:
+        _append_tail()
+    queries = [dict(locations=['ECC'], hours=['13:00'],
+                    columns=['timestamp', 'location', 'hour'] + METRIC_COLUMNS),
+               dict(locations=['SDB', 'ECC'], dates=['2025-04-06', '2025-04-07']),
+               dict(hours=['13:00'], columns=['latency_ms', 'timestamp']),
+               dict(locations=['NOWHERE'], columns=['timestamp', 'latency_ms'])]
+
+    assert not data_loader.get_data_store().is_loaded()
+    cold = [load_wifi_data(**query) for query in queries]
+    assert len(data_loader._filtered_cache) == len(queries)
+
+    load_wifi_data()
+    assert data_loader.get_data_store().is_loaded()
+    for query, pushed in zip(queries, cold):
+        pd.testing.assert_frame_equal(pushed, load_wifi_data(**query))
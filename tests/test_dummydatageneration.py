@@ -0,0 +1,19 @@
+import numpy as np
+
+from Database.locations import DEFAULT_LOCATIONS
+from dummydatageneration import generate_frames, rssi_quality
+from src.probes import LinuxRssiProbe
+
+
+def test_rssi_uses_the_collectors_quality_scale():
+    locations = [(loc['name'], loc['x'], loc['y']) for loc in DEFAULT_LOCATIONS]
+    rssi = np.concatenate([frame['rssi'].to_numpy() for frame in generate_frames(locations, 2 * 288)])
+
+    assert rssi.min() >= 0 and rssi.max() <= 100
+    assert rssi.mean() > 30  # a dBm column would be all negative
+
+
+def test_rssi_quality_matches_the_probe_mapping():
+    dbm = np.array([-120.0, -100.0, -87.4, -63.0, -50.5, -45.0, -20.0])
+
+    assert rssi_quality(dbm).tolist() == [LinuxRssiProbe.to_quality(value) for value in dbm]
@@ -0,0 +1,100 @@
+import os
+
+from Database.measurement_log import MeasurementLog
+from src.events import EventBus, LogRelay, MEASUREMENT_TOPIC
+
+
+def _entry(minute, location='ECC'):
+    return {'timestamp': f"2025-04-05 10:{minute:02d}:00", 'run_no': 1, 'location': location,
+            'latency_ms': float(minute)}
+
+
+def _drain(subscription):
+    events = []
+    while True:
+        event = subscription.get(timeout=0)
+        if event is None:
+            return events
+        events.append(event)
+
+
+# Two web workers: one bus and one relay each, following the same log
+def _workers(path, count=2):
+    buses = [EventBus() for _ in range(count)]
+    relays = [LogRelay(bus, path, MEASUREMENT_TOPIC) for bus in buses]
+    return buses, relays
+
+
+def test_every_worker_publishes_every_sample_under_the_same_id(tmp_path):
+    path = str(tmp_path / 'wifi_data.jsonl')
+    log = MeasurementLog(path)
+    log.append(_entry(0))  # history before the workers start is not replayed
+    log.sync()
+    buses, relays = _workers(path)
+    subscriptions = [bus.subscribe([MEASUREMENT_TOPIC]) for bus in buses]
+
+    for minute in range(1, 4):
+        log.append(_entry(minute))
+    log.close()
+    assert [relay.poll() for relay in relays] == [3, 3]
+    assert [relay.poll() for relay in relays] == [0, 0]
+
+    first, second = (_drain(s) for s in subscriptions)
+    assert first == second
+    assert [payload['latency_ms'] for _, _, payload in first] == [1.0, 2.0, 3.0]
+    assert first[-1][0] == os.path.getsize(path)
+
+
+def test_a_client_can_resume_on_another_worker(tmp_path):
+    path = str(tmp_path / 'wifi_data.jsonl')
+    buses, relays = _workers(path)
+    log = MeasurementLog(path)
+    for minute in range(5):
+        log.append(_entry(minute))
+    log.close()
+    for relay in relays:
+        relay.poll()
+
+    seen = _drain(buses[0].subscribe([MEASUREMENT_TOPIC], last_id=0))
+    resumed = _drain(buses[1].subscribe([MEASUREMENT_TOPIC], last_id=seen[1][0]))
+
+    assert resumed == seen[2:]
+
+
+def test_partial_and_malformed_lines(tmp_path):
+    path = str(tmp_path / 'wifi_data.jsonl')
+    open(path, 'wb').close()
+    bus = EventBus()
+    relay = LogRelay(bus, path, MEASUREMENT_TOPIC, transform=lambda entry: entry['latency_ms'])
+    subscription = bus.subscribe()
+
+    with open(path, 'ab') as f:
+        f.write(b'{"latency_ms": 1.0}\nnot json\n{"other": 2}\n{"latency_ms": 3.')
+    assert relay.poll() == 1
+    with open(path, 'ab') as f:
+        f.write(b'0}\n')
+    assert relay.poll() == 1
+
+    assert [payload for _, _, payload in _drain(subscription)] == [1.0, 3.0]
+
+
+def test_a_replaced_log_is_followed_from_its_end(tmp_path):
+    path = str(tmp_path / 'wifi_data.jsonl')
+    log = MeasurementLog(path)
+    log.append(_entry(0))
+    log.close()
+    bus = EventBus()
+    relay = LogRelay(bus, path, MEASUREMENT_TOPIC)
+
+    replacement = str(tmp_path / 'replacement.jsonl')
+    log = MeasurementLog(replacement)
+    for minute in range(3):
+        log.append(_entry(minute))
+    log.close()
+    os.replace(replacement, path)
+    assert relay.poll() == 0
+
+    log = MeasurementLog(path)
+    log.append(_entry(9))
+    log.close()
+    assert relay.poll() == 1
@@ -0,0 +1,47 @@
+import os
+import time
+
+from modules.figure_cache import FigureCache
+
+
+def _disk_entries(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith('.json'))
+
+
+def test_disk_tier_is_bounded_by_entry_count(tmp_path):
+    cache = FigureCache(max_entries=2, disk_dir=str(tmp_path))
+
+    for version in range(50):
+        cache.memoize('trends', ['ECC'], version, lambda: {'data': []})
+
+    assert cache.stats()['entries'] == 2
+    assert len(_disk_entries(tmp_path)) == 2
+    newest = cache.make_key('trends', ['ECC'], 49)
+    assert f"{newest}.json" in _disk_entries(tmp_path)
+
+
+def test_disk_tier_is_bounded_by_bytes(tmp_path):
+    cache = FigureCache(max_bytes=1000, disk_dir=str(tmp_path))
+
+    for version in range(20):
+        cache.put(cache.make_key('trends', [], version), 'x' * 300)
+
+    sizes = [os.path.getsize(tmp_path / name) for name in _disk_entries(tmp_path)]
+    assert sum(sizes) <= 1000
+    assert len(sizes) == 3
+
+
+def test_expired_disk_entries_are_deleted_on_write(tmp_path):
+    cache = FigureCache(ttl=60, disk_dir=str(tmp_path))
+    stale = cache.make_key('trends', [], 'old')
+    cache.put(stale, '{}')
+    old = time.time() - 120
+    os.utime(tmp_path / f"{stale}.json", (old, old))
+    leftover = tmp_path / f"{stale}.json.1.2.tmp"
+    leftover.write_text('{}')
+    os.utime(leftover, (old, old))
+
+    cache.put(cache.make_key('trends', [], 'new'), '{}')
+
+    assert _disk_entries(tmp_path) == [f"{cache.make_key('trends', [], 'new')}.json"]
+    assert not leftover.exists()
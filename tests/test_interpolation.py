@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+import modules.interpolation as interpolation
+from modules.interpolation import _BruteForceNeighbours, idw, interpolate_grid
+
+
+@pytest.fixture(params=['kdtree', 'brute_force'])
+def neighbour_search(request, monkeypatch):
+    if request.param == 'kdtree':
+        pytest.importorskip('scipy')
+        assert interpolation.cKDTree is not None
+    else:
+        monkeypatch.setattr(interpolation, 'cKDTree', None)
+    return request.param
+
+
+def _points(n=200, seed=3):
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(-50, 50, (n, 2))
+    return points, np.sin(points[:, 0] / 10) + points[:, 1] / 25
+
+
+def test_neighbour_index_uses_the_selected_search(neighbour_search):
+    index = interpolation.neighbour_index(_points()[0])
+
+    assert isinstance(index, _BruteForceNeighbours) == (neighbour_search == 'brute_force')
+
+
+def test_idw_matches_a_direct_computation(neighbour_search):
+    points, values = _points()
+    targets = np.array([[0.0, 0.0], [12.5, -7.25], [-40.0, 33.0]])
+
+    result = idw(points, values, targets, k=8, power=2)
+
+    for target, value in zip(targets, result):
+        distances = np.hypot(*(points - target).T)
+        nearest = np.argsort(distances)[:8]
+        weights = 1 / distances[nearest] ** 2
+        assert value == pytest.approx((weights * values[nearest]).sum() / weights.sum())
+
+
+def test_grid_takes_measured_values_at_measured_positions(neighbour_search):
+    positions = np.array([[0.0, 0.0], [10.0, 0.0], [0.0, 10.0], [10.0, 10.0]])
+    values = np.array([1.0, 2.0, 3.0, 4.0])
+
+    exact = idw(positions, values, positions)
+    grid = interpolate_grid(positions, values, size=40)
+
+    assert exact.tolist() == values.tolist()
+    assert grid['z'].shape == (40, 40)
+    assert values.min() <= grid['z'].min() and grid['z'].max() <= values.max()
+
+
+def test_both_searches_agree():
+    pytest.importorskip('scipy')
+    points, _ = _points(500)
+    targets = np.random.default_rng(4).uniform(-60, 60, (1000, 2))
+
+    tree_distances, tree_indices = interpolation.cKDTree(points).query(targets, k=8)
+    brute_distances, brute_indices = _BruteForceNeighbours(points).query(targets, k=8)
+
+    order = np.argsort(brute_distances, axis=1)
+    assert np.allclose(np.take_along_axis(brute_distances, order, axis=1), tree_distances)
+    assert (np.take_along_axis(brute_indices, order, axis=1) == tree_indices).all()
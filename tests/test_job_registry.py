@@ -0,0 +1,52 @@
+import time
+
+import pytest
+
+import Database.job_registry as job_registry
+from Database.job_registry import FileJobRegistry
+
+
+def _job(job_id):
+    return {"_id": job_id, "owner": "worker-1", "locations": ["ECC"], "state": "running",
+            "started_at": time.time(), "heartbeat_at": time.time(), "finished_at": None,
+            "cancel_requested": False, "error": None}
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    count = {'n': 0}
+    rewrite = job_registry.rewrite_locked
+
+    def counting(f, text):
+        count['n'] += 1
+        return rewrite(f, text)
+
+    monkeypatch.setattr(job_registry, 'rewrite_locked', counting)
+    return count
+
+
+def test_status_reads_do_not_rewrite_the_file(tmp_path, writes):
+    registry = FileJobRegistry(str(tmp_path / 'jobs.json'))
+    assert registry.acquire(_job('a'))
+    writes['n'] = 0
+
+    for _ in range(10):
+        assert registry.current()['_id'] == 'a'
+        assert registry.get('a')['state'] == 'running'
+        assert [job['_id'] for job in registry.list()] == ['a']
+
+    assert writes['n'] == 0
+
+
+def test_a_read_expires_a_stale_lease_once(tmp_path, writes):
+    registry = FileJobRegistry(str(tmp_path / 'jobs.json'), lease_ttl=0.01)
+    assert registry.acquire(_job('a'))
+    time.sleep(0.05)
+    writes['n'] = 0
+
+    assert registry.current() is None
+    assert registry.get('a')['state'] == 'orphaned'
+    assert registry.current() is None
+
+    assert writes['n'] == 1
+    assert registry.acquire(_job('b'))
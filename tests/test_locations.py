@@ -0,0 +1,102 @@
+import json
+import math
+import os
+
+import pytest
+
+from Database.config import DATA_CONFIG
+from Database.locations import LocationRegistry, DEFAULT_LOCATIONS
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'locations.json')
+
+
+def _saved(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)['locations']
+
+
+def test_reads_serve_the_defaults_without_writing(path):
+    registry = LocationRegistry(path)
+
+    assert registry.all() == DEFAULT_LOCATIONS
+    assert registry.names() == [loc['name'] for loc in DEFAULT_LOCATIONS]
+    assert registry.get('SDB') == DEFAULT_LOCATIONS[2]
+    assert registry.collection_targets() == [['ECC', 67.12, -43.45]]
+    assert not os.path.exists(path)
+
+    open(path, 'w').close()
+    assert registry.all() == DEFAULT_LOCATIONS
+    assert os.path.getsize(path) == 0
+
+
+def test_add_update_and_remove_persist(path):
+    registry = LocationRegistry(path)
+
+    assert registry.add('LAB', '1.5', 2, collect=1) == {'name': 'LAB', 'x': 1.5, 'y': 2.0, 'collect': True}
+    assert _saved(path) == DEFAULT_LOCATIONS + [registry.get('LAB')]
+
+    registry.add('ECC', 0, 0)
+    assert registry.get('ECC') == {'name': 'ECC', 'x': 0.0, 'y': 0.0, 'collect': False}
+    assert registry.collection_targets() == [['LAB', 1.5, 2.0]]
+
+    assert registry.remove('GEC') is True
+    assert registry.remove('GEC') is False
+    assert [loc['name'] for loc in _saved(path)] == ['ECC', 'SDB', 'FOODCOURT', 'LOUNGE', 'LAB']
+
+
+def test_changes_reach_other_processes(path):
+    writer, reader = LocationRegistry(path), LocationRegistry(path)
+    assert 'LAB' not in reader.names()
+
+    writer.add('LAB', 1, 2)
+    assert reader.get('LAB')['x'] == 1.0
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'locations': [{'name': 'ONLY', 'x': 3, 'y': 4, 'collect': True}]}, f)
+    assert reader.names() == ['ONLY']
+
+
+def test_an_unreadable_file_keeps_the_last_good_list(path, capsys):
+    registry = LocationRegistry(path)
+    registry.add('LAB', 1, 2)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"locations": [')
+
+    assert 'LAB' in registry.names()
+    assert 'Error reading location registry' in capsys.readouterr().out
+
+
+def test_coordinates_are_nan_for_unknown_names(path):
+    xs, ys = LocationRegistry(path).coordinates(['SDB', 'NOWHERE', 'ECC', ''])
+
+    assert xs[0] == 65.78 and ys[2] == -43.45
+    assert math.isnan(xs[1]) and math.isnan(ys[1]) and math.isnan(xs[3])
+    assert len(LocationRegistry(path).coordinates([])[0]) == 0
+
+
+@pytest.fixture
+def client(path, monkeypatch):
+    import app
+
+    monkeypatch.setitem(DATA_CONFIG, 'locations_path', path)
+    return app.proj.test_client()
+
+
+def test_locations_routes(client, path):
+    assert client.get('/locations').get_json() == DEFAULT_LOCATIONS
+    assert not os.path.exists(path)
+
+    response = client.post('/locations', json={'name': 'LAB', 'x': 1, 'y': 2, 'collect': True})
+    assert response.get_json() == {'name': 'LAB', 'x': 1.0, 'y': 2.0, 'collect': True}
+    assert client.get('/locations').get_json()[-1]['name'] == 'LAB'
+
+    assert client.post('/locations', json={'name': 'LAB'}).status_code == 400
+    assert client.post('/locations', json={'name': 'LAB', 'x': 'far', 'y': 2}).status_code == 400
+    assert client.post('/locations', data='not json').status_code == 400
+
+    assert client.delete('/locations/LAB').get_json() == {'removed': 'LAB'}
+    assert client.delete('/locations/LAB').status_code == 404
+    assert 'LAB' not in [loc['name'] for loc in _saved(path)]
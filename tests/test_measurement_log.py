@@ -0,0 +1,105 @@
+import json
+import os
+
+import pytest
+
+import Database.measurement_log as measurement_log
+from Database.measurement_log import MeasurementLog, read_measurements, migrate_json_to_log
+
+
+def _entry(timestamp, location='ECC'):
+    return {'timestamp': timestamp, 'location': {'position[name]': location}, 'latency_ms': 10.0}
+
+
+def test_trailing_partial_line_is_left_for_the_next_read(tmp_path):
+    path = tmp_path / 'log.jsonl'
+    log = MeasurementLog(str(path))
+    log.append(_entry('2025-04-05 10:00:00'))
+    log.append(_entry('2025-04-05 10:05:00'))
+    log.close()
+    complete = path.stat().st_size
+    partial = json.dumps(_entry('2025-04-05 10:10:00'))
+    with open(path, 'a') as f:
+        f.write(partial[:20])
+
+    entries, offset, bad = read_measurements(str(path))
+
+    assert [e['timestamp'] for e in entries] == ['2025-04-05 10:00:00', '2025-04-05 10:05:00']
+    assert offset == complete and bad == 0
+
+    with open(path, 'a') as f:
+        f.write(partial[20:] + '\n')
+    entries, next_offset, bad = read_measurements(str(path), offset)
+
+    assert [e['timestamp'] for e in entries] == ['2025-04-05 10:10:00']
+    assert next_offset == path.stat().st_size
+
+
+def test_malformed_lines_are_counted_as_bad(tmp_path):
+    path = tmp_path / 'log.jsonl'
+    path.write_text(json.dumps(_entry('2025-04-05 10:00:00')) + '\n'
+                    + '{"timestamp": "2025-04-05 10:05\n'
+                    + '\n'
+                    + 'not json\n'
+                    + json.dumps(_entry('2025-04-05 10:10:00')) + '\n')
+
+    entries, offset, bad = read_measurements(str(path))
+
+    assert len(entries) == 2
+    assert bad == 2
+    assert offset == path.stat().st_size
+
+
+def _legacy_document(path):
+    document = {
+        'GEC': [_entry('2025-04-05 10:05:00', 'GEC'), _entry('2025-04-05 09:00:00', 'GEC')],
+        'ECC': [_entry('2025-04-05 10:00:00'), _entry('2025-04-05 11:00:00')],
+    }
+    path.write_text(json.dumps(document))
+    return document
+
+
+def test_migration_writes_entries_in_timestamp_order(tmp_path):
+    source, target = tmp_path / 'wifi_data.json', tmp_path / 'wifi_data.jsonl'
+    _legacy_document(source)
+
+    assert migrate_json_to_log(str(source), str(target)) == 4
+
+    entries, _, bad = read_measurements(str(target))
+    assert [e['timestamp'] for e in entries] == [
+        '2025-04-05 09:00:00', '2025-04-05 10:00:00', '2025-04-05 10:05:00', '2025-04-05 11:00:00']
+    assert bad == 0
+
+
+def test_migration_refuses_to_overwrite_an_existing_log(tmp_path):
+    source, target = tmp_path / 'wifi_data.json', tmp_path / 'wifi_data.jsonl'
+    _legacy_document(source)
+    target.write_text(json.dumps(_entry('2025-04-06 00:00:00')) + '\n')
+
+    with pytest.raises(FileExistsError):
+        migrate_json_to_log(str(source), str(target))
+    assert len(read_measurements(str(target))[0]) == 1
+
+    assert migrate_json_to_log(str(source), str(target), overwrite=True) == 4
+    assert len(read_measurements(str(target))[0]) == 4
+
+
+def test_migration_replaces_the_target_atomically(tmp_path, monkeypatch):
+    source, target = tmp_path / 'wifi_data.json', tmp_path / 'wifi_data.jsonl'
+    _legacy_document(source)
+    target.write_text(json.dumps(_entry('2025-04-06 00:00:00')) + '\n')
+    seen = {}
+    replace = os.replace
+
+    def checking_replace(src, dst):
+        # The new log is complete before it takes the target's place
+        seen['src'] = len(read_measurements(src)[0])
+        seen['dst'] = len(read_measurements(dst)[0])
+        return replace(src, dst)
+
+    monkeypatch.setattr(measurement_log.os, 'replace', checking_replace)
+    migrate_json_to_log(str(source), str(target), overwrite=True)
+
+    assert seen == {'src': 4, 'dst': 1}
+    assert len(read_measurements(str(target))[0]) == 4
+    assert not os.path.exists(str(target) + '.tmp')
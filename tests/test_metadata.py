@@ -0,0 +1,89 @@
+import json
+import os
+
+import pytest
+
+from Database.config import DATA_CONFIG
+from Database.measurement_log import MeasurementLog, read_measurements
+import modules.metadata as metadata
+from modules.data_loader import measurements_to_frame, METRIC_COLUMNS
+
+
+@pytest.fixture(autouse=True)
+def cold_cache(monkeypatch):
+    monkeypatch.setattr(metadata, '_cached', None)
+
+
+def _append(*entries):
+    log = MeasurementLog(DATA_CONFIG['log_path'])
+    for entry in entries:
+        log.append(entry)
+    log.close()
+
+
+def _entry(timestamp, location):
+    return {'timestamp': timestamp, 'run_no': 1,
+            'location': {'position[x]': 1.0, 'position[y]': 2.0, 'position[name]': location},
+            **{m: 1.0 for m in METRIC_COLUMNS}}
+
+
+def _persisted():
+    with open(DATA_CONFIG['meta_path'], 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _recomputed():
+    os.remove(DATA_CONFIG['meta_path'])
+    metadata._cached = None
+    return metadata.dataset_metadata()
+
+
+def _from_frame():
+    entries, _, _ = read_measurements(DATA_CONFIG['log_path'])
+    frame = measurements_to_frame(entries)[0]
+    return {'rows': len(frame), 'locations': sorted(frame['location'].unique()),
+            'dates': sorted(frame['date'].astype(str).unique()),
+            'hours': sorted(frame['hour'].astype(str).unique()),
+            'first': frame['timestamp'].min().strftime('%Y-%m-%d %H:%M:%S'),
+            'last': frame['timestamp'].max().strftime('%Y-%m-%d %H:%M:%S')}
+
+
+def test_full_build_matches_the_data(dataset):
+    meta = metadata.dataset_metadata()
+
+    assert {key: meta[key] for key in _from_frame()} == _from_frame()
+    assert meta['offset'] == os.path.getsize(DATA_CONFIG['log_path'])
+    assert _persisted() == meta
+
+
+def test_appends_are_folded_into_the_persisted_metadata(dataset):
+    metadata.dataset_metadata()
+
+    # a new location, a new day, an out-of-order earlier sample and a bad record
+    _append(_entry('2025-04-09 06:15:00', 'NEWLAB'), _entry('2025-04-01 23:59:00', 'ECC'),
+            {'timestamp': '2025-04-10 00:00:00'})
+    updated = metadata.dataset_metadata()
+    with open(DATA_CONFIG['log_path'], 'ab') as f:
+        f.write(b'{"timestamp": "2025-04-11')  # a writer mid-line
+    assert metadata.dataset_metadata() == updated
+
+    assert _persisted() == updated
+    assert updated == _recomputed()
+    assert {key: updated[key] for key in _from_frame()} == _from_frame()
+    assert 'NEWLAB' in updated['locations'] and updated['first'] == '2025-04-01 23:59:00'
+
+
+def test_a_new_process_catches_up_from_the_saved_offset(dataset, monkeypatch):
+    metadata.dataset_metadata()
+    covered = os.path.getsize(DATA_CONFIG['log_path'])
+    _append(_entry('2025-04-08 12:00:00', 'SDB'))
+    metadata._cached = None
+
+    read_from = []
+    original = metadata.read_measurements
+    monkeypatch.setattr(metadata, 'read_measurements',
+                        lambda path, offset=0: read_from.append(offset) or original(path, offset))
+    meta = metadata.dataset_metadata()
+
+    assert read_from == [covered]
+    assert meta == _recomputed()
@@ -0,0 +1,80 @@
+import pytest
+
+mongomock = pytest.importorskip('mongomock')
+
+from Database.models import (MeasurementWriter, measurement_document, migrate_nested_documents,
+                             MEASUREMENTS_COLLECTION, LEGACY_COLLECTION, LEGACY_BACKUP_COLLECTION)
+
+
+def _entry(minute, location='ECC', run_no=1):
+    return {
+        'timestamp': f"2025-04-05 10:{minute:02d}:00", 'run_no': run_no,
+        'location': {'position[x]': 1.5, 'position[y]': -2.0, 'position[name]': location},
+        'download_speed': 50.0, 'upload_speed': 20.0, 'latency_ms': 12.0,
+        'jitter_ms': 1.0, 'packet_loss': 0.0, 'rssi': 70,
+    }
+
+
+@pytest.fixture
+def db():
+    return mongomock.MongoClient().db
+
+
+def test_document_id_is_derived_from_the_sample():
+    doc = measurement_document(_entry(5))
+
+    assert doc['_id'] == 'ECC|1|2025-04-05 10:05:00'
+    assert doc == measurement_document(_entry(5))
+    assert doc['_id'] != measurement_document(_entry(5, run_no=2))['_id']
+    assert doc['position_x'] == 1.5 and doc['location'] == 'ECC'
+    assert doc['latency_min_ms'] is None
+
+
+def test_reinserting_a_sample_does_not_duplicate_it(db):
+    writer = MeasurementWriter(lambda: db)
+
+    assert writer.add_many([measurement_document(_entry(m)) for m in range(3)]) == 3
+    assert writer.add_many([measurement_document(_entry(m)) for m in range(4)]) == 1
+
+    assert db[MEASUREMENTS_COLLECTION].count_documents({}) == 4
+
+
+def test_a_failed_batch_is_kept_and_retried(db):
+    calls = {'n': 0}
+
+    def flaky():
+        calls['n'] += 1
+        if calls['n'] == 1:
+            raise ConnectionError("server selection timed out")
+        return db
+
+    writer = MeasurementWriter(flaky)
+    with pytest.raises(ConnectionError):
+        writer.add_many([measurement_document(_entry(m)) for m in range(3)])
+    assert writer.pending() == 3
+
+    assert writer.add_many([measurement_document(_entry(3))]) == 4
+    assert writer.pending() == 0
+    assert db[MEASUREMENTS_COLLECTION].count_documents({}) == 4
+
+
+def test_nested_migration_is_idempotent(db):
+    db[LEGACY_COLLECTION].insert_many([
+        {'_id': 'ECC', 'ECC': [_entry(0), _entry(5), {'timestamp': 'broken'}]},
+        {'_id': 'GEC', 'GEC': [_entry(0, 'GEC')]},
+    ])
+
+    assert migrate_nested_documents(db) == 3
+    assert migrate_nested_documents(db) == 0
+
+    names = db.list_collection_names()
+    assert LEGACY_COLLECTION not in names and LEGACY_BACKUP_COLLECTION in names
+    assert db[MEASUREMENTS_COLLECTION].count_documents({}) == 3
+
+
+def test_an_interrupted_migration_can_run_again(db):
+    db[LEGACY_COLLECTION].insert_one({'_id': 'ECC', 'ECC': [_entry(0), _entry(5)]})
+    db[MEASUREMENTS_COLLECTION].insert_one(measurement_document(_entry(0)))
+
+    assert migrate_nested_documents(db) == 1
+    assert db[MEASUREMENTS_COLLECTION].count_documents({}) == 2
@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+from src.ping_stats import parse_ping_output, summarize_rtts, SUB_MS_FRACTION
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'ping')
+
+
+def parse_fixture(name):
+    with open(os.path.join(FIXTURES, name), 'r', encoding='utf-8', newline='') as f:
+        return parse_ping_output(f.read())
+
+
+@pytest.mark.parametrize('name, rtts', [
+    ('linux_ok.txt', [14.2, 13.8, 15.1, 14.5]),
+    ('windows_ok.txt', [14.0, 16.0, 13.0, 15.0]),
+])
+def test_replies_with_time(name, rtts):
+    stats = parse_fixture(name)
+
+    assert stats['rtts'] == rtts
+    assert stats['packet_loss'] == 0.0
+    assert stats['latency_ms'] == pytest.approx(sum(rtts) / len(rtts))
+    assert stats['latency_min_ms'] == min(rtts)
+    assert stats['latency_max_ms'] == max(rtts)
+
+
+def test_windows_sub_millisecond_replies_are_below_one_ms():
+    stats = parse_fixture('windows_sub_ms.txt')
+
+    assert stats['rtts'] == [SUB_MS_FRACTION, SUB_MS_FRACTION, 1.0, SUB_MS_FRACTION]
+    assert stats['latency_min_ms'] < 1.0
+    assert stats['latency_p50_ms'] < 1.0
+    assert stats['packet_loss'] == 0.0
+
+
+@pytest.mark.parametrize('name, rtts', [
+    ('linux_partial_loss.txt', [21.4, 35.9, 22.0]),
+    ('windows_partial_loss.txt', [22.0, 48.0, 25.0]),
+])
+def test_partial_loss(name, rtts):
+    stats = parse_fixture(name)
+
+    assert stats['rtts'] == rtts
+    assert stats['packet_loss'] == 25.0
+    assert stats['jitter_ms'] == summarize_rtts(rtts)['jitter_ms']
+
+
+@pytest.mark.parametrize('name', [
+    'linux_all_lost.txt',
+    'windows_timed_out.txt',
+    'linux_unreachable.txt',
+    # Windows counts the router's "unreachable" replies as received
+    'windows_unreachable.txt',
+])
+def test_no_replies(name):
+    stats = parse_fixture(name)
+
+    assert stats['rtts'] == []
+    assert stats['packet_loss'] == 100.0
+    assert stats['latency_ms'] is None
+    assert stats['jitter_ms'] is None
+    assert stats['latency_p95_ms'] is None
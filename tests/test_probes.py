@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.probes import Probe, ProbeEngine, SimulatedProbe, make_probes
+
+
+class SlowProbe(Probe):
+    def __init__(self, name, delay=0.05):
+        self.name = name
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+        self.loops = set()
+
+    async def run(self, location):
+        self.loops.add(asyncio.get_running_loop())
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(self.delay)
+        self.running -= 1
+        return {self.name: location}
+
+
+@pytest.fixture
+def engine_factory():
+    engines = []
+
+    def make(*args, **kwargs):
+        engines.append(ProbeEngine(*args, **kwargs))
+        return engines[-1]
+    yield make
+    for engine in engines:
+        engine.close()
+
+
+def test_sync_callers_share_one_loop_and_the_in_flight_cap(engine_factory):
+    probe = SlowProbe('ping')
+    engine = engine_factory([probe], max_in_flight=3)
+
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        results = list(pool.map(lambda i: engine.run_probe_sync('ping', f"L{i}"), range(10)))
+
+    assert results == [{'ping': f"L{i}"} for i in range(10)]
+    assert len(probe.loops) == 1
+    assert probe.peak == 3
+
+
+def test_per_probe_limits(engine_factory):
+    ping, throughput = SlowProbe('ping'), SlowProbe('throughput')
+    engine = engine_factory([ping, throughput], limits={'throughput': 1})
+
+    futures = [engine.submit(engine.measure(f"L{i}")) for i in range(4)]
+    results = [future.result() for future in futures]
+
+    assert results[0] == {'ping': 'L0', 'throughput': 'L0'}
+    assert ping.peak == 4
+    assert throughput.peak == 1
+
+
+def test_submit_from_the_engine_loop_is_refused(engine_factory):
+    engine = engine_factory([SlowProbe('ping')])
+
+    async def nested():
+        with pytest.raises(RuntimeError):
+            engine.submit(engine.run_probe('ping', 'ECC'))
+        return True
+
+    assert engine.submit(nested()).result()
+
+
+def test_simulated_values_do_not_depend_on_thread_timing():
+    def run(workers):
+        probe = SimulatedProbe('rssi', seed=7)
+
+        def call(_):
+            return asyncio.run(probe.run('ECC'))
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return sorted(result['rssi'] for result in pool.map(call, range(200)))
+
+    assert run(1) == run(16)
+
+
+def test_simulated_backend_measures_every_field(engine_factory):
+    engine = engine_factory(make_probes('simulated', seed=1))
+
+    fields = engine.measure_sync('ECC')
+
+    for field in ('download_speed', 'upload_speed', 'rssi', 'latency_ms', 'jitter_ms', 'packet_loss'):
+        assert fields[field] is not None
@@ -0,0 +1,132 @@
+import json
+from datetime import datetime
+
+import pytest
+
+mongomock = pytest.importorskip('mongomock')
+
+from Database.models import measurement_document, MEASUREMENTS_COLLECTION
+from Database.queries import (find_measurements, stream_measurements, encode_cursor, decode_cursor,
+                              parse_timestamp)
+
+LOCATIONS = ['ECC', 'SDB', 'UC', 'ICT', 'CCIT']
+
+
+def _entry(minute, location, run_no):
+    return {
+        'timestamp': f"2025-04-05 10:{minute:02d}:00", 'run_no': run_no,
+        'location': {'position[x]': 1.0, 'position[y]': 2.0, 'position[name]': location},
+        'download_speed': 50.0 + minute, 'upload_speed': 20.0, 'latency_ms': 12.0,
+        'jitter_ms': 1.0, 'packet_loss': 0.0, 'rssi': 70,
+    }
+
+
+# Every location reports at each minute, so five rows share each timestamp
+# and any page size that is not a multiple of five splits a tie.
+@pytest.fixture
+def db():
+    db = mongomock.MongoClient().db
+    docs = [measurement_document(_entry(minute, location, run_no=minute % 3))
+            for minute in range(12) for location in LOCATIONS]
+    db[MEASUREMENTS_COLLECTION].insert_many(docs)
+    return db
+
+
+def _expected(db, query=None, descending=True):
+    docs = list(db[MEASUREMENTS_COLLECTION].find(query or {}))
+    docs.sort(key=lambda doc: (doc['timestamp'], doc['_id']), reverse=descending)
+    return [(doc['timestamp'].strftime('%Y-%m-%d %H:%M:%S'), doc['location'], doc['run_no']) for doc in docs]
+
+
+def _keys(rows):
+    return [(row['timestamp'], row['location'], row['run_no']) for row in rows]
+
+
+def _all_pages(db, limit, cursor=None, **kwargs):
+    rows, pages = [], 0
+    while True:
+        page, cursor = find_measurements(db, limit=limit, cursor=cursor, **kwargs)
+        rows.extend(page)
+        pages += 1
+        if cursor is None:
+            return rows, pages
+
+
+def test_cursor_round_trips():
+    doc = {'timestamp': datetime(2025, 4, 5, 10, 3), '_id': 'ECC|0|2025-04-05 10:03:00'}
+
+    assert decode_cursor(encode_cursor(doc)) == (doc['timestamp'], doc['_id'])
+    with pytest.raises(ValueError):
+        decode_cursor('not-a-cursor')
+
+
+@pytest.mark.parametrize('descending', [True, False])
+@pytest.mark.parametrize('limit', [1, 3, 7, 60, 1000])
+def test_pages_cover_every_row_once_in_order(db, descending, limit):
+    rows, pages = _all_pages(db, limit, descending=descending)
+
+    assert _keys(rows) == _expected(db, descending=descending)
+    assert pages == -(-60 // limit)
+
+
+def test_pages_are_not_shifted_by_rows_inserted_meanwhile(db):
+    first, cursor = find_measurements(db, limit=7, descending=False)
+    db[MEASUREMENTS_COLLECTION].insert_one(measurement_document(_entry(0, 'AAA', run_no=0)))
+    rest, _ = _all_pages(db, 7, descending=False, cursor=cursor)
+
+    assert _keys(first + rest) == [key for key in _expected(db, descending=False) if key[1] != 'AAA']
+
+
+def test_filters_and_projection(db):
+    start, end = parse_timestamp('2025-04-05 10:02:00'), parse_timestamp('2025-04-05 10:08:00')
+    rows, _ = _all_pages(db, 4, locations=['ECC', 'UC'], start=start, end=end, run_nos=[1, 2],
+                         fields=['latency_ms'], descending=False)
+
+    assert _keys(rows) == _expected(db, {'location': {'$in': ['ECC', 'UC']},
+                                         'timestamp': {'$gte': start, '$lt': end},
+                                         'run_no': {'$in': [1, 2]}}, descending=False)
+    assert set(rows[0]) == {'timestamp', 'run_no', 'location', 'position_x', 'position_y', 'latency_ms'}
+    with pytest.raises(ValueError):
+        find_measurements(db, fields=['password'])
+
+
+def test_stream_matches_paging_and_can_resume_from_a_cursor(db):
+    assert _keys(stream_measurements(db)) == _expected(db)
+    assert _keys(stream_measurements(db, limit=8, descending=False)) == _expected(db, descending=False)[:8]
+
+    page, cursor = find_measurements(db, limit=8)
+    assert _keys(page + list(stream_measurements(db, cursor=cursor))) == _expected(db)
+
+
+@pytest.fixture
+def client(db, monkeypatch):
+    import app
+
+    monkeypatch.setattr(app, 'get_db_connection', lambda: db)
+    return app.proj.test_client()
+
+
+def test_showdata_pages_and_streams_ndjson(client, db):
+    rows, cursor = [], None
+    while True:
+        body = client.get('/showdata', query_string={'limit': 7, 'order': 'asc', 'cursor': cursor or ''}).get_json()
+        assert body['count'] == len(body['data'])
+        rows.extend(body['data'])
+        cursor = body['next_cursor']
+        if cursor is None:
+            break
+    assert _keys(rows) == _expected(db, descending=False)
+
+    response = client.get('/showdata?format=ndjson&location=ECC,SDB')
+    assert response.mimetype == 'application/x-ndjson'
+    lines = response.get_data(as_text=True).splitlines()
+    assert _keys(json.loads(line) for line in lines) == _expected(db, {'location': {'$in': ['ECC', 'SDB']}})
+
+    response = client.get('/showdata', headers={'Accept': 'application/x-ndjson'}, query_string={'limit': 3})
+    assert len(response.get_data(as_text=True).splitlines()) == 3
+
+
+def test_showdata_rejects_bad_arguments(client):
+    assert client.get('/showdata?cursor=garbage').status_code == 400
+    assert client.get('/showdata?start=yesterday').status_code == 400
+    assert client.get('/showdata?fields=password&format=ndjson').status_code == 400
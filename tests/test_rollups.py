@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Database.locations import DEFAULT_LOCATIONS
+from dummydatageneration import generate_frames
+from modules.data_loader import METRIC_COLUMNS, HOUR_LABELS
+from modules.rollups import RollupStore
+
+
+@pytest.fixture(scope='module')
+def frame():
+    locations = [(loc['name'], loc['x'], loc['y']) for loc in DEFAULT_LOCATIONS]
+    df = pd.concat(generate_frames(locations, 3 * 288), ignore_index=True)
+    df['date'] = pd.Categorical(df['timestamp'].dt.strftime('%Y-%m-%d'))
+    df['hour'] = pd.Categorical.from_codes(df['timestamp'].dt.hour, categories=HOUR_LABELS)
+    df['location'] = df['location'].astype('category')
+    # Missing values, and an hour with a single sample, as real data has
+    df.loc[df.index[::7], 'latency_ms'] = np.nan
+    single = (df['location'] == 'ECC') & (df['date'] == '2025-04-06') & (df['hour'] == '03:00')
+    return df.drop(df.index[single][1:]).reset_index(drop=True)
+
+
+def _full(frame):
+    rollups = RollupStore(METRIC_COLUMNS)
+    rollups.on_rows(frame, True)
+    return rollups
+
+
+def _incremental(frame, parts=7):
+    rollups = RollupStore(METRIC_COLUMNS)
+    ordered = frame.sort_values('timestamp', kind='stable')
+    edges = np.linspace(0, len(ordered), parts + 1).astype(int)
+    rollups.on_rows(ordered.iloc[:edges[1]], True)
+    for start, stop in zip(edges[1:-1], edges[2:]):
+        rollups.on_rows(ordered.iloc[start:stop], False)
+    return rollups
+
+
+def _expected(frame, keys, metric):
+    grouped = frame.astype({key: str for key in keys}).groupby(keys)[metric]
+    return grouped.agg(['count', 'mean', 'std', 'min', 'max']).reset_index()
+
+
+@pytest.mark.parametrize('build', [_full, _incremental])
+@pytest.mark.parametrize('metric', ['latency_ms', 'download_speed', 'rssi'])
+def test_hourly_stats_match_pandas(frame, build, metric):
+    stats = build(frame).hourly_stats(metric)
+
+    expected = _expected(frame, ['location', 'date', 'hour'], metric)
+    pd.testing.assert_frame_equal(stats, expected, check_dtype=False, rtol=1e-7)
+
+
+@pytest.mark.parametrize('build', [_full, _incremental])
+def test_location_and_hour_views_match_pandas(frame, build):
+    rollups = build(frame)
+
+    hourly = rollups.hourly_mean('SDB', 'upload_speed')
+    expected = frame[frame['location'] == 'SDB'].astype({'hour': str}).groupby('hour')['upload_speed'].mean()
+    pd.testing.assert_frame_equal(hourly, expected.reset_index(), check_dtype=False)
+
+    summary = rollups.location_summary()
+    expected = frame.astype({'location': str}).groupby('location').agg(
+        {**{m: 'mean' for m in METRIC_COLUMNS}, 'timestamp': 'count'}).rename(columns={'timestamp': 'count'})
+    pd.testing.assert_frame_equal(summary, expected.reset_index(), check_dtype=False)
+
+
+def test_empty_results_have_the_same_columns(frame):
+    rollups = _full(frame)
+    columns = list(rollups.hourly_stats('latency_ms', 'ECC').columns)
+
+    assert list(rollups.hourly_stats('latency_ms', 'NOWHERE').columns) == columns
+    assert list(RollupStore(METRIC_COLUMNS).hourly_stats('latency_ms').columns) == columns
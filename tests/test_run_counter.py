@@ -0,0 +1,35 @@
+import pytest
+
+import src.main as collector
+from Database.config import DATA_CONFIG
+
+
+@pytest.fixture
+def unreachable_mongo(tmp_path, monkeypatch):
+    calls = {'n': 0}
+
+    def connect():
+        calls['n'] += 1
+        raise ConnectionError("server selection timed out")
+
+    monkeypatch.setitem(DATA_CONFIG, 'run_counter', 'mongo')
+    monkeypatch.setitem(DATA_CONFIG, 'run_counter_path', str(tmp_path / 'run_counter'))
+    monkeypatch.setitem(DATA_CONFIG, 'log_path', str(tmp_path / 'wifi_data.jsonl'))
+    monkeypatch.setattr(collector, 'get_db_connection', connect)
+    monkeypatch.setattr(collector, '_use_mongo_counter', None)
+    return calls
+
+
+def test_unreachable_mongo_is_tried_once_per_collection(unreachable_mongo):
+    collector.prepare_run_counter()
+
+    assert [collector.get_next_run_no() for _ in range(3)] == [1, 2, 3]
+    assert unreachable_mongo['n'] == 1
+
+
+def test_each_collection_start_checks_mongo_again(unreachable_mongo):
+    collector.prepare_run_counter()
+    collector.get_next_run_no()
+    collector.prepare_run_counter()
+
+    assert unreachable_mongo['n'] == 2
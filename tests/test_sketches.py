@@ -0,0 +1,41 @@
+import pandas as pd
+
+from modules.data_loader import METRIC_COLUMNS, HOUR_LABELS
+from modules.sketches import StreamingStats
+
+
+def _samples(location, timestamps):
+    return [dict({'location': location, 'timestamp': ts}, **{m: 10.0 + i for m in METRIC_COLUMNS})
+            for i, ts in enumerate(timestamps)]
+
+
+def _frame(samples):
+    frame = pd.DataFrame(samples)
+    frame['timestamp'] = pd.to_datetime(frame['timestamp'])
+    frame['hour'] = pd.Categorical.from_codes(frame['timestamp'].dt.hour, categories=HOUR_LABELS)
+    return frame
+
+
+def test_append_of_rows_already_added_as_samples_is_a_no_op():
+    stats = StreamingStats(METRIC_COLUMNS)
+    stats.on_rows(_frame(_samples('ECC', ['2025-04-05 09:00:00'])), True)
+    samples = _samples('ECC', ['2025-04-05 10:00:00', '2025-04-05 10:05:00'])
+    for sample in samples:
+        stats.add_sample(sample)
+
+    stats.on_rows(_frame(samples), False)
+
+    assert stats.summary('latency_ms', 'ECC')['count'] == 3
+    assert stats.summary('latency_ms', 'ECC', '10:00')['count'] == 2
+
+
+def test_append_counts_only_rows_not_seen_as_samples():
+    stats = StreamingStats(METRIC_COLUMNS)
+    stats.on_rows(_frame(_samples('ECC', ['2025-04-05 09:00:00'])), True)
+    samples = _samples('ECC', ['2025-04-05 10:00:00', '2025-04-05 10:05:00', '2025-04-05 10:10:00'])
+    stats.add_sample(samples[0])
+
+    stats.on_rows(_frame(samples), False)
+
+    assert stats.summary('latency_ms', 'ECC', '10:00')['count'] == 3
+    assert stats.summary('latency_ms', 'ECC')['count'] == 4
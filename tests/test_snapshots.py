@@ -0,0 +1,63 @@
+import pandas as pd
+
+from Database.config import DATA_CONFIG
+from Database.measurement_log import MeasurementLog, read_measurements
+from modules.data_loader import (compact_snapshots, measurements_to_frame, METRIC_COLUMNS,
+                                 _FRAME_COLUMNS)
+from modules.snapshots import load_manifest, read_partitions
+
+
+def _log_frame():
+    entries, _, _ = read_measurements(DATA_CONFIG['log_path'])
+    return measurements_to_frame(entries)[0]
+
+
+def _sorted(df):
+    return df.sort_values(['location', 'timestamp'], ignore_index=True)
+
+
+def test_compaction_covers_the_whole_log(dataset):
+    written = compact_snapshots()
+
+    manifest = load_manifest(DATA_CONFIG['snapshot_dir'])
+    assert written == manifest['rows'] == len(_log_frame())
+    assert manifest['columns'] == _FRAME_COLUMNS
+
+
+def test_pushdown_returns_the_rows_of_a_mask_over_the_log(dataset):
+    compact_snapshots()
+    full = _log_frame()
+    columns = ['timestamp', 'location', 'latency_ms']
+
+    for locations, dates, hours in [(['ECC'], None, None),
+                                    (['ECC', 'SDB'], ['2025-04-06'], None),
+                                    (None, ['2025-04-05'], ['13:00', '14:00']),
+                                    (['NOWHERE'], None, None)]:
+        mask = pd.Series(True, index=full.index)
+        if locations is not None:
+            mask &= full['location'].isin(locations)
+        if dates is not None:
+            mask &= full['date'].isin(dates)
+        if hours is not None:
+            mask &= full['hour'].isin(hours)
+
+        pushed = read_partitions(DATA_CONFIG['snapshot_dir'], columns, locations, dates, hours)
+
+        expected = _sorted(full.loc[mask, columns])
+        expected['location'] = expected['location'].astype(str)
+        pd.testing.assert_frame_equal(_sorted(pushed), expected, check_dtype=False)
+
+
+def test_compaction_only_adds_rows_appended_since_the_last_one(dataset):
+    first = compact_snapshots()
+    log = MeasurementLog(DATA_CONFIG['log_path'])
+    for minute in range(3):
+        log.append({'timestamp': f"2025-04-07 00:0{minute}:00", 'run_no': 1000 + minute,
+                    'location': {'position[x]': 1.0, 'position[y]': 2.0, 'position[name]': 'ECC'},
+                    **{m: 1.0 for m in METRIC_COLUMNS}})
+    log.close()
+
+    assert compact_snapshots() == 3
+    assert compact_snapshots() == 0
+    assert load_manifest(DATA_CONFIG['snapshot_dir'])['rows'] == first + 3
+    assert len(read_partitions(DATA_CONFIG['snapshot_dir'], ['timestamp'], dates=['2025-04-07'])) == 3
@@ -0,0 +1,27 @@
+from modules.decimation import TREND_POINT_BUDGET
+from modules.callbacks import TREND_HOVER_FORMATS, trend_hover_fields
+
+
+def test_trend_hover_data_is_aligned_with_points(dataset, callback):
+    figure, _ = callback('trends-time-series.figure')('ECC', 'latency_ms', 'All Hours')
+
+    trace = figure['data'][0]
+    assert len(trace['customdata']) == len(trace['x'])
+    assert len(trace['customdata'][0]) == len(trend_hover_fields('latency_ms'))
+    assert 'customdata[0]' in trace['hovertemplate']
+
+
+def test_live_samples_extend_hover_data_with_the_points(callback):
+    samples = [
+        dict({'location': 'ECC', 'timestamp': '2025-04-07 13:00:00'}, **{m: 1.0 for m in TREND_HOVER_FORMATS}),
+        dict({'location': 'GEC', 'timestamp': '2025-04-07 13:00:00'}, **{m: 2.0 for m in TREND_HOVER_FORMATS}),
+        {'location': 'ECC', 'timestamp': '2025-04-07 13:05:00', 'latency_ms': 3.0},
+    ]
+    extend = callback('trends-time-series.extendData')
+
+    update, traces, max_points = extend({'batch': 1, 'samples': samples}, 'ECC', 'latency_ms', 'All Hours')
+
+    fields = trend_hover_fields('latency_ms')
+    assert update['x'] == [['2025-04-07 13:00:00', '2025-04-07 13:05:00']]
+    assert update['customdata'] == [[[1.0] * len(fields), [None] * len(fields)]]
+    assert traces == [0] and max_points == TREND_POINT_BUDGET
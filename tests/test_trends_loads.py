@@ -0,0 +1,49 @@
+import pytest
+
+import modules.data_loader as data_loader
+
+
+# Counts full dataset loads (the store's loader) and snapshot reads
+# (predicate pushdown) while the test runs.
+@pytest.fixture
+def loads(monkeypatch):
+    counts = {'full': 0, 'partitions': 0}
+    store = data_loader.get_data_store()
+    read_full, read_partitions = store._loader, data_loader.read_partitions
+
+    def full(*args):
+        counts['full'] += 1
+        return read_full(*args)
+
+    def partitions(*args):
+        counts['partitions'] += 1
+        return read_partitions(*args)
+
+    monkeypatch.setattr(store, '_loader', full)
+    monkeypatch.setattr(data_loader, 'read_partitions', partitions)
+    return counts
+
+
+@pytest.mark.parametrize('hour', ['All Hours', '13:00'])
+def test_one_interaction_loads_the_data_once(snapshot_dataset, callback, loads, hour):
+    timeseries, _ = callback('trends-time-series.figure')('ECC', 'latency_ms', hour)
+
+    assert timeseries['data']
+    assert loads['full'] + loads['partitions'] == 1
+
+
+def test_hourly_view_on_a_cold_process_uses_the_full_load(snapshot_dataset, callback, loads):
+    _, hourly = callback('trends-time-series.figure')('ECC', 'latency_ms', 'All Hours')
+
+    assert hourly is not None
+    assert loads == {'full': 1, 'partitions': 0}
+
+
+def test_cached_figures_load_nothing(dataset, callback, loads):
+    update_trends = callback('trends-time-series.figure')
+    update_trends('ECC', 'latency_ms', 'All Hours')
+    loads.update(full=0, partitions=0)
+
+    update_trends('ECC', 'latency_ms', 'All Hours')
+
+    assert loads == {'full': 0, 'partitions': 0}
@@ -0,0 +1,32 @@
+from src.write_buffer import WriteBuffer
+
+
+def test_batches_a_sink_rejected_are_not_counted_as_written():
+    stored = []
+
+    def failing(entries):
+        raise OSError("disk full")
+
+    buffer = WriteBuffer([stored.extend, failing], batch_size=5, flush_interval=0.05)
+    for i in range(10):
+        buffer.put({'n': i})
+    assert buffer.flush(timeout=5)
+    buffer.close(timeout=5)
+
+    stats = buffer.stats()
+    assert len(stored) == 10
+    assert stats['written'] == 0 and stats['batches'] == 0
+    assert stats['failed'] == 10
+    assert stats['sink_errors'] == 2
+
+
+def test_accepted_batches_are_counted_as_written():
+    stored = []
+    buffer = WriteBuffer([stored.extend], batch_size=5, flush_interval=0.05)
+    for i in range(10):
+        buffer.put({'n': i})
+    assert buffer.flush(timeout=5)
+    buffer.close(timeout=5)
+
+    assert buffer.stats()['written'] == 10
+    assert buffer.stats()['failed'] == 0